@@ -0,0 +1,394 @@
+"""Vectorized attack maps, check flags and legal move masks for many positions at once.
+
+Positions are stacked piece planes of shape (N, 12, 64) (or (N, 12, 8, 8)) in
+PIECE_ORDER with the Board square layout (a8 = 0), plus per-position side to move,
+castling rights bitmask and en passant square (-1 when none). Every position must
+have exactly one king per side. NumPy is an optional dependency; importing this
+module without it works, calling into it raises ImportError.
+"""
+
+from Bitboards import (
+    PIECE_ORDER,
+    WHITE,
+    BLACK,
+    FULL_BOARD,
+    FILE_A,
+    FILE_H,
+    CASTLE_WHITE_KINGSIDE,
+    CASTLE_WHITE_QUEENSIDE,
+    CASTLE_BLACK_KINGSIDE,
+    CASTLE_BLACK_QUEENSIDE,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    BETWEEN,
+    RAY_SOUTH,
+    RAY_EAST,
+    RAY_SOUTH_EAST,
+    RAY_SOUTH_WEST,
+    RAY_NORTH,
+    RAY_WEST,
+    RAY_NORTH_EAST,
+    RAY_NORTH_WEST,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+
+_tables = None
+
+
+def _Require_Numpy():
+    if np is None:
+        raise ImportError("BatchBoards requires numpy (pip install numpy)")
+
+
+def _Tables() -> dict:
+    global _tables
+    if _tables is not None:
+        return _tables
+    _Require_Numpy()
+    u64 = np.uint64
+    # (ray table, resolves towards higher squares, orthogonal)
+    directions = (
+        (RAY_SOUTH, True, True), (RAY_EAST, True, True),
+        (RAY_NORTH, False, True), (RAY_WEST, False, True),
+        (RAY_SOUTH_EAST, True, False), (RAY_SOUTH_WEST, True, False),
+        (RAY_NORTH_EAST, False, False), (RAY_NORTH_WEST, False, False),
+    )
+    _tables = {
+        "knight": np.array(KNIGHT_ATTACKS, dtype=u64),
+        "king": np.array(KING_ATTACKS, dtype=u64),
+        "pawn": np.array(PAWN_ATTACKS, dtype=u64),
+        "between": np.array(BETWEEN, dtype=u64),
+        "rays": tuple((np.array(rays, dtype=u64), positive, orthogonal) for rays, positive, orthogonal in directions),
+        "bits": np.array([1 << square for square in range(64)], dtype=u64),
+    }
+    return _tables
+
+
+def _U(value: int):
+    return np.uint64(value)
+
+
+def _Popcount(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    values = values - ((values >> _U(1)) & _U(0x5555555555555555))
+    values = (values & _U(0x3333333333333333)) + ((values >> _U(2)) & _U(0x3333333333333333))
+    values = (values + (values >> _U(4))) & _U(0x0F0F0F0F0F0F0F0F)
+    return ((values * _U(0x0101010101010101)) >> _U(56)).astype(np.int64)
+
+
+def _Lowest_Bit(values):
+    return values & (~values + _U(1))
+
+
+def _Smear_Down(values):
+    # Sets every bit below the highest set bit.
+    for shift in (1, 2, 4, 8, 16, 32):
+        values = values | (values >> _U(shift))
+    return values
+
+
+def _Highest_Bit(values):
+    smeared = _Smear_Down(values)
+    return smeared ^ (smeared >> _U(1))
+
+
+def _Bit_Index(single_bits):
+    return _Popcount(single_bits - _U(1))
+
+
+def _Ray_Attacks(ray, positive: bool, occupied):
+    # Squares along the ray up to and including the first blocker.
+    blockers = ray & occupied
+    if positive:
+        first = _Lowest_Bit(blockers)
+        return ray & ((first << _U(1)) - _U(1))
+    return ray & ~(_Smear_Down(blockers) >> _U(1))
+
+
+def _Slider_Attacks(squares, occupied, orthogonal: bool):
+    attacks = np.zeros(np.shape(occupied), dtype=np.uint64)
+    for rays, positive, is_orthogonal in _Tables()["rays"]:
+        if is_orthogonal == orthogonal:
+            attacks |= _Ray_Attacks(rays[squares], positive, occupied)
+    return attacks
+
+
+def _Shift(values, delta: int, mask: int):
+    if delta > 0:
+        return (values << _U(delta)) & _U(mask)
+    return (values >> _U(-delta)) & _U(mask)
+
+
+_KNIGHT_STEPS = (
+    (17, ~FILE_A & FULL_BOARD), (15, ~FILE_H & FULL_BOARD), (10, ~(FILE_A | FILE_B) & FULL_BOARD),
+    (6, ~(FILE_G | FILE_H) & FULL_BOARD), (-17, ~FILE_H & FULL_BOARD), (-15, ~FILE_A & FULL_BOARD),
+    (-10, ~(FILE_G | FILE_H) & FULL_BOARD), (-6, ~(FILE_A | FILE_B) & FULL_BOARD),
+)
+_KING_STEPS = (
+    (8, FULL_BOARD), (-8, FULL_BOARD), (1, ~FILE_A & FULL_BOARD), (-1, ~FILE_H & FULL_BOARD),
+    (9, ~FILE_A & FULL_BOARD), (7, ~FILE_H & FULL_BOARD), (-7, ~FILE_A & FULL_BOARD), (-9, ~FILE_H & FULL_BOARD),
+)
+# Kogge-Stone fill directions: (step, wrap mask for a one-step shift, orthogonal).
+_SLIDER_STEPS = (
+    (8, FULL_BOARD, True), (-8, FULL_BOARD, True), (1, ~FILE_A & FULL_BOARD, True), (-1, ~FILE_H & FULL_BOARD, True),
+    (9, ~FILE_A & FULL_BOARD, False), (7, ~FILE_H & FULL_BOARD, False),
+    (-7, ~FILE_A & FULL_BOARD, False), (-9, ~FILE_H & FULL_BOARD, False),
+)
+
+
+def _Fill_Attacks(sliders, empty, step: int, mask: int):
+    propagate = empty & _U(mask)
+    sliders = sliders | (propagate & _Shift(sliders, step, FULL_BOARD))
+    propagate = propagate & _Shift(propagate, step, FULL_BOARD)
+    sliders = sliders | (propagate & _Shift(sliders, 2 * step, FULL_BOARD))
+    propagate = propagate & _Shift(propagate, 2 * step, FULL_BOARD)
+    sliders = sliders | (propagate & _Shift(sliders, 4 * step, FULL_BOARD))
+    return _Shift(sliders, step, mask)
+
+
+def _Side_Attacks(bitboards, color: int, occupied):
+    base = 0 if color == WHITE else 6
+    pawns = bitboards[:, base]
+    if color == WHITE:
+        attacks = _Shift(pawns, -7, ~FILE_A & FULL_BOARD) | _Shift(pawns, -9, ~FILE_H & FULL_BOARD)
+    else:
+        attacks = _Shift(pawns, 9, ~FILE_A & FULL_BOARD) | _Shift(pawns, 7, ~FILE_H & FULL_BOARD)
+
+    knights = bitboards[:, base + 1]
+    for step, mask in _KNIGHT_STEPS:
+        attacks |= _Shift(knights, step, mask)
+    king = bitboards[:, base + 5]
+    for step, mask in _KING_STEPS:
+        attacks |= _Shift(king, step, mask)
+
+    empty = ~occupied
+    queens = bitboards[:, base + 4]
+    orthogonal = bitboards[:, base + 3] | queens
+    diagonal = bitboards[:, base + 2] | queens
+    for step, mask, is_orthogonal in _SLIDER_STEPS:
+        attacks |= _Fill_Attacks(orthogonal if is_orthogonal else diagonal, empty, step, mask)
+    return attacks
+
+
+def Planes_To_Bitboards(planes):
+    """(N, 12, 64) or (N, 12, 8, 8) 0/1 planes -> (N, 12) uint64 bitboards."""
+    _Require_Numpy()
+    planes = np.asarray(planes).reshape(len(planes), 12, 64) != 0
+    # Little-endian bit packing puts square 0 in the lowest bit of the lowest byte.
+    packed = np.ascontiguousarray(np.packbits(planes, axis=2, bitorder="little"))
+    return packed.view("<u8").reshape(len(planes), 12).astype(np.uint64)
+
+
+def Boards_To_Planes(boards):
+    """Stack Board objects into (planes, side_to_move, castling_rights, en_passant)."""
+    _Require_Numpy()
+    count = len(boards)
+    planes = np.zeros((count, 12, 64), dtype=np.uint8)
+    side = np.zeros(count, dtype=bool)
+    castling = np.zeros(count, dtype=np.uint8)
+    en_passant = np.full(count, -1, dtype=np.int16)
+    for index, board in enumerate(boards):
+        for piece_index in range(12):
+            bitboard = board.bitboards[piece_index]
+            while bitboard:
+                bit = bitboard & -bitboard
+                planes[index, piece_index, bit.bit_length() - 1] = 1
+                bitboard ^= bit
+        side[index] = board.white_to_move
+        castling[index] = board.castling_rights
+        if board.en_passant_square is not None:
+            row, col = board.en_passant_square
+            en_passant[index] = row * 8 + col
+    return planes, side, castling, en_passant
+
+
+def Batch_Attack_Maps(planes):
+    """Return (white_attacks, black_attacks) as (N,) uint64 bitboards."""
+    bitboards = Planes_To_Bitboards(planes)
+    occupied = np.bitwise_or.reduce(bitboards, axis=1)
+    return _Side_Attacks(bitboards, WHITE, occupied), _Side_Attacks(bitboards, BLACK, occupied)
+
+
+def Batch_In_Check(planes, side_to_move):
+    """(N,) bool: is the side to move in check."""
+    white_attacks, black_attacks = Batch_Attack_Maps(planes)
+    bitboards = Planes_To_Bitboards(planes)
+    side = np.asarray(side_to_move, dtype=bool)
+    king = np.where(side, bitboards[:, 5], bitboards[:, 11])
+    return (king & np.where(side, black_attacks, white_attacks)) != 0
+
+
+def _Oriented(bitboards, side):
+    # Piece bitboards split into the side to move ("us") and the opponent ("them").
+    us = np.where(side[:, None], bitboards[:, :6], bitboards[:, 6:])
+    them = np.where(side[:, None], bitboards[:, 6:], bitboards[:, :6])
+    return us, them
+
+
+def Batch_Legal_Move_Masks(planes, side_to_move, castling_rights, en_passant):
+    """(N, 64) uint64: legal target squares for the piece on each from-square.
+
+    Matches Board.Generate_Legal_Move_Codes move for move, including queen-only
+    promotions, so the popcount of a row is the number of legal moves from it.
+    """
+    tables = _Tables()
+    bitboards = Planes_To_Bitboards(planes)
+    count = len(bitboards)
+    side = np.asarray(side_to_move, dtype=bool)
+    castling = np.asarray(castling_rights, dtype=np.int64)
+    ep_square = np.asarray(en_passant, dtype=np.int64)
+
+    us, them = _Oriented(bitboards, side)
+    us_occ = np.bitwise_or.reduce(us, axis=1)
+    them_occ = np.bitwise_or.reduce(them, axis=1)
+    occupied = us_occ | them_occ
+    empty = ~occupied
+    king_bb = us[:, 5]
+    if np.any(_Popcount(king_bb) != 1) or np.any(_Popcount(them[:, 5]) != 1):
+        raise ValueError("every position needs exactly one king per side")
+    king_sq = _Bit_Index(king_bb)
+    rows = np.arange(count)
+
+    # Opponent attacks with our king lifted, so the king cannot retreat along a checking ray.
+    lifted = occupied ^ king_bb
+    white_attacks = _Side_Attacks(bitboards, WHITE, lifted)
+    black_attacks = _Side_Attacks(bitboards, BLACK, lifted)
+    them_attacks = np.where(side, black_attacks, white_attacks)
+
+    us_color = np.where(side, WHITE, BLACK)
+    checkers = (tables["pawn"][us_color, king_sq] & them[:, 0]) | (tables["knight"][king_sq] & them[:, 1])
+    pin_lines = np.full((count, 64), FULL_BOARD, dtype=np.uint64)
+    for rays, positive, orthogonal in tables["rays"]:
+        sliders = them[:, 4] | (them[:, 3] if orthogonal else them[:, 2])
+        ray = rays[king_sq]
+        blockers = ray & occupied
+        first = _Lowest_Bit(blockers) if positive else _Highest_Bit(blockers)
+        checkers |= first & sliders
+        rest = blockers ^ first
+        second = _Lowest_Bit(rest) if positive else _Highest_Bit(rest)
+        pinned = ((first & us_occ) != 0) & ((second & sliders) != 0)
+        if np.any(pinned):
+            idx = np.nonzero(pinned)[0]
+            line = _Ray_Attacks(ray[idx], positive, second[idx])
+            pin_lines[idx, _Bit_Index(first[idx])] = line
+
+    checker_count = _Popcount(checkers)
+    single = checker_count == 1
+    checker_sq = np.where(single, _Bit_Index(_Lowest_Bit(checkers)), 0)
+    evasion = np.where(
+        checker_count == 0,
+        _U(FULL_BOARD),
+        np.where(single, tables["between"][king_sq, checker_sq] | checkers, _U(0)),
+    )
+
+    # Every (position, square) pair holding one of our pieces is processed at once,
+    # one piece type at a time, so the Python-level loop is over six types only.
+    masks = np.zeros((count, 64), dtype=np.uint64)
+    piece_targets = ~us_occ & evasion
+    bits = tables["bits"]
+    stacked = np.asarray(planes).reshape(count, 12, 64) != 0
+    our_planes = np.where(side[:, None, None], stacked[:, :6], stacked[:, 6:])
+    for piece_type in range(5):
+        pos, square = np.nonzero(our_planes[:, piece_type])
+        if not len(pos):
+            continue
+        if piece_type == 0:
+            bit = bits[square]
+            white = side[pos]
+            free = empty[pos]
+            single = np.where(white, bit >> _U(8), bit << _U(8)) & free
+            on_start_row = np.where(white, square >> 3 == 6, square >> 3 == 1)
+            double = np.where(on_start_row, np.where(white, single >> _U(8), single << _U(8)) & free, _U(0))
+            targets = single | double | (tables["pawn"][us_color[pos], square] & them_occ[pos])
+        elif piece_type == 1:
+            targets = tables["knight"][square]
+        elif piece_type == 2:
+            targets = _Slider_Attacks(square, occupied[pos], False)
+        elif piece_type == 3:
+            targets = _Slider_Attacks(square, occupied[pos], True)
+        else:
+            targets = _Slider_Attacks(square, occupied[pos], False) | _Slider_Attacks(square, occupied[pos], True)
+        masks[pos, square] = targets & piece_targets[pos] & pin_lines[pos, square]
+
+    masks[rows, king_sq] = tables["king"][king_sq] & ~us_occ & ~them_attacks
+
+    _Add_Castling(masks, us, occupied, them_attacks, side, castling, checker_count)
+    _Add_En_Passant(masks, us, them, occupied, side, ep_square, king_sq, checker_count)
+    return masks
+
+
+def _Add_Castling(masks, us, occupied, them_attacks, side, castling, checker_count):
+    bits = _Tables()["bits"]
+    # (king square, rook square, right, squares that must be empty, squares that must be safe, target)
+    for white, king_sq, rook_sq, right, empty_squares, safe_squares, target in (
+        (True, 60, 63, CASTLE_WHITE_KINGSIDE, (61, 62), (61, 62), 62),
+        (True, 60, 56, CASTLE_WHITE_QUEENSIDE, (57, 58, 59), (59, 58), 58),
+        (False, 4, 7, CASTLE_BLACK_KINGSIDE, (5, 6), (5, 6), 6),
+        (False, 4, 0, CASTLE_BLACK_QUEENSIDE, (1, 2, 3), (3, 2), 2),
+    ):
+        must_be_empty = 0
+        for square in empty_squares:
+            must_be_empty |= 1 << square
+        must_be_safe = 0
+        for square in safe_squares:
+            must_be_safe |= 1 << square
+        allowed = (
+            (side == white)
+            & (checker_count == 0)
+            & ((castling & right) != 0)
+            & ((us[:, 5] & bits[king_sq]) != 0)
+            & ((us[:, 3] & bits[rook_sq]) != 0)
+            & ((occupied & _U(must_be_empty)) == 0)
+            & ((them_attacks & _U(must_be_safe)) == 0)
+        )
+        masks[:, king_sq] |= np.where(allowed, bits[target], _U(0))
+
+
+def _Add_En_Passant(masks, us, them, occupied, side, ep_square, king_sq, checker_count):
+    # Like the scalar generator, only king moves are tried in double check.
+    has_ep = (ep_square >= 0) & (checker_count < 2)
+    if not has_ep.any():
+        return
+    tables = _Tables()
+    idx = np.nonzero(has_ep)[0]
+    target_sq = ep_square[idx]
+    target = tables["bits"][target_sq]
+    white = side[idx]
+    # Our pawns that attack the target square sit where an opponent pawn on it would attack.
+    capturers = tables["pawn"][np.where(white, BLACK, WHITE), target_sq] & us[idx, 0]
+    captured = tables["bits"][np.where(white, target_sq + 8, target_sq - 8)]
+    kings = king_sq[idx]
+    us_color = np.where(white, WHITE, BLACK)
+    for _ in range(2):
+        origin = _Lowest_Bit(capturers)
+        capturers ^= origin
+        live = origin != 0
+        if not live.any():
+            break
+        after = (occupied[idx] ^ origin ^ captured) | target
+        enemy = them[idx]
+        attacked = (
+            ((tables["pawn"][us_color, kings] & enemy[:, 0] & ~captured) != 0)
+            | ((tables["knight"][kings] & enemy[:, 1]) != 0)
+            | ((_Slider_Attacks(kings, after, True) & (enemy[:, 3] | enemy[:, 4])) != 0)
+            | ((_Slider_Attacks(kings, after, False) & (enemy[:, 2] | enemy[:, 4])) != 0)
+        )
+        legal = live & ~attacked
+        if legal.any():
+            rows = idx[legal]
+            masks[rows, _Bit_Index(origin[legal])] |= target[legal]
+
+
+def Batch_Legal_Move_Counts(planes, side_to_move, castling_rights, en_passant):
+    """(N,) int64 legal move counts, equal to len(Board.Generate_Legal_Move_Codes())."""
+    masks = Batch_Legal_Move_Masks(planes, side_to_move, castling_rights, en_passant)
+    return _Popcount(masks).sum(axis=1)
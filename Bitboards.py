@@ -0,0 +1,199 @@
+PIECE_ORDER = "PNBRQKpnbrqk"
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECE_ORDER)}
+
+WHITE = 0
+BLACK = 1
+
+WHITE_PAWN, WHITE_KNIGHT, WHITE_BISHOP, WHITE_ROOK, WHITE_QUEEN, WHITE_KING = range(6)
+BLACK_PAWN, BLACK_KNIGHT, BLACK_BISHOP, BLACK_ROOK, BLACK_QUEEN, BLACK_KING = range(6, 12)
+PIECE_COLOR = (WHITE,) * 6 + (BLACK,) * 6
+
+# Square index layout matches the 8x8 grid: sq = row * 8 + col, so a8 = 0 and h1 = 63.
+SQUARE_BITS = tuple(1 << square for square in range(64))
+SQUARE_COORDS = tuple((square >> 3, square & 7) for square in range(64))
+
+CASTLE_WHITE_KINGSIDE = 1
+CASTLE_WHITE_QUEENSIDE = 2
+CASTLE_BLACK_KINGSIDE = 4
+CASTLE_BLACK_QUEENSIDE = 8
+CASTLING_FLAGS = "KQkq"
+
+FULL_BOARD = (1 << 64) - 1
+FILE_A = sum(1 << (row * 8) for row in range(8))
+FILE_H = FILE_A << 7
+ROW_MASKS = tuple(0xFF << (row * 8) for row in range(8))
+
+
+def Square_Index(row: int, col: int) -> int:
+    return row * 8 + col
+
+
+def Castling_Rights_From_String(text: str) -> int:
+    rights = 0
+    for index, flag in enumerate(CASTLING_FLAGS):
+        if flag in text:
+            rights |= 1 << index
+    return rights
+
+
+def Castling_Rights_To_String(rights: int) -> str:
+    return "".join(flag for index, flag in enumerate(CASTLING_FLAGS) if rights & (1 << index)) or "-"
+
+
+def Iter_Bits(bitboard: int):
+    while bitboard:
+        lsb = bitboard & -bitboard
+        yield lsb.bit_length() - 1
+        bitboard ^= lsb
+
+
+def _Build_Step_Masks(deltas: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    masks = []
+    for square in range(64):
+        row, col = SQUARE_COORDS[square]
+        mask = 0
+        for dr, dc in deltas:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+        masks.append(mask)
+    return tuple(masks)
+
+
+def _Build_Ray_Masks(dr: int, dc: int) -> tuple[int, ...]:
+    masks = []
+    for square in range(64):
+        row, col = SQUARE_COORDS[square]
+        mask = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << (r * 8 + c)
+            r += dr
+            c += dc
+        masks.append(mask)
+    return tuple(masks)
+
+
+KNIGHT_ATTACKS = _Build_Step_Masks((
+    (2, 1), (1, 2), (-1, 2), (-2, 1),
+    (-2, -1), (-1, -2), (1, -2), (2, -1),
+))
+KING_ATTACKS = _Build_Step_Masks((
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+))
+# PAWN_ATTACKS[color][sq] is the set of squares a pawn of that color on sq attacks.
+PAWN_ATTACKS = (
+    _Build_Step_Masks(((-1, -1), (-1, 1))),
+    _Build_Step_Masks(((1, -1), (1, 1))),
+)
+
+# CASTLING_RIGHTS_MASK[sq] keeps the rights that survive a move starting or ending on sq.
+_castling_masks = [15] * 64
+_castling_masks[60] = 15 & ~(CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE)
+_castling_masks[63] = 15 & ~CASTLE_WHITE_KINGSIDE
+_castling_masks[56] = 15 & ~CASTLE_WHITE_QUEENSIDE
+_castling_masks[4] = 15 & ~(CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE)
+_castling_masks[7] = 15 & ~CASTLE_BLACK_KINGSIDE
+_castling_masks[0] = 15 & ~CASTLE_BLACK_QUEENSIDE
+CASTLING_RIGHTS_MASK = tuple(_castling_masks)
+
+# Rays that move towards higher square indices resolve their first blocker with the
+# lowest set bit, the others with the highest set bit.
+RAY_SOUTH = _Build_Ray_Masks(1, 0)
+RAY_EAST = _Build_Ray_Masks(0, 1)
+RAY_SOUTH_EAST = _Build_Ray_Masks(1, 1)
+RAY_SOUTH_WEST = _Build_Ray_Masks(1, -1)
+RAY_NORTH = _Build_Ray_Masks(-1, 0)
+RAY_WEST = _Build_Ray_Masks(0, -1)
+RAY_NORTH_EAST = _Build_Ray_Masks(-1, 1)
+RAY_NORTH_WEST = _Build_Ray_Masks(-1, -1)
+
+# Slider directions grouped as (ascending rays, descending rays) for first-blocker scans.
+ROOK_RAYS = ((RAY_SOUTH, RAY_EAST), (RAY_NORTH, RAY_WEST))
+BISHOP_RAYS = ((RAY_SOUTH_EAST, RAY_SOUTH_WEST), (RAY_NORTH_EAST, RAY_NORTH_WEST))
+QUEEN_RAYS = (ROOK_RAYS[0] + BISHOP_RAYS[0], ROOK_RAYS[1] + BISHOP_RAYS[1])
+
+ROOK_EMPTY_ATTACKS = tuple(RAY_SOUTH[sq] | RAY_EAST[sq] | RAY_NORTH[sq] | RAY_WEST[sq] for sq in range(64))
+BISHOP_EMPTY_ATTACKS = tuple(
+    RAY_SOUTH_EAST[sq] | RAY_SOUTH_WEST[sq] | RAY_NORTH_EAST[sq] | RAY_NORTH_WEST[sq] for sq in range(64)
+)
+
+
+def _Build_Line_Tables() -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    ray_pairs = (
+        (RAY_SOUTH, RAY_NORTH), (RAY_EAST, RAY_WEST),
+        (RAY_SOUTH_EAST, RAY_NORTH_WEST), (RAY_SOUTH_WEST, RAY_NORTH_EAST),
+    )
+    for origin in range(64):
+        for forward, backward in ray_pairs:
+            full_line = forward[origin] | backward[origin] | SQUARE_BITS[origin]
+            for ray in (forward, backward):
+                for target in Iter_Bits(ray[origin]):
+                    between[origin][target] = ray[origin] & ~ray[target] & ~SQUARE_BITS[target]
+                    line[origin][target] = full_line
+    return tuple(tuple(row) for row in between), tuple(tuple(row) for row in line)
+
+
+# BETWEEN[a][b] holds the squares strictly between two aligned squares and LINE[a][b]
+# the full rank, file or diagonal through both; both are empty for unaligned pairs.
+BETWEEN, LINE = _Build_Line_Tables()
+
+
+def Rook_Attacks(square: int, occupied: int) -> int:
+    ray = RAY_SOUTH[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_SOUTH[(blockers & -blockers).bit_length() - 1]
+    attacks = ray
+
+    ray = RAY_EAST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_EAST[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+
+    ray = RAY_NORTH[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_NORTH[blockers.bit_length() - 1]
+    attacks |= ray
+
+    ray = RAY_WEST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_WEST[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def Bishop_Attacks(square: int, occupied: int) -> int:
+    ray = RAY_SOUTH_EAST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_SOUTH_EAST[(blockers & -blockers).bit_length() - 1]
+    attacks = ray
+
+    ray = RAY_SOUTH_WEST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_SOUTH_WEST[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+
+    ray = RAY_NORTH_EAST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_NORTH_EAST[blockers.bit_length() - 1]
+    attacks |= ray
+
+    ray = RAY_NORTH_WEST[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_NORTH_WEST[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def Queen_Attacks(square: int, occupied: int) -> int:
+    return Rook_Attacks(square, occupied) | Bishop_Attacks(square, occupied)
@@ -1,64 +1,122 @@
+import struct
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Tuple, List
-from Move import Move
-from Zobrist import hash_board, ZOBRIST_PIECES, ZOBRIST_CASTLING, ZOBRIST_EN_PASSANT, ZOBRIST_TURN
-
-
-_ORTHOGONAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
-_DIAGONAL_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
-_ALL_DIRECTIONS = _ORTHOGONAL_DIRECTIONS + _DIAGONAL_DIRECTIONS
-_KNIGHT_JUMPS = (
-    (2, 1), (1, 2), (-1, 2), (-2, 1),
-    (-2, -1), (-1, -2), (1, -2), (2, -1),
+from typing import Optional, Tuple
+from Move import Move, Encode_Move, MOVE_NONE, MOVE_NORMAL, MOVE_PROMOTION, MOVE_EN_PASSANT, MOVE_CASTLING, PROMOTION_PIECES, PROMOTION_QUEEN, PROMOTION_QUEEN_MOVE
+from Zobrist import hash_board, ZOBRIST_PIECES, ZOBRIST_CASTLING_RIGHTS, ZOBRIST_EN_PASSANT, ZOBRIST_TURN, ZOBRIST_MATERIAL
+from Bitboards import (
+    PIECE_ORDER,
+    PIECE_INDEX,
+    PIECE_COLOR,
+    WHITE,
+    BLACK,
+    WHITE_PAWN,
+    BLACK_PAWN,
+    WHITE_KING,
+    BLACK_KING,
+    SQUARE_BITS,
+    SQUARE_COORDS,
+    FULL_BOARD,
+    FILE_A,
+    FILE_H,
+    ROW_MASKS,
+    CASTLE_WHITE_KINGSIDE,
+    CASTLE_WHITE_QUEENSIDE,
+    CASTLE_BLACK_KINGSIDE,
+    CASTLE_BLACK_QUEENSIDE,
+    CASTLING_RIGHTS_MASK,
+    Castling_Rights_From_String,
+    Castling_Rights_To_String,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    BETWEEN,
+    LINE,
+    ROOK_EMPTY_ATTACKS,
+    BISHOP_EMPTY_ATTACKS,
+    ROOK_RAYS,
+    BISHOP_RAYS,
+    QUEEN_RAYS,
+    Rook_Attacks,
+    Bishop_Attacks,
+    Iter_Bits,
 )
-_KING_STEPS = (
-    (-1, -1), (-1, 0), (-1, 1),
-    (0, -1),           (0, 1),
-    (1, -1),  (1, 0),  (1, 1),
-)
-_WHITE_PIECES = frozenset("PNBRQK")
-_BLACK_PIECES = frozenset("pnbrqk")
-
-
-def _Build_Attack_Origin_Masks(deltas: Tuple[Tuple[int, int], ...]) -> tuple[tuple[tuple[Tuple[int, int], ...], ...], ...]:
-    masks = []
-    for row in range(8):
-        row_masks = []
-        for col in range(8):
-            origins = []
-            for dr, dc in deltas:
-                origin_row = row + dr
-                origin_col = col + dc
-                if 0 <= origin_row < 8 and 0 <= origin_col < 8:
-                    origins.append((origin_row, origin_col))
-            row_masks.append(tuple(origins))
-        masks.append(tuple(row_masks))
-    return tuple(masks)
-
+from Mailbox import EMPTY, PIECE_CODES, CODE_PIECES, SQUARE_TO_MAILBOX, New_Mailbox, Mailbox_From_Grid
+
+GENERATE_ALL = 0
+GENERATE_NOISY = 1
+GENERATE_QUIET = 2
+LEGAL_MOVE_CACHE_SIZE = 4096
+
+# Fixed-size position record: 32 bytes of piece nibbles (two squares per byte, a8 first,
+# mailbox piece codes), then side/castling flags, en passant square (255 = none) and
+# the two clocks.
+POSITION_STRUCT = struct.Struct('<32sBBHH')
+POSITION_BYTES = POSITION_STRUCT.size
+_PACKED_PAIRS = tuple(SQUARE_TO_MAILBOX[square] for square in range(0, 64, 2))
+_LOW_NIBBLE = bytes(value & 15 for value in range(256))
+_HIGH_NIBBLE = bytes(value >> 4 for value in range(256))
+_EMPTY_MAILBOX = bytes(New_Mailbox())
+_NO_EN_PASSANT = 255
+
+
+# Undo records live in a per-board stack that only grows; Make_Move overwrites the
+# record at the current ply so a make/undo pair allocates nothing in steady state.
+@dataclass(slots=True)
+class MoveState:
+    move: int = MOVE_NONE
+    captured_piece: str = '.'
+    castling_rights: int = 0
+    en_passant_square: Optional[Tuple[int, int]] = None
+    halfmove_clock: int = 0
+    fullmove_number: int = 1
+    white_to_move: bool = True
+    moved_piece: str = '.'
+    zobrist_key: int = 0
+    pawn_key: int = 0
+    material_key: int = 0
+    white_king_pos: Tuple[int, int] = (-1, -1)
+    black_king_pos: Tuple[int, int] = (-1, -1)
+    rook_from: int = -1
+    rook_to: int = -1
+    ep_capture_square: int = -1
+
+
+# Legal move lists for callers outside the search (PV walk, UCI, match runners).
+# The Zobrist key covers everything move generation reads (placement, side to move,
+# castling rights, en passant square), so an entry can never go stale; the only
+# invalidation is LRU eviction or an explicit Clear().
+class LegalMoveCache:
+    def __init__(self, max_entries: int = LEGAL_MOVE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def Get(self, board) -> tuple:
+        key = board.zobrist_key
+        entries = self.entries
+        moves = entries.get(key)
+        if moves is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return moves
+
+        self.misses += 1
+        moves = tuple(board.Generate_Legal_Move_Codes())
+        entries[key] = moves
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return moves
 
-_KNIGHT_ATTACK_ORIGINS = _Build_Attack_Origin_Masks(_KNIGHT_JUMPS)
-_KING_ATTACK_ORIGINS = _Build_Attack_Origin_Masks(_KING_STEPS)
-_WHITE_PAWN_ATTACK_ORIGINS = _Build_Attack_Origin_Masks(((1, -1), (1, 1)))
-_BLACK_PAWN_ATTACK_ORIGINS = _Build_Attack_Origin_Masks(((-1, -1), (-1, 1)))
+    def Clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
 
 
-@dataclass(slots=True)
-class MoveState:
-    move: Optional[Move]
-    captured_piece: str
-    castling_rights: frozenset[str]
-    en_passant_square: Optional[Tuple[int, int]]
-    halfmove_clock: int
-    fullmove_number: int
-    white_to_move: bool
-    moved_piece: str
-    zobrist_key: int
-    white_king_pos: Tuple[int, int]
-    black_king_pos: Tuple[int, int]
-    rook_from: Optional[Tuple[int, int]] = None
-    rook_to: Optional[Tuple[int, int]] = None
-    ep_capture: Optional[Tuple[int, int, str]] = None
-    repetition_hash: Optional[int] = None
+LEGAL_MOVE_CACHE = LegalMoveCache()
 
 
 class Board:
@@ -69,11 +127,15 @@ class Board:
         self.board = [['.'] * 8 for _ in range(8)]
 
         self.white_to_move = True
-        self.castling_rights = set()
+        self.castling_rights = 0
         self.en_passant_square :  Optional [Tuple[int, int]] = None
         self.halfmove_clock = 0
         self.fullmove_number = 1
-        self.move_history = []
+        self.state_stack = []
+        self.history_ply = 0
+        # Per-board scratch list reused by the counting/any-move queries, so they never
+        # allocate a move list and never share one with another board or thread.
+        self.scratch_moves = array('H')
         self.position_history = {}
         self.track_repetition = True
         self.Load_FEN(Board.START_FEN)
@@ -134,37 +196,96 @@ class Board:
             row_idx += 1
 
         self.board = new_board
+        self.mailbox = Mailbox_From_Grid(new_board)
+        self._Rebuild_Bitboards()
         self.white_to_move = active_color == 'w'
-        self.castling_rights = set() if castling == '-' else set(castling)
+        self.castling_rights = Castling_Rights_From_String(castling)
         self.en_passant_square = None if en_passant == '-' else self._Square_To_Coords(en_passant)
         self.halfmove_clock = int(halfmove)
         self.fullmove_number = int(fullmove)
-        self.move_history = []
-        self.zobrist_key = hash_board(self)
+        self.history_ply = 0
+        self.zobrist_key, self.pawn_key, self.material_key = hash_board(self, all_keys=True)
+        self._check_info_key = None
+        self._pin_info_key = None
         self._Rebuild_Position_History()
 
+    def _Rebuild_Bitboards(self):
+        bitboards = [0] * 12
+        occupancy = [0, 0]
+        for row, board_row in enumerate(self.board):
+            for col, piece in enumerate(board_row):
+                if piece == '.':
+                    continue
+                piece_index = PIECE_INDEX[piece]
+                bit = SQUARE_BITS[row * 8 + col]
+                bitboards[piece_index] |= bit
+                occupancy[PIECE_COLOR[piece_index]] |= bit
+        self.bitboards = bitboards
+        self.occupancy = occupancy
+        self.occupied = occupancy[WHITE] | occupancy[BLACK]
+
+    def _Put_Piece(self, row: int, col: int, piece: str):
+        bit = SQUARE_BITS[row * 8 + col]
+        previous = self.board[row][col]
+        if previous != '.':
+            previous_index = PIECE_INDEX[previous]
+            self.bitboards[previous_index] ^= bit
+            self.occupancy[PIECE_COLOR[previous_index]] ^= bit
+        if piece != '.':
+            piece_index = PIECE_INDEX[piece]
+            self.bitboards[piece_index] |= bit
+            self.occupancy[PIECE_COLOR[piece_index]] |= bit
+        self._Set_Square(row * 8 + col, piece)
+        self.occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+
+    def Piece_Bitboard(self, piece: str) -> int:
+        return self.bitboards[PIECE_INDEX[piece]]
+
+    def Piece_Squares(self, piece: str):
+        return Iter_Bits(self.bitboards[PIECE_INDEX[piece]])
+
+    def Piece_Count(self, piece: str) -> int:
+        return self.bitboards[PIECE_INDEX[piece]].bit_count()
+
+    def Iter_Pieces(self, white: Optional[bool] = None):
+        pieces = PIECE_ORDER if white is None else (PIECE_ORDER[:6] if white else PIECE_ORDER[6:])
+        bitboards = self.bitboards
+        for piece in pieces:
+            for square in Iter_Bits(bitboards[PIECE_INDEX[piece]]):
+                yield square, piece
+
     def Print_Board (self):
         for row in self.board:
             print (' '.join(row))
 
         print (f"turn: {'white' if self.white_to_move else 'black'}")
-        print (f"castling rights: {self.castling_rights}")
+        print (f"castling rights: {Castling_Rights_To_String(self.castling_rights)}")
         print (f"en passant square: {self.en_passant_square}")
         print (f"halfmove clock: {self.halfmove_clock}")
         print (f"fullmove number: {self.fullmove_number}")
     
+    @property
+    def move_history(self) -> list:
+        return [state.move for state in self.state_stack[:self.history_ply]]
+
     def Hash_Board(self) -> str:
         return self.zobrist_key
     
     def Copy_For_Color(self, white: bool, isolate_history: bool = True):
         clone = Board.__new__(Board)
         clone.board = [row[:] for row in self.board]
+        clone.mailbox = self.mailbox[:]
+        clone.bitboards = self.bitboards[:]
+        clone.occupancy = self.occupancy[:]
+        clone.occupied = self.occupied
         clone.white_to_move = white
-        clone.castling_rights = self.castling_rights.copy()
+        clone.castling_rights = self.castling_rights
         clone.en_passant_square = self.en_passant_square
         clone.halfmove_clock = self.halfmove_clock
         clone.fullmove_number = self.fullmove_number
-        clone.move_history = []
+        clone.state_stack = []
+        clone.history_ply = 0
+        clone.scratch_moves = array('H')
         if isolate_history:
             # Search copies should not mutate repetition data from the UI/game board.
             clone.position_history = {}
@@ -173,24 +294,142 @@ class Board:
             clone.position_history = self.position_history.copy()
             clone.track_repetition = self.track_repetition
         clone.zobrist_key = self.zobrist_key
+        clone.pawn_key = self.pawn_key
+        clone.material_key = self.material_key
         clone.white_king_pos = self.white_king_pos
         clone.black_king_pos = self.black_king_pos
+        clone._check_info_key = None
+        clone._pin_info_key = None
         return clone
     
-    def Get_Pseudo_Legal_Moves (self, include_castling = True) -> list:
-        moves = []
-        side_to_move_is_white = self.white_to_move
+    def To_Bytes(self) -> bytes:
+        mailbox = self.mailbox
+        placement = bytes([mailbox[index] | (mailbox[index + 1] << 4) for index in _PACKED_PAIRS])
+        flags = (1 if self.white_to_move else 0) | (self.castling_rights << 1)
+        ep = self.en_passant_square
+        ep_square = _NO_EN_PASSANT if ep is None else ep[0] * 8 + ep[1]
+        return POSITION_STRUCT.pack(placement, flags, ep_square, self.halfmove_clock, self.fullmove_number)
+
+    @classmethod
+    def From_Bytes(cls, data: bytes) -> 'Board':
+        board = cls.__new__(cls)
+        board._Load_Bytes(data)
+        board.track_repetition = True
+        board._Rebuild_Position_History()
+        return board
+
+    def Clone(self) -> 'Board':
+        # In-process copies reuse the already decoded arrays; a To_Bytes/From_Bytes
+        # round trip is only worth it across a process or storage boundary.
+        return self.Copy_For_Color(self.white_to_move, isolate_history=False)
+
+    def _Load_Bytes(self, data: bytes):
+        if len(data) != POSITION_BYTES:
+            raise ValueError(f"Invalid position record (expected {POSITION_BYTES} bytes, got {len(data)})")
+        placement, flags, ep_square, halfmove, fullmove = POSITION_STRUCT.unpack(data)
+
+        codes = bytearray(64)
+        codes[0::2] = placement.translate(_LOW_NIBBLE)
+        codes[1::2] = placement.translate(_HIGH_NIBBLE)
+        if max(codes) > 12:
+            raise ValueError(f"Invalid piece code {max(codes)} in position record")
+
+        mailbox = bytearray(_EMPTY_MAILBOX)
+        grid = []
         for row in range(8):
-            board_row = self.board[row]
-            for col in range(8):
-                piece = board_row[col]
-                if piece == '.':
-                    continue
+            row_codes = codes[row * 8:row * 8 + 8]
+            mailbox[21 + row * 10:29 + row * 10] = row_codes
+            grid.append([CODE_PIECES[code] for code in row_codes])
+
+        # Keys are accumulated in the same pass instead of a second hash_board scan.
+        bitboards = [0] * 12
+        occupancy = [0, 0]
+        key = pawn_key = material_key = 0
+        for square, code in enumerate(codes):
+            if code:
+                piece_index = code - 1
+                bit = SQUARE_BITS[square]
+                material_key ^= ZOBRIST_MATERIAL[piece_index * 16 + bitboards[piece_index].bit_count()]
+                bitboards[piece_index] |= bit
+                occupancy[PIECE_COLOR[piece_index]] |= bit
+                piece_key = ZOBRIST_PIECES[piece_index * 64 + square]
+                key ^= piece_key
+                if piece_index == WHITE_PAWN or piece_index == BLACK_PAWN:
+                    pawn_key ^= piece_key
+
+        self.board = grid
+        self.mailbox = mailbox
+        self.bitboards = bitboards
+        self.occupancy = occupancy
+        self.occupied = occupancy[WHITE] | occupancy[BLACK]
+        white_king = bitboards[WHITE_KING]
+        black_king = bitboards[BLACK_KING]
+        self.white_king_pos = SQUARE_COORDS[white_king.bit_length() - 1] if white_king else (-1, -1)
+        self.black_king_pos = SQUARE_COORDS[black_king.bit_length() - 1] if black_king else (-1, -1)
+        self.white_to_move = bool(flags & 1)
+        self.castling_rights = (flags >> 1) & 15
+        self.en_passant_square = None if ep_square == _NO_EN_PASSANT else SQUARE_COORDS[ep_square]
+        self.halfmove_clock = halfmove
+        self.fullmove_number = fullmove
+
+        key ^= ZOBRIST_CASTLING_RIGHTS[self.castling_rights]
+        if ep_square != _NO_EN_PASSANT:
+            key ^= ZOBRIST_EN_PASSANT[ep_square & 7]
+        if self.white_to_move:
+            key ^= ZOBRIST_TURN
+        self.zobrist_key = key
+        self.pawn_key = pawn_key
+        self.material_key = material_key
+        self.state_stack = []
+        self.history_ply = 0
+        self.scratch_moves = array('H')
+        self._check_info_key = None
+        self._pin_info_key = None
+
+    def Move_From_Code(self, code: int) -> Move:
+        from_sq = code & 63
+        to_sq = (code >> 6) & 63
+        flag = code >> 14
+        mailbox = self.mailbox
+        start = SQUARE_COORDS[from_sq]
+        end = SQUARE_COORDS[to_sq]
+        piece = CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[from_sq]]]
+        target = mailbox[SQUARE_TO_MAILBOX[to_sq]]
+        captured = CODE_PIECES[target] if target != EMPTY else None
+        if flag == MOVE_PROMOTION:
+            choice = PROMOTION_PIECES[(code >> 12) & 3]
+            return Move(start, end, piece, captured, is_pawn_promotion=True, promotion_choice=choice if piece == 'P' else choice.lower())
+        if flag == MOVE_EN_PASSANT:
+            return Move(start, end, piece, 'p' if piece == 'P' else 'P', is_en_passant=True)
+        if flag == MOVE_CASTLING:
+            return Move(start, end, piece, is_castling=True)
+        return Move(start, end, piece, captured)
+
+    def Move_Moved_Piece(self, code: int) -> str:
+        return CODE_PIECES[self.mailbox[SQUARE_TO_MAILBOX[code & 63]]]
+
+    def Move_Captured_Piece(self, code: int) -> Optional[str]:
+        if code >> 14 == MOVE_EN_PASSANT:
+            return 'p' if self.white_to_move else 'P'
+        target = self.mailbox[SQUARE_TO_MAILBOX[(code >> 6) & 63]]
+        return CODE_PIECES[target] if target != EMPTY else None
 
-                if piece.isupper() == side_to_move_is_white:
-                    self._Generate_Piece_Moves(piece, row, col, moves, include_castling)
+    def Get_Pseudo_Legal_Moves (self, include_castling = True) -> list:
+        return [self.Move_From_Code(code) for code in self.Get_Pseudo_Legal_Move_Codes(include_castling)]
+
+    def Get_Pseudo_Legal_Move_Codes(self, include_castling = True, moves = None):
+        if moves is None:
+            moves = array('H')
+        mailbox = self.mailbox
+        remaining = self.occupancy[WHITE if self.white_to_move else BLACK]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            square = bit.bit_length() - 1
+            row, col = SQUARE_COORDS[square]
+            self._Generate_Piece_Moves(CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[square]]], row, col, moves, include_castling)
         return moves
-    
+
     def _Generate_Piece_Moves(
         self,
         piece: str,
@@ -202,343 +441,511 @@ class Board:
     ):
         is_white = self.white_to_move if white is None else white
         piece_type = piece.upper()
+        square = row * 8 + col
+        friendly = self.occupancy[WHITE if is_white else BLACK]
 
         if piece_type == 'P':
-            self._Generate_Pawn_Moves(row, col, moves, is_white)
-        elif piece_type == 'N':
-            self._Generate_Knight_Moves(row, col, moves, is_white)
-        elif piece_type == 'B':
-            self._Generate_Bishop_Moves(row, col, moves, is_white)
-        elif piece_type == 'R':
-            self._Generate_Rook_Moves(row, col, moves, is_white)
-        elif piece_type == 'Q':
-            self._Generate_Queen_Moves(row, col, moves, is_white)
-        elif piece_type == 'K':
-            self._Generate_King_Moves(row, col, moves, is_white)
-        
+            self._Add_Pawn_Moves(square, is_white, moves, FULL_BOARD, GENERATE_ALL, False)
+            return
+
+        targets = self._Piece_Attacks(piece_type, square, self.occupied) & ~friendly
+        self._Add_Target_Moves(square, targets, moves)
+
         if piece_type == 'K' and include_castling:
             if is_white:
                 self._Get_White_Castling_Moves(moves)
             else:
                 self._Get_Black_Castling_Moves(moves)
 
-    def _Generate_Pawn_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        direction = -1 if is_white else 1
-        start_row = 6 if is_white else 1
-        promotion_choice = 'Q' if is_white else 'q'
-
-        one_forward = row + direction
-        if 0 <= one_forward < 8 and self.board[one_forward][col] == '.':
-            end_row = one_forward
-            if end_row == 0 or end_row == 7:
-                moves.append(Move((row, col), (end_row, col), self.board[row][col], is_pawn_promotion=True, promotion_choice=promotion_choice))
-            else:
-                moves.append(Move((row, col), (end_row, col), self.board[row][col]))
-
-            two_forward = row + 2 * direction
-            if row == start_row and 0 <= two_forward < 8 and self.board[two_forward][col] == '.':
-                moves.append(Move((row, col), (two_forward, col), self.board[row][col]))
+    def _Piece_Attacks(self, piece_type: str, square: int, occupied: int) -> int:
+        if piece_type == 'N':
+            return KNIGHT_ATTACKS[square]
+        if piece_type == 'B':
+            return Bishop_Attacks(square, occupied)
+        if piece_type == 'R':
+            return Rook_Attacks(square, occupied)
+        if piece_type == 'Q':
+            return Rook_Attacks(square, occupied) | Bishop_Attacks(square, occupied)
+        return KING_ATTACKS[square]
+
+    def _Add_Target_Moves(self, square: int, targets: int, moves):
+        append = moves.append
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            append(square | ((bit.bit_length() - 1) << 6))
+
+    def _Add_Pawn_Moves(
+        self,
+        square: int,
+        is_white: bool,
+        moves,
+        allowed: int,
+        stage: int,
+        validate_en_passant: bool,
+    ):
+        occupied = self.occupied
+        if is_white:
+            step = -8
+            start_row = 6
+            promotion_row = 0
+            enemy = self.occupancy[BLACK]
+            attacks = PAWN_ATTACKS[WHITE][square]
+        else:
+            step = 8
+            start_row = 1
+            promotion_row = 7
+            enemy = self.occupancy[WHITE]
+            attacks = PAWN_ATTACKS[BLACK][square]
+
+        one_forward = square + step
+        if 0 <= one_forward < 64 and not occupied & SQUARE_BITS[one_forward]:
+            if one_forward >> 3 == promotion_row:
+                if allowed & SQUARE_BITS[one_forward] and stage != GENERATE_QUIET:
+                    moves.append(PROMOTION_QUEEN_MOVE | square | (one_forward << 6))
+            elif stage != GENERATE_NOISY:
+                if allowed & SQUARE_BITS[one_forward]:
+                    moves.append(square | (one_forward << 6))
+
+                two_forward = one_forward + step
+                if square >> 3 == start_row and not occupied & SQUARE_BITS[two_forward] and allowed & SQUARE_BITS[two_forward]:
+                    moves.append(square | (two_forward << 6))
+
+        if stage == GENERATE_QUIET:
+            return
 
         #capture
-        for dx in [-1, 1]:
-            new_col = col + dx
-            new_row = row + direction
-            if 0 <= new_col < 8 and 0 <= new_row < 8:
-                target = self.board[new_row][new_col]
-                if target != "." and target.isupper() != is_white:
-                    if new_row == 0 or new_row == 7:
-                        moves.append(Move((row, col), (new_row, new_col), self.board[row][col], target, is_pawn_promotion=True, promotion_choice=promotion_choice))
-                    else:
-                        moves.append(Move((row, col), (new_row, new_col), self.board[row][col], target))
+        captures = attacks & enemy & allowed
+        while captures:
+            bit = captures & -captures
+            captures ^= bit
+            target_sq = bit.bit_length() - 1
+            if target_sq >> 3 == promotion_row:
+                moves.append(PROMOTION_QUEEN_MOVE | square | (target_sq << 6))
+            else:
+                moves.append(square | (target_sq << 6))
 
         #en passant
         if self.en_passant_square:
             ep_row, ep_col = self.en_passant_square
-            if (row + direction, ep_col) == self.en_passant_square and abs (ep_col - col) == 1:
-                moves.append(Move((row, col), self.en_passant_square, self.board[row][col], piece_captured='p' if is_white else 'P', is_en_passant=True))
-
-    def _Generate_Knight_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        directions = [(1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1)]
-
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-
-            if 0 <= r < 8 and 0 <= c < 8:
-                target = self.board[r][c]
-                if target == '.' or target.isupper() != is_white:
-                    moves.append (Move((row, col), (r, c), self.board[row][col], target if target != '.' else None))
-    
-    def _Generate_Bishop_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        self._Slide_Moves(row, col, directions, moves, is_white)
-
-    def _Generate_Rook_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        self._Slide_Moves(row, col, directions, moves, is_white)
-
-    def _Generate_Queen_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)]
-        self._Slide_Moves(row, col, directions, moves, is_white)
-
-    def _Generate_King_Moves (self, row: int, col: int, moves: list, is_white: bool):
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)]
-
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                target = self.board[r][c]
-                if target == '.' or target.isupper() != is_white:
-                    moves.append(Move((row, col), (r, c), self.board[row][col], target if target != '.' else None))
-
-    def _Slide_Moves (self, row: int, col: int, directions: List[Tuple[int, int]], moves: list, is_white: bool):
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                target = self.board[r][c]
-                if target == '.':
-                    moves.append (Move((row, col), (r, c), self.board[row][col]))
-                elif target.isupper() == is_white:
-                    break
-                elif target.lower() == 'k':
-                    break
-                else:
-                    moves.append (Move((row, col), (r, c), self.board[row][col], target))
-                    break
-                r += dr
-                c += dc
+            ep_sq = ep_row * 8 + ep_col
+            if attacks & SQUARE_BITS[ep_sq]:
+                move = Encode_Move(square, ep_sq, MOVE_EN_PASSANT)
+                if not validate_en_passant or self._Validate_Legal_Move(move):
+                    moves.append(move)
 
     def _Get_White_Castling_Moves (self, moves: list):
         if self.board[7][4] != 'K':
             return
-        
-        if "K" in self.castling_rights:
+
+        if self.castling_rights & CASTLE_WHITE_KINGSIDE:
             if self.board[7][5] == '.' and self.board[7][6] == '.' and self.board[7][7] == 'R':
                 if not self._Is_Square_Attacked((7, 4), False) and not self._Is_Square_Attacked((7, 5), False) and not self._Is_Square_Attacked((7, 6), False):
-                    moves.append(Move((7, 4), (7, 6), "K", is_castling=True))
+                    moves.append(Encode_Move(60, 62, MOVE_CASTLING))
 
-        if "Q" in self.castling_rights:
+        if self.castling_rights & CASTLE_WHITE_QUEENSIDE:
             if self.board[7][1] == '.' and self.board[7][2] == '.' and self.board[7][3] == '.' and self.board[7][0] == 'R':
                 if not self._Is_Square_Attacked((7, 4), False) and not self._Is_Square_Attacked((7, 3), False) and not self._Is_Square_Attacked((7, 2), False):
-                    moves.append(Move((7, 4), (7, 2), "K", is_castling=True))
+                    moves.append(Encode_Move(60, 58, MOVE_CASTLING))
 
     def _Get_Black_Castling_Moves (self, moves: list):
         if self.board[0][4] != 'k':
             return
-        
-        if "k" in self.castling_rights:
+
+        if self.castling_rights & CASTLE_BLACK_KINGSIDE:
             if self.board[0][5] == '.' and self.board[0][6] == '.' and self.board[0][7] == 'r':
                 if not self._Is_Square_Attacked((0, 4), True) and not self._Is_Square_Attacked((0, 5), True) and not self._Is_Square_Attacked((0, 6), True):
-                    moves.append (Move((0, 4), (0, 6), "k", is_castling=True))
+                    moves.append(Encode_Move(4, 6, MOVE_CASTLING))
 
-        if "q" in self.castling_rights:
+        if self.castling_rights & CASTLE_BLACK_QUEENSIDE:
             if self.board[0][3] == '.' and self.board[0][2] == '.' and self.board[0][1] == '.' and self.board[0][0] == 'r':
                 if not self._Is_Square_Attacked((0, 4), True) and not self._Is_Square_Attacked((0, 3), True) and not self._Is_Square_Attacked((0, 2), True):
-                    moves.append (Move((0, 4), (0, 2), "k", is_castling=True))
-
-    def _Is_Square_Attacked(self, position: tuple, by_white: bool) -> bool:
-        row, col = position
-        board = self.board
-        pawn_origins = _WHITE_PAWN_ATTACK_ORIGINS if by_white else _BLACK_PAWN_ATTACK_ORIGINS
-        attacker_pawn = 'P' if by_white else 'p'
-        for origin_row, origin_col in pawn_origins[row][col]:
-            if board[origin_row][origin_col] == attacker_pawn:
-                return True
+                    moves.append(Encode_Move(4, 2, MOVE_CASTLING))
 
-        attacker_knight = 'N' if by_white else 'n'
-        for origin_row, origin_col in _KNIGHT_ATTACK_ORIGINS[row][col]:
-            if board[origin_row][origin_col] == attacker_knight:
-                return True
-
-        attacker_king = 'K' if by_white else 'k'
-        for origin_row, origin_col in _KING_ATTACK_ORIGINS[row][col]:
-            if board[origin_row][origin_col] == attacker_king:
-                return True
+    def _Attackers_To(self, square: int, by_white: bool, occupied: int) -> int:
+        bitboards = self.bitboards
+        if by_white:
+            base = WHITE_PAWN
+            pawn_origins = PAWN_ATTACKS[BLACK][square]
+        else:
+            base = BLACK_PAWN
+            pawn_origins = PAWN_ATTACKS[WHITE][square]
+        queens = bitboards[base + 4]
+        return (
+            (pawn_origins & bitboards[base])
+            | (KNIGHT_ATTACKS[square] & bitboards[base + 1])
+            | (KING_ATTACKS[square] & bitboards[base + 5])
+            | (Rook_Attacks(square, occupied) & (bitboards[base + 3] | queens))
+            | (Bishop_Attacks(square, occupied) & (bitboards[base + 2] | queens))
+        )
 
-        rook = 'R' if by_white else 'r'
-        bishop = 'B' if by_white else 'b'
-        queen = 'Q' if by_white else 'q'
+    def _Is_Square_Index_Attacked(self, square: int, by_white: bool, occupied: int) -> bool:
+        bitboards = self.bitboards
+        if by_white:
+            base = WHITE_PAWN
+            pawn_origins = PAWN_ATTACKS[BLACK][square]
+        else:
+            base = BLACK_PAWN
+            pawn_origins = PAWN_ATTACKS[WHITE][square]
 
-        for dr, dc in _ORTHOGONAL_DIRECTIONS:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                piece = board[r][c]
-                if piece == '.':
-                    r += dr
-                    c += dc
-                    continue
-                if piece == rook or piece == queen:
-                    return True
-                break
+        if pawn_origins & bitboards[base]:
+            return True
+        if KNIGHT_ATTACKS[square] & bitboards[base + 1]:
+            return True
+        if KING_ATTACKS[square] & bitboards[base + 5]:
+            return True
 
-        for dr, dc in _DIAGONAL_DIRECTIONS:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                piece = board[r][c]
-                if piece == '.':
-                    r += dr
-                    c += dc
-                    continue
-                if piece == bishop or piece == queen:
+        queens = bitboards[base + 4]
+        sliders = (
+            (ROOK_EMPTY_ATTACKS[square] & (bitboards[base + 3] | queens))
+            | (BISHOP_EMPTY_ATTACKS[square] & (bitboards[base + 2] | queens))
+        )
+        if sliders:
+            between = BETWEEN[square]
+            while sliders:
+                slider = sliders & -sliders
+                if not between[slider.bit_length() - 1] & occupied:
                     return True
-                break
-
+                sliders ^= slider
         return False
 
+    def _Is_Square_Attacked(self, position: tuple, by_white: bool) -> bool:
+        row, col = position
+        return self._Is_Square_Index_Attacked(row * 8 + col, by_white, self.occupied)
+
     def _Analyze_King_Status(self, white: bool):
-        king_pos = self.Find_King(white)
-        if king_pos == (-1, -1):
-            return king_pos, (), {}, frozenset()
-
-        board = self.board
-        king_row, king_col = king_pos
-        friendly_pieces = _WHITE_PIECES if white else _BLACK_PIECES
-        enemy_pawn = 'p' if white else 'P'
-        enemy_knight = 'n' if white else 'N'
-        enemy_king = 'k' if white else 'K'
-        enemy_rook = 'r' if white else 'R'
-        enemy_bishop = 'b' if white else 'B'
-        enemy_queen = 'q' if white else 'Q'
-
-        checkers = []
-        evasion_squares = set()
+        bitboards = self.bitboards
+        king_bb = bitboards[WHITE_KING if white else BLACK_KING]
+        if not king_bb:
+            return -1, 0, {}, FULL_BOARD
+
+        king_sq = king_bb.bit_length() - 1
+        occupied = self.occupied
+        if white:
+            enemy_base = BLACK_PAWN
+            friendly = self.occupancy[WHITE]
+            pawn_origins = PAWN_ATTACKS[WHITE][king_sq]
+        else:
+            enemy_base = WHITE_PAWN
+            friendly = self.occupancy[BLACK]
+            pawn_origins = PAWN_ATTACKS[BLACK][king_sq]
+
+        checkers = (
+            (pawn_origins & bitboards[enemy_base])
+            | (KNIGHT_ATTACKS[king_sq] & bitboards[enemy_base + 1])
+            | (KING_ATTACKS[king_sq] & bitboards[enemy_base + 5])
+        )
+        evasion_mask = checkers
         pinned = {}
 
-        pawn_origins = _BLACK_PAWN_ATTACK_ORIGINS if white else _WHITE_PAWN_ATTACK_ORIGINS
-        for attacker_row, attacker_col in pawn_origins[king_row][king_col]:
-            if board[attacker_row][attacker_col] == enemy_pawn:
-                checkers.append((attacker_row, attacker_col))
-                evasion_squares.add((attacker_row, attacker_col))
-
-        for attacker_row, attacker_col in _KNIGHT_ATTACK_ORIGINS[king_row][king_col]:
-            if board[attacker_row][attacker_col] == enemy_knight:
-                checkers.append((attacker_row, attacker_col))
-                evasion_squares.add((attacker_row, attacker_col))
-
-        for attacker_row, attacker_col in _KING_ATTACK_ORIGINS[king_row][king_col]:
-            if board[attacker_row][attacker_col] == enemy_king:
-                checkers.append((attacker_row, attacker_col))
-                evasion_squares.add((attacker_row, attacker_col))
-
-        for dr, dc in _ALL_DIRECTIONS:
-            ray_squares = []
-            pin_candidate = None
-            pin_ray = []
-            r, c = king_row + dr, king_col + dc
-
-            while 0 <= r < 8 and 0 <= c < 8:
-                piece = board[r][c]
-                if piece == '.':
-                    if pin_candidate is None:
-                        ray_squares.append((r, c))
-                    else:
-                        pin_ray.append((r, c))
-                    r += dr
-                    c += dc
-                    continue
+        enemy_queens = bitboards[enemy_base + 4]
+        snipers = (
+            (ROOK_EMPTY_ATTACKS[king_sq] & (bitboards[enemy_base + 3] | enemy_queens))
+            | (BISHOP_EMPTY_ATTACKS[king_sq] & (bitboards[enemy_base + 2] | enemy_queens))
+        )
+        between_king = BETWEEN[king_sq]
+        line_king = LINE[king_sq]
+        while snipers:
+            sniper = snipers & -snipers
+            snipers ^= sniper
+            sniper_sq = sniper.bit_length() - 1
+            blockers = between_king[sniper_sq] & occupied
+            if not blockers:
+                checkers |= sniper
+                evasion_mask |= between_king[sniper_sq] | sniper
+            elif not blockers & (blockers - 1) and blockers & friendly:
+                pinned_sq = blockers.bit_length() - 1
+                pinned[pinned_sq] = line_king[pinned_sq]
+
+        return king_sq, checkers, pinned, evasion_mask
+
+    def _Is_Noisy_Move(self, move: int) -> bool:
+        return move >> 14 == MOVE_PROMOTION or move >> 14 == MOVE_EN_PASSANT or self.mailbox[SQUARE_TO_MAILBOX[(move >> 6) & 63]] != EMPTY
+
+    def Is_Pseudo_Legal(self, move: int) -> bool:
+        """Whether a move code (from the TT, a killer slot, ...) fits this position, ignoring king safety."""
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        flag = move >> 14
+        code = self.mailbox[SQUARE_TO_MAILBOX[from_sq]]
+        if code == EMPTY:
+            return False
+        white = self.white_to_move
+        side = WHITE if white else BLACK
+        piece_index = code - 1
+        if PIECE_COLOR[piece_index] != side:
+            return False
+        to_bit = SQUARE_BITS[to_sq]
+        if self.occupancy[side] & to_bit:
+            return False
 
-                if piece in friendly_pieces:
-                    if pin_candidate is None:
-                        pin_candidate = (r, c)
-                    else:
-                        break
-                else:
-                    straight = dr == 0 or dc == 0
-                    valid_slider = (
-                        piece == enemy_queen
-                        or (straight and piece == enemy_rook)
-                        or ((not straight) and piece == enemy_bishop)
-                    )
-                    if pin_candidate is None:
-                        if valid_slider:
-                            checkers.append((r, c))
-                            evasion_squares.update(ray_squares)
-                            evasion_squares.add((r, c))
-                    elif valid_slider:
-                        pinned[pin_candidate] = frozenset(pin_ray + [(r, c)])
-                    break
-
-                r += dr
-                c += dc
-
-        return king_pos, tuple(checkers), pinned, frozenset(evasion_squares)
-
-    def _Is_Noisy_Move(self, move: Move) -> bool:
-        return bool(move.piece_captured or move.is_pawn_promotion)
-
-    def _Move_Evades_Check(self, move: Move, evasion_squares: frozenset[Tuple[int, int]]) -> bool:
-        if move.end in evasion_squares:
-            return True
-        if move.is_en_passant:
-            return (move.start[0], move.end[1]) in evasion_squares
-        return False
+        piece_type = PIECE_ORDER[piece_index].upper()
+        if flag == MOVE_CASTLING:
+            if piece_type != 'K':
+                return False
+            castling_moves = []
+            if white:
+                self._Get_White_Castling_Moves(castling_moves)
+            else:
+                self._Get_Black_Castling_Moves(castling_moves)
+            return move in castling_moves
 
-    def _Validate_Legal_Move(self, move: Move) -> bool:
+        if piece_type == 'P':
+            if flag == MOVE_EN_PASSANT:
+                ep_square = self.en_passant_square
+                return ep_square is not None and ep_square[0] * 8 + ep_square[1] == to_sq and bool(PAWN_ATTACKS[side][from_sq] & to_bit)
+            if (to_sq >> 3 == (0 if white else 7)) != (flag == MOVE_PROMOTION):
+                return False
+            if PAWN_ATTACKS[side][from_sq] & to_bit:
+                return bool(self.occupancy[side ^ 1] & to_bit)
+            step = -8 if white else 8
+            occupied = self.occupied
+            if to_sq == from_sq + step:
+                return not occupied & to_bit
+            if to_sq == from_sq + 2 * step and from_sq >> 3 == (6 if white else 1):
+                return not occupied & (to_bit | SQUARE_BITS[from_sq + step])
+            return False
+
+        if flag != MOVE_NORMAL:
+            return False
+        return bool(self._Piece_Attacks(piece_type, from_sq, self.occupied) & to_bit)
+
+    def _Validate_Legal_Move(self, move) -> bool:
         self.Make_Move(move)
         is_legal = not self.Is_King_In_Check(not self.white_to_move)
         self.Undo_Move()
         return is_legal
 
-    def _Is_Legal_King_Move(self, move: Move, enemy_is_white: bool) -> bool:
-        if move.is_castling:
-            return True
-
-        board = self.board
-        from_row, from_col = move.start
-        to_row, to_col = move.end
-        moved_piece = board[from_row][from_col]
-        captured_piece = board[to_row][to_col]
-
-        board[from_row][from_col] = '.'
-        board[to_row][to_col] = moved_piece
-        is_legal = not self._Is_Square_Attacked((to_row, to_col), enemy_is_white)
-        board[to_row][to_col] = captured_piece
-        board[from_row][from_col] = moved_piece
-        return is_legal
-
-    def _Generate_Legal_Moves_Core(self, include_castling: bool, noisy_only: bool) -> list:
+    def _Generate_Legal_Moves_Core(self, include_castling: bool, stage: int, legal_moves):
         side_to_move_is_white = self.white_to_move
-        _, checkers, pinned, evasion_squares = self._Analyze_King_Status(side_to_move_is_white)
-        checker_count = len(checkers)
+        king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+        if king_sq < 0:
+            for move in self.Get_Pseudo_Legal_Move_Codes(include_castling):
+                if stage == GENERATE_ALL or self._Is_Noisy_Move(move) == (stage == GENERATE_NOISY):
+                    legal_moves.append(move)
+            return legal_moves
+        if checkers and stage == GENERATE_ALL:
+            return self._Add_Evasion_Moves(king_sq, checkers, pinned, evasion_mask, legal_moves)
+
+        mailbox = self.mailbox
+        friendly = self.occupancy[WHITE if side_to_move_is_white else BLACK]
+        enemy = self.occupancy[BLACK if side_to_move_is_white else WHITE]
+        occupied = self.occupied
         enemy_is_white = not side_to_move_is_white
-        legal_moves = []
-        append_move = legal_moves.append
-
-        for row in range(8):
-            board_row = self.board[row]
-            for col in range(8):
-                piece = board_row[col]
-                if piece == '.' or piece.isupper() != side_to_move_is_white:
-                    continue
 
-                piece_type = piece.upper()
-                if checker_count >= 2 and piece_type != 'K':
-                    continue
+        # King moves are tested with the king lifted off the board so sliders see through it.
+        king_targets = KING_ATTACKS[king_sq] & ~friendly
+        if stage == GENERATE_NOISY:
+            king_targets &= enemy
+        elif stage == GENERATE_QUIET:
+            king_targets &= ~enemy
+        lifted = occupied ^ SQUARE_BITS[king_sq]
+        safe_targets = 0
+        while king_targets:
+            bit = king_targets & -king_targets
+            king_targets ^= bit
+            if not self._Is_Square_Index_Attacked(bit.bit_length() - 1, enemy_is_white, lifted):
+                safe_targets |= bit
+        self._Add_Target_Moves(king_sq, safe_targets, legal_moves)
+        if include_castling and stage != GENERATE_NOISY and not checkers:
+            if side_to_move_is_white:
+                self._Get_White_Castling_Moves(legal_moves)
+            else:
+                self._Get_Black_Castling_Moves(legal_moves)
+
+        if checkers & (checkers - 1):
+            return legal_moves
+
+        allowed = evasion_mask if checkers else FULL_BOARD
+        piece_targets = allowed & ~friendly
+        if stage == GENERATE_NOISY:
+            piece_targets &= enemy
+        elif stage == GENERATE_QUIET:
+            piece_targets &= ~enemy
+
+        line_king = LINE[king_sq]
+        remaining = friendly ^ SQUARE_BITS[king_sq]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            square = bit.bit_length() - 1
+            piece = CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[square]]]
+
+            if piece == 'P' or piece == 'p':
+                pawn_allowed = allowed & line_king[square] if pinned & bit else allowed
+                self._Add_Pawn_Moves(square, side_to_move_is_white, legal_moves, pawn_allowed, stage, True)
+                continue
+
+            targets = self._Piece_Attacks(piece.upper(), square, occupied) & piece_targets
+            if pinned & bit:
+                targets &= line_king[square]
+            if targets:
+                self._Add_Target_Moves(square, targets, legal_moves)
 
-                piece_moves = []
-                self._Generate_Piece_Moves(piece, row, col, piece_moves, include_castling)
-                pin_mask = pinned.get((row, col))
+        return legal_moves
 
-                for move in piece_moves:
-                    if noisy_only and not self._Is_Noisy_Move(move):
-                        continue
+    def _Add_Evasion_Moves(self, king_sq: int, checkers: int, pinned: int, evasion_mask: int, moves):
+        # Only three kinds of move can leave check: a king step to a safe square, a
+        # capture of the checker, or an interposition on a square between it and the
+        # king. Candidates are looked up from those target squares, never from the pieces.
+        append = moves.append
+        white = self.white_to_move
+        bitboards = self.bitboards
+        occupied = self.occupied
+        base = WHITE_PAWN if white else BLACK_PAWN
+        friendly = self.occupancy[WHITE if white else BLACK]
+
+        targets = KING_ATTACKS[king_sq] & ~friendly
+        lifted = occupied ^ SQUARE_BITS[king_sq]
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            if not self._Is_Square_Index_Attacked(bit.bit_length() - 1, not white, lifted):
+                append(king_sq | ((bit.bit_length() - 1) << 6))
+        if not evasion_mask:
+            return moves
+
+        # A pinned piece can never resolve a check from another line.
+        movers = friendly & ~pinned & ~bitboards[base + 5]
+        pawns = bitboards[base] & movers
+        promotion_row = ROW_MASKS[0] if white else ROW_MASKS[7]
+        checker_sq = checkers.bit_length() - 1
+        promotion = PROMOTION_QUEEN_MOVE if checkers & promotion_row else 0
+        origins = self._Attackers_To(checker_sq, white, occupied) & movers
+        while origins:
+            bit = origins & -origins
+            origins ^= bit
+            from_sq = bit.bit_length() - 1
+            append((promotion if bit & pawns else 0) | from_sq | (checker_sq << 6))
+
+        blocks = evasion_mask ^ checkers
+        step = 8 if white else -8
+        double_row = ROW_MASKS[4] if white else ROW_MASKS[3]
+        while blocks:
+            bit = blocks & -blocks
+            blocks ^= bit
+            block_sq = bit.bit_length() - 1
+            origins = self._Attackers_To(block_sq, white, occupied) & movers & ~pawns
+            while origins:
+                origin = origins & -origins
+                origins ^= origin
+                append((origin.bit_length() - 1) | (block_sq << 6))
+            from_sq = block_sq + step
+            if 0 <= from_sq < 64:
+                if pawns & SQUARE_BITS[from_sq]:
+                    append((PROMOTION_QUEEN_MOVE if bit & promotion_row else 0) | from_sq | (block_sq << 6))
+                elif bit & double_row and not occupied & SQUARE_BITS[from_sq] and pawns & SQUARE_BITS[from_sq + step]:
+                    append((from_sq + step) | (block_sq << 6))
 
-                    if piece_type == 'K':
-                        if self._Is_Legal_King_Move(move, enemy_is_white):
-                            append_move(move)
-                        continue
+        if self.en_passant_square:
+            ep_row, ep_col = self.en_passant_square
+            ep_sq = ep_row * 8 + ep_col
+            origins = PAWN_ATTACKS[BLACK if white else WHITE][ep_sq] & pawns
+            while origins:
+                bit = origins & -origins
+                origins ^= bit
+                move = Encode_Move(bit.bit_length() - 1, ep_sq, MOVE_EN_PASSANT)
+                if self._Validate_Legal_Move(move):
+                    append(move)
+        return moves
 
-                    if pin_mask is not None and move.end not in pin_mask:
-                        continue
+    def Has_Legal_Move(self) -> bool:
+        """True as soon as one legal move is found; nothing is generated or made."""
+        king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+        if king_sq < 0:
+            return bool(self.Get_Pseudo_Legal_Move_Codes())
+        if checkers:
+            moves = self.scratch_moves
+            del moves[:]
+            return bool(self._Add_Evasion_Moves(king_sq, checkers, pinned, evasion_mask, moves))
+
+        white = self.white_to_move
+        side = WHITE if white else BLACK
+        mailbox = self.mailbox
+        occupied = self.occupied
+        friendly = self.occupancy[side]
+        enemy = self.occupancy[side ^ 1]
+        step = -8 if white else 8
+        line_king = LINE[king_sq]
+
+        # Out of check, any target of a non-king piece is legal unless it leaves a pin line.
+        remaining = friendly ^ SQUARE_BITS[king_sq]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            square = bit.bit_length() - 1
+            piece_type = CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[square]]].upper()
+            if piece_type == 'P':
+                targets = PAWN_ATTACKS[side][square] & enemy
+                if 0 <= square + step < 64:
+                    targets |= SQUARE_BITS[square + step] & ~occupied
+            else:
+                targets = self._Piece_Attacks(piece_type, square, occupied) & ~friendly
+            if pinned & bit:
+                targets &= line_king[square]
+            if targets:
+                return True
 
-                    if checker_count == 1 and not self._Move_Evades_Check(move, evasion_squares):
-                        continue
+        # Castling needs a safe, empty square next to the king, so a king step covers it.
+        targets = KING_ATTACKS[king_sq] & ~friendly
+        lifted = occupied ^ SQUARE_BITS[king_sq]
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            if not self._Is_Square_Index_Attacked(bit.bit_length() - 1, not white, lifted):
+                return True
 
-                    if move.is_en_passant and not self._Validate_Legal_Move(move):
-                        continue
+        if self.en_passant_square:
+            ep_row, ep_col = self.en_passant_square
+            ep_sq = ep_row * 8 + ep_col
+            origins = PAWN_ATTACKS[side ^ 1][ep_sq] & self.bitboards[WHITE_PAWN if white else BLACK_PAWN]
+            while origins:
+                bit = origins & -origins
+                origins ^= bit
+                if self._Validate_Legal_Move(Encode_Move(bit.bit_length() - 1, ep_sq, MOVE_EN_PASSANT)):
+                    return True
+        return False
 
-                    append_move(move)
+    def Count_Legal_Moves(self) -> int:
+        moves = self.scratch_moves
+        del moves[:]
+        return len(self._Generate_Legal_Moves_Core(True, GENERATE_ALL, moves))
+
+    def Is_Legal(self, move) -> bool:
+        """Whether a move code (or Move) is one Generate_Legal_Move_Codes would return."""
+        code = move if move.__class__ is int else move.code
+        flag = code >> 14
+        # Only queen promotions are generated, and other moves carry no promotion bits.
+        if (code >> 12) & 3 != (PROMOTION_QUEEN if flag == MOVE_PROMOTION else 0):
+            return False
+        if not self.Is_Pseudo_Legal(code):
+            return False
+        king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+        if king_sq < 0:
+            return True
+        from_sq = code & 63
+        to_sq = (code >> 6) & 63
+        if from_sq == king_sq:
+            if flag == MOVE_CASTLING:
+                return True
+            return not self._Is_Square_Index_Attacked(to_sq, not self.white_to_move, self.occupied ^ SQUARE_BITS[king_sq])
+        if flag == MOVE_EN_PASSANT:
+            return self._Validate_Legal_Move(code)
+        to_bit = SQUARE_BITS[to_sq]
+        if checkers and not evasion_mask & to_bit:
+            return False
+        return not pinned & SQUARE_BITS[from_sq] or bool(LINE[king_sq][from_sq] & to_bit)
 
-        return legal_moves
+    def Generate_Evasion_Codes(self, moves=None):
+        """Legal replies to a check; falls back to full legal generation when not in check."""
+        if moves is None:
+            moves = array('H')
+        else:
+            del moves[:]
+        king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+        if king_sq < 0 or not checkers:
+            return self._Generate_Legal_Moves_Core(True, GENERATE_ALL, moves)
+        return self._Add_Evasion_Moves(king_sq, checkers, pinned, evasion_mask, moves)
 
     def _Filter_Legal_Moves(self, pseudo_moves: list) -> list:
         legal_moves = []
@@ -549,259 +956,587 @@ class Board:
         return legal_moves
 
     def Generate_Legal_Moves(self, include_castling=True) -> list:
+        return [self.Move_From_Code(code) for code in self.Generate_Legal_Move_Codes(include_castling=include_castling)]
+
+    def Generate_Legal_Capture_Moves(self) -> list:
+        return [self.Move_From_Code(code) for code in self.Generate_Legal_Capture_Codes()]
+
+    def Cached_Legal_Move_Codes(self) -> tuple:
+        return LEGAL_MOVE_CACHE.Get(self)
+
+    def Cached_Legal_Moves(self) -> list:
+        return [self.Move_From_Code(code) for code in LEGAL_MOVE_CACHE.Get(self)]
+
+    def Generate_Legal_Move_Codes(self, moves=None, include_castling=True):
         import time
         t0 = time.perf_counter()
-        legal_moves = self._Generate_Legal_Moves_Core(include_castling=include_castling, noisy_only=False)
+        if moves is None:
+            moves = array('H')
+        else:
+            del moves[:]
+        self._Generate_Legal_Moves_Core(include_castling, GENERATE_ALL, moves)
         Board.FIND_LEGAL_MOVES_TIME += time.perf_counter() - t0
-        return legal_moves
+        return moves
 
-    def Generate_Legal_Capture_Moves(self) -> list:
+    def Generate_Legal_Capture_Codes(self, moves=None):
         import time
         t0 = time.perf_counter()
-        legal_moves = self._Generate_Legal_Moves_Core(include_castling=False, noisy_only=True)
+        moves = self.Generate_Capture_Codes(moves, legal=True)
         Board.FIND_LEGAL_MOVES_TIME += time.perf_counter() - t0
-        return legal_moves
+        return moves
+
+    def Generate_Legal_Quiet_Codes(self, moves=None, include_castling=True):
+        import time
+        t0 = time.perf_counter()
+        if moves is None:
+            moves = array('H')
+        else:
+            del moves[:]
+        self._Generate_Legal_Moves_Core(include_castling, GENERATE_QUIET, moves)
+        Board.FIND_LEGAL_MOVES_TIME += time.perf_counter() - t0
+        return moves
+
+    def Generate_Pseudo_Legal_Codes(self, moves=None, stage=GENERATE_ALL, include_castling=True):
+        # Search-side generator: legality is deferred to Make_Move_If_Legal, so only
+        # the moves that actually get played pay for the king-safety test.
+        if stage == GENERATE_NOISY:
+            return self.Generate_Capture_Codes(moves)
+        if moves is None:
+            moves = array('H')
+        else:
+            del moves[:]
+        white = self.white_to_move
+        mailbox = self.mailbox
+        occupied = self.occupied
+        friendly = self.occupancy[WHITE if white else BLACK]
+        piece_targets = ~friendly
+        if stage == GENERATE_QUIET:
+            piece_targets &= ~occupied
+
+        remaining = friendly
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            square = bit.bit_length() - 1
+            piece_type = CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[square]]].upper()
+            if piece_type == 'P':
+                self._Add_Pawn_Moves(square, white, moves, FULL_BOARD, stage, False)
+                continue
+            targets = self._Piece_Attacks(piece_type, square, occupied) & piece_targets
+            if targets:
+                self._Add_Target_Moves(square, targets, moves)
+            if piece_type == 'K' and include_castling:
+                if white:
+                    self._Get_White_Castling_Moves(moves)
+                else:
+                    self._Get_Black_Castling_Moves(moves)
+        return moves
+
+    def Generate_Capture_Codes(self, moves=None, legal: bool = False):
+        """Captures, queen promotions and en passant only, without touching quiet targets.
+
+        With legal=False the moves are pseudo-legal, as Generate_Pseudo_Legal_Codes
+        returns them; with legal=True pins, checks and king safety are applied.
+        """
+        if moves is None:
+            moves = array('H')
+        else:
+            del moves[:]
+        append = moves.append
+        white = self.white_to_move
+        bitboards = self.bitboards
+        occupied = self.occupied
+        base = WHITE_PAWN if white else BLACK_PAWN
+        enemy = self.occupancy[BLACK if white else WHITE]
+
+        king_bb = bitboards[base + 5]
+        king_sq = king_bb.bit_length() - 1
+        pinned = 0
+        allowed = FULL_BOARD
+        if legal and king_bb:
+            king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+            targets = KING_ATTACKS[king_sq] & enemy
+            lifted = occupied ^ king_bb
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                if not self._Is_Square_Index_Attacked(bit.bit_length() - 1, not white, lifted):
+                    append(king_sq | ((bit.bit_length() - 1) << 6))
+            if checkers:
+                if not evasion_mask:
+                    return moves
+                allowed = evasion_mask
+        elif king_bb:
+            self._Add_Target_Moves(king_sq, KING_ATTACKS[king_sq] & enemy, moves)
+        capture_targets = enemy & allowed
+        line_king = LINE[king_sq] if pinned else None
+
+        # Pawns are handled set-wise: one shift per capture direction plus the
+        # promotion push, then one loop over the landing squares.
+        pawns = bitboards[base]
+        if white:
+            shifts = (
+                (((pawns & ~FILE_A) >> 9) & capture_targets, 9),
+                (((pawns & ~FILE_H) >> 7) & capture_targets, 7),
+                (((pawns & ROW_MASKS[1]) >> 8) & ~occupied & allowed, 8),
+            )
+            promotion_row = ROW_MASKS[0]
+        else:
+            shifts = (
+                (((pawns & ~FILE_A) << 7) & capture_targets, -7),
+                (((pawns & ~FILE_H) << 9) & capture_targets, -9),
+                (((pawns & ROW_MASKS[6]) << 8) & ~occupied & allowed, -8),
+            )
+            promotion_row = ROW_MASKS[7]
+        for landing, offset in shifts:
+            while landing:
+                bit = landing & -landing
+                landing ^= bit
+                to_sq = bit.bit_length() - 1
+                from_sq = to_sq + offset
+                if pinned & SQUARE_BITS[from_sq] and not line_king[from_sq] & bit:
+                    continue
+                append((PROMOTION_QUEEN_MOVE if bit & promotion_row else 0) | from_sq | (to_sq << 6))
+
+        knights = bitboards[base + 1] & ~pinned
+        while knights:
+            bit = knights & -knights
+            knights ^= bit
+            square = bit.bit_length() - 1
+            targets = KNIGHT_ATTACKS[square] & capture_targets
+            if targets:
+                self._Add_Target_Moves(square, targets, moves)
+
+        # Sliders only look at the first blocker on each ray.
+        for offset, (ascending, descending) in ((2, BISHOP_RAYS), (3, ROOK_RAYS), (4, QUEEN_RAYS)):
+            sliders = bitboards[base + offset]
+            while sliders:
+                bit = sliders & -sliders
+                sliders ^= bit
+                square = bit.bit_length() - 1
+                targets = capture_targets
+                if pinned & bit:
+                    targets &= line_king[square]
+                for rays in ascending:
+                    blockers = rays[square] & occupied
+                    if blockers & -blockers & targets:
+                        append(square | (((blockers & -blockers).bit_length() - 1) << 6))
+                for rays in descending:
+                    blockers = rays[square] & occupied
+                    if blockers and SQUARE_BITS[blockers.bit_length() - 1] & targets:
+                        append(square | ((blockers.bit_length() - 1) << 6))
+
+        if self.en_passant_square:
+            ep_row, ep_col = self.en_passant_square
+            ep_sq = ep_row * 8 + ep_col
+            origins = PAWN_ATTACKS[BLACK if white else WHITE][ep_sq] & pawns
+            while origins:
+                bit = origins & -origins
+                origins ^= bit
+                move = Encode_Move(bit.bit_length() - 1, ep_sq, MOVE_EN_PASSANT)
+                if not legal or king_sq < 0 or self._Validate_Legal_Move(move):
+                    append(move)
+        return moves
+
+    def _Pin_Info(self):
+        key = self.zobrist_key
+        if self._pin_info_key == key:
+            return self._pin_info
+
+        king_sq, checkers, pinned, evasion_mask = self._Analyze_King_Status(self.white_to_move)
+        pinned_bb = 0
+        for square in pinned:
+            pinned_bb |= SQUARE_BITS[square]
+        if checkers & (checkers - 1):
+            evasion_mask = 0
+        info = (king_sq, checkers, pinned_bb, evasion_mask)
+        self._pin_info_key = key
+        self._pin_info = info
+        return info
+
+    def Make_Move_If_Legal(self, move) -> bool:
+        """Make a pseudo-legal move, or leave the board untouched and return False if it is illegal."""
+        code = move if move.__class__ is int else move.code
+        king_sq, checkers, pinned, evasion_mask = self._Pin_Info()
+        from_sq = code & 63
+        flag = code >> 14
+        needs_test = False
+        if king_sq >= 0:
+            # Only king moves and en passant need the post-move attack test; every
+            # other move is decided here from the pin and check masks.
+            if from_sq == king_sq:
+                # Castling generation already rejects attacked transit squares.
+                needs_test = flag != MOVE_CASTLING
+            elif flag == MOVE_EN_PASSANT:
+                needs_test = True
+            else:
+                to_bit = SQUARE_BITS[(code >> 6) & 63]
+                if checkers and not evasion_mask & to_bit:
+                    return False
+                if pinned & SQUARE_BITS[from_sq] and not LINE[king_sq][from_sq] & to_bit:
+                    return False
+
+        self.Make_Move(code)
+        if needs_test and self.Is_King_In_Check(not self.white_to_move):
+            self.Undo_Move()
+            return False
+        return True
 
     def _Generate_Pseudo_Legal_Capture_Moves(self) -> list:
         pseudo_noisy_moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece == '.' or piece.isupper() != self.white_to_move:
-                    continue
-                piece_moves = []
-                self._Generate_Piece_Moves(piece, row, col, piece_moves, include_castling=False)
-                for move in piece_moves:
-                    if move.piece_captured or move.is_pawn_promotion:
-                        pseudo_noisy_moves.append(move)
+        for move in self.Get_Pseudo_Legal_Moves(include_castling=False):
+            if move.piece_captured or move.is_pawn_promotion:
+                pseudo_noisy_moves.append(move)
         return pseudo_noisy_moves
 
+    def _Check_Info(self):
+        # Per-node data for Move_Gives_Check: the enemy king square, the squares from
+        # which each of our piece types would give check, and our pieces whose move
+        # can uncover a slider check. Cached until the position changes.
+        key = self.zobrist_key
+        if self._check_info_key == key:
+            return self._check_info
+
+        white = self.white_to_move
+        bitboards = self.bitboards
+        king_bb = bitboards[BLACK_KING if white else WHITE_KING]
+        if not king_bb:
+            info = (-1, (), 0)
+        else:
+            king_sq = king_bb.bit_length() - 1
+            occupied = self.occupied
+            base = WHITE_PAWN if white else BLACK_PAWN
+            rook_checks = Rook_Attacks(king_sq, occupied)
+            bishop_checks = Bishop_Attacks(king_sq, occupied)
+            checks = (
+                PAWN_ATTACKS[BLACK if white else WHITE][king_sq],
+                KNIGHT_ATTACKS[king_sq],
+                bishop_checks,
+                rook_checks,
+                rook_checks | bishop_checks,
+                0,
+            )
+
+            discoverers = 0
+            friendly = self.occupancy[WHITE if white else BLACK]
+            queens = bitboards[base + 4]
+            snipers = (
+                (ROOK_EMPTY_ATTACKS[king_sq] & (bitboards[base + 3] | queens))
+                | (BISHOP_EMPTY_ATTACKS[king_sq] & (bitboards[base + 2] | queens))
+            )
+            between_king = BETWEEN[king_sq]
+            while snipers:
+                sniper = snipers & -snipers
+                snipers ^= sniper
+                blockers = between_king[sniper.bit_length() - 1] & occupied
+                if blockers and not blockers & (blockers - 1) and blockers & friendly:
+                    discoverers |= blockers
+            info = (king_sq, checks, discoverers)
+
+        self._check_info_key = key
+        self._check_info = info
+        return info
+
+    def Move_Gives_Check(self, move) -> bool:
+        code = move if move.__class__ is int else move.code
+        king_sq, checks, discoverers = self._Check_Info()
+        if king_sq < 0:
+            return False
+
+        from_sq = code & 63
+        to_sq = (code >> 6) & 63
+        flag = code >> 14
+        from_bit = SQUARE_BITS[from_sq]
+        to_bit = SQUARE_BITS[to_sq]
+        piece_index = self.mailbox[SQUARE_TO_MAILBOX[from_sq]] - 1
+
+        if flag == MOVE_PROMOTION:
+            # The vacated from-square can lie on the new piece's line to the king.
+            piece_type = PROMOTION_PIECES[(code >> 12) & 3]
+            if self._Piece_Attacks(piece_type, to_sq, (self.occupied ^ from_bit) | to_bit) & SQUARE_BITS[king_sq]:
+                return True
+        elif checks[piece_index % 6] & to_bit:
+            return True
+
+        if discoverers & from_bit and not LINE[king_sq][from_sq] & to_bit:
+            return True
+
+        if flag == MOVE_EN_PASSANT:
+            white = self.white_to_move
+            capture_bit = SQUARE_BITS[to_sq + (8 if white else -8)]
+            occupied = (self.occupied ^ from_bit ^ capture_bit) | to_bit
+            base = WHITE_PAWN if white else BLACK_PAWN
+            queens = self.bitboards[base + 4]
+            return bool(
+                (Rook_Attacks(king_sq, occupied) & (self.bitboards[base + 3] | queens))
+                | (Bishop_Attacks(king_sq, occupied) & (self.bitboards[base + 2] | queens))
+            )
+
+        if flag == MOVE_CASTLING:
+            if to_sq > from_sq:
+                rook_from, rook_to = from_sq + 3, from_sq + 1
+            else:
+                rook_from, rook_to = from_sq - 4, from_sq - 1
+            occupied = (self.occupied ^ from_bit ^ SQUARE_BITS[rook_from]) | to_bit | SQUARE_BITS[rook_to]
+            return bool(Rook_Attacks(rook_to, occupied) & SQUARE_BITS[king_sq])
+
+        return False
+
     def Is_King_In_Check(self, white: Optional[bool] = None) -> bool:
         king_is_white = self.white_to_move if white is None else white
-        king_pos = self.white_king_pos if king_is_white else self.black_king_pos
-        if king_pos == (-1, -1):
+        king_bb = self.bitboards[WHITE_KING if king_is_white else BLACK_KING]
+        if not king_bb:
             return False
-        return self._Is_Square_Attacked(king_pos, not king_is_white)
+        return self._Is_Square_Index_Attacked(king_bb.bit_length() - 1, not king_is_white, self.occupied)
 
     def Find_King (self, white: bool) -> Tuple[int, int]:
         return self.white_king_pos if white else self.black_king_pos
         
-    def Make_Move(self, move: Move):
-        board = self.board
-        from_row, from_col = move.start
-        to_row, to_col = move.end
-        moved_piece = board[from_row][from_col]
-        captured_piece = board[to_row][to_col]
-        state = MoveState(
-            move=move,
-            captured_piece=captured_piece,
-            castling_rights=frozenset(self.castling_rights),
-            en_passant_square=self.en_passant_square,
-            halfmove_clock=self.halfmove_clock,
-            fullmove_number=self.fullmove_number,
-            white_to_move=self.white_to_move,
-            moved_piece=moved_piece,
-            zobrist_key=self.zobrist_key,
-            white_king_pos=self.white_king_pos,
-            black_king_pos=self.black_king_pos,
-        )
-
-        # Remove old turn
-        if self.white_to_move:
-            self.zobrist_key ^= ZOBRIST_TURN
-
-        # Remove old en_passant
+    def _Set_Square(self, square: int, piece: str):
+        row, col = SQUARE_COORDS[square]
+        self.board[row][col] = piece
+        self.mailbox[SQUARE_TO_MAILBOX[square]] = PIECE_CODES[piece] if piece != '.' else EMPTY
+
+    def _Push_State(self) -> MoveState:
+        ply = self.history_ply
+        stack = self.state_stack
+        if ply == len(stack):
+            stack.append(MoveState())
+        state = stack[ply]
+        self.history_ply = ply + 1
+        state.castling_rights = self.castling_rights
+        state.en_passant_square = self.en_passant_square
+        state.halfmove_clock = self.halfmove_clock
+        state.fullmove_number = self.fullmove_number
+        state.white_to_move = self.white_to_move
+        state.zobrist_key = self.zobrist_key
+        state.pawn_key = self.pawn_key
+        state.material_key = self.material_key
+        state.white_king_pos = self.white_king_pos
+        state.black_king_pos = self.black_king_pos
+        return state
+
+    def Make_Move(self, move):
+        code = move if move.__class__ is int else move.code
+        mailbox = self.mailbox
+        bitboards = self.bitboards
+        occupancy = self.occupancy
+        from_sq = code & 63
+        to_sq = (code >> 6) & 63
+        flag = code >> 14
+        white = self.white_to_move
+        moved_index = mailbox[SQUARE_TO_MAILBOX[from_sq]] - 1
+        captured_code = mailbox[SQUARE_TO_MAILBOX[to_sq]]
+        moved_piece = PIECE_ORDER[moved_index]
+        captured_piece = CODE_PIECES[captured_code]
+        from_bit = SQUARE_BITS[from_sq]
+        to_bit = SQUARE_BITS[to_sq]
+        is_pawn = moved_index == WHITE_PAWN or moved_index == BLACK_PAWN
+
+        state = self._Push_State()
+        state.move = code
+        state.captured_piece = captured_piece
+        state.moved_piece = moved_piece
+        state.rook_from = -1
+        state.ep_capture_square = -1
+
+        # Turn and the old en passant file always change
+        key = self.zobrist_key ^ ZOBRIST_TURN
+        pawn_key = self.pawn_key
+        material_key = self.material_key
         if self.en_passant_square:
-            self.zobrist_key ^= ZOBRIST_EN_PASSANT[self.en_passant_square[1]]
-
-        # Remove old castling
-        for cr in self.castling_rights:
-            self.zobrist_key ^= ZOBRIST_CASTLING[cr]
-        
-        # Remove old location of moved_piece
-        self.zobrist_key ^= ZOBRIST_PIECES[(moved_piece, from_row, from_col)]
-
-        if captured_piece != '.':
-            self.zobrist_key ^= ZOBRIST_PIECES[(captured_piece, to_row, to_col)]
-
-        if move.is_en_passant:
-            capture_row = to_row + (1 if self.white_to_move else -1)
-            ep_captured_piece = board[capture_row][to_col]
-            state.ep_capture = (capture_row, to_col, ep_captured_piece)
-            self.zobrist_key ^= ZOBRIST_PIECES[(ep_captured_piece, capture_row, to_col)]
-            board[capture_row][to_col] = '.'
-
-        if move.is_castling:
-            if to_col - from_col == 2:
-                rook_from = (from_row, 7)
-                rook_to = (from_row, 5)
+            key ^= ZOBRIST_EN_PASSANT[self.en_passant_square[1]]
+
+        piece_key = ZOBRIST_PIECES[moved_index * 64 + from_sq]
+        key ^= piece_key
+        if is_pawn:
+            pawn_key ^= piece_key
+
+        if captured_code != EMPTY:
+            captured_index = captured_code - 1
+            piece_key = ZOBRIST_PIECES[captured_index * 64 + to_sq]
+            key ^= piece_key
+            if captured_index == WHITE_PAWN or captured_index == BLACK_PAWN:
+                pawn_key ^= piece_key
+            bitboards[captured_index] ^= to_bit
+            occupancy[PIECE_COLOR[captured_index]] ^= to_bit
+            material_key ^= ZOBRIST_MATERIAL[captured_index * 16 + bitboards[captured_index].bit_count()]
+
+        if flag == MOVE_EN_PASSANT:
+            capture_sq = to_sq + (8 if white else -8)
+            ep_index = BLACK_PAWN if white else WHITE_PAWN
+            state.ep_capture_square = capture_sq
+            piece_key = ZOBRIST_PIECES[ep_index * 64 + capture_sq]
+            key ^= piece_key
+            pawn_key ^= piece_key
+            self._Set_Square(capture_sq, '.')
+            ep_bit = SQUARE_BITS[capture_sq]
+            bitboards[ep_index] ^= ep_bit
+            occupancy[PIECE_COLOR[ep_index]] ^= ep_bit
+            material_key ^= ZOBRIST_MATERIAL[ep_index * 16 + bitboards[ep_index].bit_count()]
+
+        elif flag == MOVE_CASTLING:
+            if to_sq - from_sq == 2:
+                rook_from = from_sq + 3
+                rook_to = from_sq + 1
             else:
-                rook_from = (from_row, 0)
-                rook_to = (from_row, 3)
+                rook_from = from_sq - 4
+                rook_to = from_sq - 1
             state.rook_from = rook_from
             state.rook_to = rook_to
-            rook_piece = board[rook_from[0]][rook_from[1]]
-            self.zobrist_key ^= ZOBRIST_PIECES[(rook_piece, rook_from[0], rook_from[1])]
-            self.zobrist_key ^= ZOBRIST_PIECES[(rook_piece, rook_to[0], rook_to[1])]
-            board[rook_to[0]][rook_to[1]] = rook_piece
-            board[rook_from[0]][rook_from[1]] = '.'
+            rook_index = moved_index - 2
+            key ^= ZOBRIST_PIECES[rook_index * 64 + rook_from] ^ ZOBRIST_PIECES[rook_index * 64 + rook_to]
+            self._Set_Square(rook_to, PIECE_ORDER[rook_index])
+            self._Set_Square(rook_from, '.')
+            rook_bits = SQUARE_BITS[rook_from] | SQUARE_BITS[rook_to]
+            bitboards[rook_index] ^= rook_bits
+            occupancy[PIECE_COLOR[rook_index]] ^= rook_bits
 
-        self.move_history.append(state)
         self.en_passant_square = None
-
-        if move.piece_moved.upper() == "P" and abs(from_row - to_row) == 2:
-            mid_row = (from_row + to_row) // 2
-            self.en_passant_square = (mid_row, from_col)
-            self.zobrist_key ^= ZOBRIST_EN_PASSANT[from_col]
-
-        if move.is_pawn_promotion:
-            promotion_choice = (move.promotion_choice or 'Q').upper()
-            promoted_piece = promotion_choice if moved_piece.isupper() else promotion_choice.lower()
-            board[to_row][to_col] = promoted_piece
-            self.zobrist_key ^= ZOBRIST_PIECES[(promoted_piece, to_row, to_col)]
+        if is_pawn and abs(from_sq - to_sq) == 16:
+            self.en_passant_square = SQUARE_COORDS[(from_sq + to_sq) >> 1]
+            key ^= ZOBRIST_EN_PASSANT[to_sq & 7]
+
+        if flag == MOVE_PROMOTION:
+            placed_index = PIECE_INDEX[PROMOTION_PIECES[(code >> 12) & 3]] + (0 if white else 6)
+            material_key ^= ZOBRIST_MATERIAL[moved_index * 16 + bitboards[moved_index].bit_count() - 1]
+            material_key ^= ZOBRIST_MATERIAL[placed_index * 16 + bitboards[placed_index].bit_count()]
         else:
-            board[to_row][to_col] = moved_piece
-            self.zobrist_key ^= ZOBRIST_PIECES[(moved_piece, to_row, to_col)]
-            if moved_piece == 'K':
-                self.white_king_pos = (to_row, to_col)
-            elif moved_piece == 'k':
-                self.black_king_pos = (to_row, to_col)
-
-        board[from_row][from_col] = '.'
-
-        # Update castling rights when rooks or king move
-        if moved_piece == 'K':
-            self.castling_rights.discard('K')
-            self.castling_rights.discard('Q')
-        elif moved_piece == 'k':
-            self.castling_rights.discard('k')
-            self.castling_rights.discard('q')
-        elif moved_piece == 'R' and move.start == (7, 0):
-            self.castling_rights.discard('Q')
-        elif moved_piece == 'R' and move.start == (7, 7):
-            self.castling_rights.discard('K')
-        elif moved_piece == 'r' and move.start == (0, 0):
-            self.castling_rights.discard('q')
-        elif moved_piece == 'r' and move.start == (0, 7):
-            self.castling_rights.discard('k')
-
-        if captured_piece == 'R' and move.end == (7, 0):
-            self.castling_rights.discard('Q')
-        elif captured_piece == 'R' and move.end == (7, 7):
-            self.castling_rights.discard('K')
-        elif captured_piece == 'r' and move.end == (0, 0):
-            self.castling_rights.discard('q')
-        elif captured_piece == 'r' and move.end == (0, 7):
-            self.castling_rights.discard('k')
-
-        # Add new castling
-        for cr in self.castling_rights:
-            self.zobrist_key ^= ZOBRIST_CASTLING[cr]
-
-        self.white_to_move = not self.white_to_move
-        if self.white_to_move:
-            self.zobrist_key ^= ZOBRIST_TURN
-
-        if move.piece_captured or moved_piece.upper() == "P":
+            placed_index = moved_index
+            if moved_index == WHITE_KING:
+                self.white_king_pos = SQUARE_COORDS[to_sq]
+            elif moved_index == BLACK_KING:
+                self.black_king_pos = SQUARE_COORDS[to_sq]
+        piece_key = ZOBRIST_PIECES[placed_index * 64 + to_sq]
+        key ^= piece_key
+        if placed_index == moved_index and is_pawn:
+            pawn_key ^= piece_key
+        self._Set_Square(to_sq, PIECE_ORDER[placed_index])
+        self._Set_Square(from_sq, '.')
+
+        bitboards[moved_index] ^= from_bit
+        bitboards[placed_index] ^= to_bit
+        occupancy[PIECE_COLOR[moved_index]] ^= from_bit | to_bit
+        self.occupied = occupancy[WHITE] | occupancy[BLACK]
+
+        # Any move touching a king or rook home square drops the matching rights
+        rights = self.castling_rights
+        new_rights = rights & CASTLING_RIGHTS_MASK[from_sq] & CASTLING_RIGHTS_MASK[to_sq]
+        if new_rights != rights:
+            key ^= ZOBRIST_CASTLING_RIGHTS[rights ^ new_rights]
+            self.castling_rights = new_rights
+
+        self.zobrist_key = key
+        self.pawn_key = pawn_key
+        self.material_key = material_key
+        self.white_to_move = not white
+
+        if captured_code != EMPTY or is_pawn:
             self.halfmove_clock = 0
         else:
             self.halfmove_clock += 1
 
-        if self.white_to_move:
+        if not white:
             self.fullmove_number += 1
 
         if self.track_repetition:
-            repetition_hash = self.Hash_Board()
-            state.repetition_hash = repetition_hash
-            self.position_history[repetition_hash] = self.position_history.get(repetition_hash, 0) + 1
-
-        move.gives_check = self.Is_King_In_Check(self.white_to_move)
+            self.position_history[key] = self.position_history.get(key, 0) + 1
 
         return True
 
 
     def Make_Null_Move(self):
-        self.move_history.append(
-            MoveState(
-                move=None,
-                captured_piece='.',
-                castling_rights=frozenset(self.castling_rights),
-                en_passant_square=self.en_passant_square,
-                halfmove_clock=self.halfmove_clock,
-                fullmove_number=self.fullmove_number,
-                white_to_move=self.white_to_move,
-                moved_piece='.',
-                zobrist_key=self.zobrist_key,
-                white_king_pos=self.white_king_pos,
-                black_king_pos=self.black_king_pos,
-            )
-        )
-        if self.white_to_move:
-            self.zobrist_key ^= ZOBRIST_TURN
-        
+        state = self._Push_State()
+        state.move = MOVE_NONE
+        state.captured_piece = '.'
+        state.moved_piece = '.'
+        state.rook_from = -1
+        state.ep_capture_square = -1
+
+        self.zobrist_key ^= ZOBRIST_TURN
         if self.en_passant_square:
             self.zobrist_key ^= ZOBRIST_EN_PASSANT[self.en_passant_square[1]]
             self.en_passant_square = None
-            
+
         self.white_to_move = not self.white_to_move
-        if self.white_to_move:
-            self.zobrist_key ^= ZOBRIST_TURN
-            
         self.halfmove_clock += 1
         if self.white_to_move:
             self.fullmove_number += 1
 
+    def _Pop_State(self) -> MoveState:
+        self.history_ply -= 1
+        state = self.state_stack[self.history_ply]
+        self.castling_rights = state.castling_rights
+        self.en_passant_square = state.en_passant_square
+        self.halfmove_clock = state.halfmove_clock
+        self.fullmove_number = state.fullmove_number
+        self.white_to_move = state.white_to_move
+        self.zobrist_key = state.zobrist_key
+        self.pawn_key = state.pawn_key
+        self.material_key = state.material_key
+        self.white_king_pos = state.white_king_pos
+        self.black_king_pos = state.black_king_pos
+        return state
+
     def Undo_Null_Move(self):
-        last_state = self.move_history.pop()
-        self.castling_rights = set(last_state.castling_rights)
-        self.en_passant_square = last_state.en_passant_square
-        self.halfmove_clock = last_state.halfmove_clock
-        self.fullmove_number = last_state.fullmove_number
-        self.white_to_move = last_state.white_to_move
-        self.zobrist_key = last_state.zobrist_key
-        self.white_king_pos = last_state.white_king_pos
-        self.black_king_pos = last_state.black_king_pos
+        self._Pop_State()
 
     def Undo_Move (self):
-        if not self.move_history:
+        if not self.history_ply:
             return
 
-        last_state = self.move_history.pop()
+        if self.track_repetition:
+            key = self.zobrist_key
+            if key in self.position_history:
+                self.position_history[key] -= 1
+                if self.position_history[key] == 0:
+                    del self.position_history[key]
+
+        last_state = self._Pop_State()
         move = last_state.move
-        from_row, from_col = move.start
-        to_row, to_col = move.end
+        mailbox = self.mailbox
+        bitboards = self.bitboards
+        occupancy = self.occupancy
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        from_bit = SQUARE_BITS[from_sq]
+        to_bit = SQUARE_BITS[to_sq]
 
         # Restore moved piece
-        self.board[from_row][from_col] = last_state.moved_piece
-        self.board[to_row][to_col] = last_state.captured_piece
+        moved_index = PIECE_INDEX[last_state.moved_piece]
+        bitboards[mailbox[SQUARE_TO_MAILBOX[to_sq]] - 1] ^= to_bit
+        bitboards[moved_index] ^= from_bit
+        occupancy[PIECE_COLOR[moved_index]] ^= from_bit | to_bit
+        self._Set_Square(from_sq, last_state.moved_piece)
+        self._Set_Square(to_sq, last_state.captured_piece)
+        if last_state.captured_piece != '.':
+            captured_index = PIECE_INDEX[last_state.captured_piece]
+            bitboards[captured_index] ^= to_bit
+            occupancy[PIECE_COLOR[captured_index]] ^= to_bit
 
         # Undo en passant capture
-        if move.is_en_passant and last_state.ep_capture is not None:
-            r, c, piece = last_state.ep_capture
-            self.board[r][c] = piece
+        capture_sq = last_state.ep_capture_square
+        if capture_sq >= 0:
+            piece = 'p' if last_state.white_to_move else 'P'
+            self._Set_Square(capture_sq, piece)
+            ep_index = PIECE_INDEX[piece]
+            ep_bit = SQUARE_BITS[capture_sq]
+            bitboards[ep_index] ^= ep_bit
+            occupancy[PIECE_COLOR[ep_index]] ^= ep_bit
 
         # Undo castling rook move
-        if move.is_castling and last_state.rook_from is not None and last_state.rook_to is not None:
-            rook_from = last_state.rook_from
+        rook_from = last_state.rook_from
+        if rook_from >= 0:
             rook_to = last_state.rook_to
-            self.board[rook_from[0]][rook_from[1]] = self.board[rook_to[0]][rook_to[1]]
-            self.board[rook_to[0]][rook_to[1]] = '.'
-
-        self.castling_rights = set(last_state.castling_rights)
-        self.en_passant_square = last_state.en_passant_square
-        self.halfmove_clock = last_state.halfmove_clock
-        self.fullmove_number = last_state.fullmove_number
-        self.white_to_move = last_state.white_to_move
-        self.zobrist_key = last_state.zobrist_key
-        self.white_king_pos = last_state.white_king_pos
-        self.black_king_pos = last_state.black_king_pos
-
-        if self.track_repetition and last_state.repetition_hash is not None:
-            key = last_state.repetition_hash
-            if key in self.position_history:
-                self.position_history[key] -= 1
-                if self.position_history[key] == 0:
-                    del self.position_history[key]
+            rook_piece = 'R' if last_state.white_to_move else 'r'
+            self._Set_Square(rook_from, rook_piece)
+            self._Set_Square(rook_to, '.')
+            rook_index = PIECE_INDEX[rook_piece]
+            rook_bits = SQUARE_BITS[rook_from] | SQUARE_BITS[rook_to]
+            bitboards[rook_index] ^= rook_bits
+            occupancy[PIECE_COLOR[rook_index]] ^= rook_bits
+
+        self.occupied = occupancy[WHITE] | occupancy[BLACK]
 
     def Is_Threefold_Repetition (self) -> bool:
         key = self.Hash_Board()
@@ -816,10 +1551,8 @@ class Board:
         if self.Is_Threefold_Repetition():
             return ("draw", "threefold_repetition")
 
-        if legal_moves is None:
-            legal_moves = self.Generate_Legal_Moves()
-
-        if legal_moves:
+        has_legal_move = self.Has_Legal_Move() if legal_moves is None else bool(legal_moves)
+        if has_legal_move:
             return ("ongoing", "ongoing")
         if self.Is_King_In_Check(self.white_to_move):
             return ("black" if self.white_to_move else "white", "checkmate")
@@ -150,9 +150,7 @@ class ChessUI:
             self.Check_Endgame()
             return
 
-        legal_moves = self.board.Generate_Legal_Moves()
-        is_legal = any(m == move or m.To_UCI() == move.To_UCI() for m in legal_moves)
-        if not is_legal:
+        if not self.board.Is_Legal(move):
             self.pending_ai_root_hash = None
             return
 
@@ -1,29 +1,31 @@
-from Board import Board
-from Move import Move
+from Board import Board, GENERATE_NOISY, GENERATE_QUIET, LEGAL_MOVE_CACHE
+from Move import Move, MOVE_NONE, MOVE_PROMOTION, MOVE_EN_PASSANT, Move_Code_To_UCI
 from EvalBackend import FeatureVector, StubNNUEBackend, extract_features_from_board
-from tables import PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_MID_TABLE, KING_END_TABLE
+from Bitboards import PIECE_ORDER, SQUARE_BITS, SQUARE_COORDS, Castling_Rights_To_String
+from Mailbox import EMPTY, OFFBOARD, BLACK_CODE_MIN, CODE_PIECES, SQUARE_TO_MAILBOX, KNIGHT_OFFSETS, ROOK_OFFSETS, BISHOP_OFFSETS, QUEEN_OFFSETS, Mailbox_Placement
+from EvalCache import EvalCache, EVAL_CACHE_DEFAULT_BYTES
+from TranspositionTable import TranspositionTable, Remove_Shared_Table, TT_DEFAULT_MB, TT_MIN_MB, BOUND_UPPER, BOUND_LOWER, BOUND_EXACT
+from tables import PAWN_TABLE_CP, KNIGHT_TABLE_CP, BISHOP_TABLE_CP, ROOK_TABLE_CP, QUEEN_TABLE_CP, KING_MID_TABLE_CP, KING_END_TABLE_CP
+import atexit
+import itertools
 import math
+import multiprocessing
+import os
 import time
 import datetime
-from dataclasses import dataclass
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from typing import Callable
 
 
-@dataclass
-class TTEntry:
-    depth: int
-    score: float
-    flag: str
-    move: Move
-    generation: int
-
-
 class EngineSearchContext:
     def __init__(self):
-        self.transposition_table = {}
-        self.eval_cache = {}
+        self.transposition_table = TranspositionTable(TT_DEFAULT_MB)
+        self.eval_cache = EvalCache(EVAL_CACHE_DEFAULT_BYTES)
         self.killer_moves = {}
-        self.history_heuristic = {}
+        self.history_heuristic = [0] * 4096
+        self.move_buffers = []
         self.nodes_searched = 0
         self.quiescence_nodes = 0
         self.transposition_hits = 0
@@ -45,19 +47,28 @@ class EngineSearchContext:
         self.qsearch_noisy_accepted = 0
         self.qsearch_noisy_rejected = 0
         self.qsearch_noisy_considered = 0
+        self.illegal_moves_rejected = 0
         self.last_search_depth = 0
-        self.last_root_score = 0.0
+        self.last_root_score = 0
         self.last_pv = []
         self.last_best_move_uci = "0000"
         self.total_time_taken = 0.0
         self.tt_generation = 0
         self.search_deadline = None
         self.stop_checker: Callable[[], bool] | None = None
-        self.root_pv_move = None
+        self.root_pv_move = MOVE_NONE
         self.max_seldepth = 0
         self.aspiration_fail_lows = 0
         self.aspiration_fail_highs = 0
         self.aspiration_window_expansions = 0
+        self.search_workers = 1
+        self.worker_nodes = {}
+        self.root_lines = []
+        self.smp_helper_index = 0
+        self.search_pool = None
+        self.search_pool_key = None
+        self.search_stop_flag = None
+        self.smp_owned_table = None
 
 ctx = EngineSearchContext()
 
@@ -88,11 +99,13 @@ def __getattr__(name):
     raise AttributeError(f'module has no attribute {name}')
 
 Q_DEPTH_LIMIT = 2
+# Scores are integer centipawns everywhere; INFINITE_SCORE bounds every search window.
 MATE_SCORE = 10000
 MATE_TT_THRESHOLD = MATE_SCORE - 1000
+INFINITE_SCORE = 32000
 SEE_ENABLED = False
-MAX_TT_SIZE = 200000
-MAX_EVAL_CACHE_SIZE = 50000
+ROOT_SPLIT_TABLE_MB = 4
+ROOT_SPLIT_POLL_SECONDS = 0.02
 TEMPO_BONUS = 10
 EVAL_MODE = "classical"
 ENABLE_NULL_MOVE_PRUNING = True
@@ -137,7 +150,7 @@ def Reset_Search_Stats():
     ctx.lmr_researches = 0
     ctx.nmp_used = 0
     ctx.killer_moves = {}
-    ctx.history_heuristic = {}
+    ctx.history_heuristic = [0] * 4096
     ctx.minimax_time = 0.0
     ctx.quiescence_time = 0.0
     ctx.see_time = 0.0
@@ -150,28 +163,30 @@ def Reset_Search_Stats():
     ctx.qsearch_noisy_accepted = 0
     ctx.qsearch_noisy_rejected = 0
     ctx.qsearch_noisy_considered = 0
+    ctx.illegal_moves_rejected = 0
     ctx.last_search_depth = 0
-    ctx.last_root_score = 0.0
+    ctx.last_root_score = 0
     ctx.last_pv = []
     ctx.last_best_move_uci = "0000"
     ctx.total_time_taken = 0.0
     ctx.search_deadline = None
     ctx.stop_checker = None
-    ctx.root_pv_move = None
+    ctx.root_pv_move = MOVE_NONE
     ctx.max_seldepth = 0
     ctx.aspiration_fail_lows = 0
     ctx.aspiration_fail_highs = 0
     ctx.aspiration_window_expansions = 0
+    ctx.search_workers = 1
+    ctx.worker_nodes = {}
+    ctx.root_lines = []
+    ctx.eval_cache.Reset_Stats()
     Board.FIND_LEGAL_MOVES_TIME = 0
 
 
 def Has_Non_Pawn_Material(board: Board, white: bool) -> bool:
-    for row in board.board:
-        for piece in row:
-            if piece == "." or piece.isupper() != white:
-                continue
-            if piece.upper() in ("N", "B", "R", "Q"):
-                return True
+    for piece in ("N", "B", "R", "Q") if white else ("n", "b", "r", "q"):
+        if board.Piece_Bitboard(piece):
+            return True
     return False
 
 
@@ -183,11 +198,18 @@ def _Search_Should_Stop() -> bool:
     return False
 
 
+def _Move_Buffer(ply: int, stage: int = 0) -> array:
+    buffers = ctx.move_buffers
+    while len(buffers) <= ply:
+        buffers.append((array('H'), array('H')))
+    return buffers[ply][stage]
+
+
 def _Current_QRatio() -> float:
     return ctx.quiescence_nodes / max(1, ctx.nodes_searched)
 
 
-def _Score_To_TT(score: float, ply: int) -> float:
+def _Score_To_TT(score: int, ply: int) -> int:
     if score >= MATE_TT_THRESHOLD:
         return score + ply
     if score <= -MATE_TT_THRESHOLD:
@@ -195,7 +217,7 @@ def _Score_To_TT(score: float, ply: int) -> float:
     return score
 
 
-def _Score_From_TT(score: float, ply: int) -> float:
+def _Score_From_TT(score: int, ply: int) -> int:
     if score >= MATE_TT_THRESHOLD:
         return score - ply
     if score <= -MATE_TT_THRESHOLD:
@@ -203,62 +225,33 @@ def _Score_From_TT(score: float, ply: int) -> float:
     return score
 
 
-def _Probe_TT(key: int, depth: int, alpha: float, beta: float, ply: int) -> tuple[TTEntry | None, float, float, float | None]:
-    entry = ctx.transposition_table.get(key)
+def _Probe_TT(key: int, depth: int, alpha: int, beta: int, ply: int) -> tuple[int, int, int, int | None]:
+    entry = ctx.transposition_table.Probe(key)
     if entry is None:
-        return None, alpha, beta, None
+        return MOVE_NONE, alpha, beta, None
 
     ctx.transposition_hits += 1
-    tt_score = _Score_From_TT(entry.score, ply)
+    entry_depth, bound, score, move, _ = entry
+    tt_score = _Score_From_TT(score, ply)
 
-    if entry.depth >= depth:
-        if entry.flag == 'EXACT':
+    if entry_depth >= depth:
+        if bound == BOUND_EXACT:
             ctx.transposition_cutoffs += 1
-            return entry, alpha, beta, tt_score
-        if entry.flag == 'LOWER':
+            return move, alpha, beta, tt_score
+        if bound == BOUND_LOWER:
             alpha = max(alpha, tt_score)
-        elif entry.flag == 'UPPER':
+        elif bound == BOUND_UPPER:
             beta = min(beta, tt_score)
 
         if alpha >= beta:
             ctx.transposition_cutoffs += 1
-            return entry, alpha, beta, tt_score
+            return move, alpha, beta, tt_score
 
-    return entry, alpha, beta, None
+    return move, alpha, beta, None
 
 
-def _Store_TT_Entry(key: str, depth: int, score: float, flag: str, move: Move, ply: int):
-    new_entry = TTEntry(depth, _Score_To_TT(score, ply), flag, move, ctx.tt_generation)
-    old_entry = ctx.transposition_table.get(key)
-    if old_entry is not None:
-        if depth > old_entry.depth or (depth == old_entry.depth and flag == 'EXACT' and old_entry.flag != 'EXACT'):
-            ctx.transposition_table[key] = new_entry
-        return
-
-    if len(ctx.transposition_table) < MAX_TT_SIZE:
-        ctx.transposition_table[key] = new_entry
-        return
-
-    victim_key = None
-    victim_entry = None
-    for index, (cand_key, cand_entry) in enumerate(ctx.transposition_table.items()):
-        if index >= 64:
-            break
-        if victim_entry is None:
-            victim_key = cand_key
-            victim_entry = cand_entry
-            continue
-        if cand_entry.depth < victim_entry.depth:
-            victim_key = cand_key
-            victim_entry = cand_entry
-            continue
-        if cand_entry.depth == victim_entry.depth and cand_entry.generation < victim_entry.generation:
-            victim_key = cand_key
-            victim_entry = cand_entry
-
-    if victim_key is not None:
-        del ctx.transposition_table[victim_key]
-    ctx.transposition_table[key] = new_entry
+def _Store_TT_Entry(key: int, depth: int, score: int, bound: int, move: int, ply: int):
+    ctx.transposition_table.Store(key, depth, bound, _Score_To_TT(score, ply), move, ctx.tt_generation)
 
 
 def _Extract_PV(board: Board, depth: int) -> list[str]:
@@ -272,34 +265,26 @@ def _Extract_PV(board: Board, depth: int) -> list[str]:
             break
         visited.add(key)
 
-        entry = ctx.transposition_table.get(key)
-        if entry is None or entry.move is None:
+        entry = ctx.transposition_table.Probe(key)
+        if entry is None or entry[3] == MOVE_NONE:
             break
 
-        legal_moves = pv_board.Generate_Legal_Moves()
-        matched_move = None
-        for legal_move in legal_moves:
-            if legal_move == entry.move or legal_move.To_UCI() == entry.move.To_UCI():
-                matched_move = legal_move
-                break
-
-        if matched_move is None:
+        move = entry[3]
+        if not pv_board.Is_Legal(move):
             break
 
-        pv.append(matched_move.To_UCI())
-        pv_board.Make_Move(matched_move)
+        pv.append(Move_Code_To_UCI(move))
+        pv_board.Make_Move(move)
 
     return pv
 
 
-def _Prioritize_Root_Move(moves: list[Move], preferred_move: Move | None):
-    if preferred_move is None:
+def _Prioritize_Root_Move(moves: array, preferred_move: int):
+    if preferred_move == MOVE_NONE or preferred_move not in moves:
         return
-    for i, move in enumerate(moves):
-        if move == preferred_move or move.To_UCI() == preferred_move.To_UCI():
-            if i != 0:
-                moves.insert(0, moves.pop(i))
-            return
+    i = moves.index(preferred_move)
+    if i != 0:
+        moves.insert(0, moves.pop(i))
 
 
 def _Square_To_Alg(square: tuple[int, int] | None) -> str:
@@ -310,28 +295,13 @@ def _Square_To_Alg(square: tuple[int, int] | None) -> str:
 
 
 def _Board_To_FEN(board: Board) -> str:
-    fen_rows = []
-    for row in board.board:
-        empty = 0
-        out = []
-        for piece in row:
-            if piece == ".":
-                empty += 1
-            else:
-                if empty:
-                    out.append(str(empty))
-                    empty = 0
-                out.append(piece)
-        if empty:
-            out.append(str(empty))
-        fen_rows.append("".join(out))
-
+    placement = Mailbox_Placement(board.mailbox)
     active = "w" if board.white_to_move else "b"
-    castling = "".join([flag for flag in "KQkq" if flag in board.castling_rights]) or "-"
+    castling = Castling_Rights_To_String(board.castling_rights)
     ep = _Square_To_Alg(board.en_passant_square)
     halfmove = getattr(board, "halfmove_clock", 0)
     fullmove = getattr(board, "fullmove_number", 1)
-    return f"{'/'.join(fen_rows)} {active} {castling} {ep} {halfmove} {fullmove}"
+    return f"{placement} {active} {castling} {ep} {halfmove} {fullmove}"
 
 
 def _Append_Log_Line(line: str):
@@ -341,8 +311,8 @@ def _Append_Log_Line(line: str):
         log_file.write(line + "\n")
 
 
-def Format_UCI_Score(score: float) -> str:
-    cp_score = int(round(score))
+def Format_UCI_Score(score: int) -> str:
+    cp_score = int(score)
     mate_margin = MATE_SCORE - abs(cp_score)
     if mate_margin <= 200:
         plies_to_mate = max(1, (mate_margin + 1) // 2)
@@ -353,9 +323,7 @@ def Format_UCI_Score(score: float) -> str:
 
 
 def Get_Hashfull_Permill() -> int:
-    if MAX_TT_SIZE <= 0:
-        return 0
-    return min(1000, int((len(ctx.transposition_table) * 1000) / MAX_TT_SIZE))
+    return ctx.transposition_table.Hashfull(ctx.tt_generation)
 
 
 def Get_Search_Stats() -> dict:
@@ -368,7 +336,7 @@ def Get_Search_Stats() -> dict:
     return {
         "depth": ctx.last_search_depth,
         "seldepth": max(ctx.max_seldepth, ctx.last_search_depth),
-        "score_cp": int(round(ctx.last_root_score)),
+        "score_cp": ctx.last_root_score,
         "bestmove": ctx.last_best_move_uci,
         "pv": list(ctx.last_pv),
         "nodes": ctx.nodes_searched,
@@ -382,6 +350,11 @@ def Get_Search_Stats() -> dict:
         "tt_cutoffs": ctx.transposition_cutoffs,
         "tt_cutoff_rate": tt_cutoff_rate,
         "hashfull_permille": Get_Hashfull_Permill(),
+        "eval_cache_hits": ctx.eval_cache.hits,
+        "eval_cache_misses": ctx.eval_cache.misses,
+        "eval_cache_hit_rate": ctx.eval_cache.Hit_Rate(),
+        "eval_cache_collisions": ctx.eval_cache.collisions,
+        "eval_cache_fill_permille": ctx.eval_cache.Fill_Permill(),
         "qratio": qratio,
         "nmp_used": ctx.nmp_used,
         "lmr_count": ctx.lmr_count,
@@ -397,12 +370,30 @@ def Get_Search_Stats() -> dict:
         "qsearch_noisy_considered": ctx.qsearch_noisy_considered,
         "qsearch_noisy_accepted": ctx.qsearch_noisy_accepted,
         "qsearch_noisy_rejected": ctx.qsearch_noisy_rejected,
+        "illegal_rejected": ctx.illegal_moves_rejected,
         "asp_fail_low": ctx.aspiration_fail_lows,
         "asp_fail_high": ctx.aspiration_fail_highs,
         "asp_expands": ctx.aspiration_window_expansions,
+        "workers": ctx.search_workers,
+        "worker_nodes": _Worker_Node_Counts(total_nodes),
+        "root_lines": list(ctx.root_lines),
     }
 
 
+def _Worker_Node_Counts(total_nodes: int) -> list[tuple[int, int]]:
+    """(pid, nodes) per search process, the calling process first."""
+    helper_total = sum(ctx.worker_nodes.values())
+    counts = [(os.getpid(), total_nodes - helper_total)]
+    counts.extend(sorted(ctx.worker_nodes.items()))
+    return counts
+
+
+def _Record_Worker_Nodes(pid: int, nodes: int, qnodes: int):
+    ctx.nodes_searched += nodes
+    ctx.quiescence_nodes += qnodes
+    ctx.worker_nodes[pid] = ctx.worker_nodes.get(pid, 0) + nodes + qnodes
+
+
 def _Record_Eval_Call(is_static: bool, caller: str, elapsed: float):
     ctx.total_eval_calls += 1
     if is_static:
@@ -422,11 +413,10 @@ def Estimate_Auto_Depth(board: Board, min_depth: int = 3, max_depth: int = 8, la
     min_depth = max(1, int(min_depth))
     max_depth = max(min_depth, int(max_depth))
 
-    legal_moves = board.Generate_Legal_Moves()
-    if not legal_moves:
+    move_count = board.Count_Legal_Moves()
+    if not move_count:
         return min_depth
 
-    move_count = len(legal_moves)
     in_check = board.Is_King_In_Check(board.white_to_move)
 
     if move_count >= 36:
@@ -451,12 +441,12 @@ def Estimate_Auto_Depth(board: Board, min_depth: int = 3, max_depth: int = 8, la
 
     return max(min_depth, min(max_depth, depth))
 
-def Capture_Quality_Tier(move: Move) -> int:
-    if move.is_pawn_promotion:
+def Capture_Quality_Tier(board: Board, move: int) -> int:
+    if move >> 14 == MOVE_PROMOTION:
         return 3
 
-    victim_value = ABS_PIECE_VALUES.get(move.piece_captured or "", 0)
-    attacker_value = ABS_PIECE_VALUES.get(move.piece_moved or "", 0)
+    victim_value = ABS_PIECE_VALUES.get(board.Move_Captured_Piece(move) or "", 0)
+    attacker_value = ABS_PIECE_VALUES[board.Move_Moved_Piece(move)]
     trade_delta = victim_value - attacker_value
 
     if trade_delta > 80:
@@ -466,24 +456,23 @@ def Capture_Quality_Tier(move: Move) -> int:
     return 0
 
 
-def _Capture_Order_Score(move: Move) -> int:
-    tier = Capture_Quality_Tier(move)
-    victim_value = ABS_PIECE_VALUES.get(move.piece_captured or "", 0)
-    attacker_value = ABS_PIECE_VALUES.get(move.piece_moved or "", 0)
-    check_bonus = CHECK_MOVE_BONUS if move.gives_check else 0
+def _Capture_Order_Score(board: Board, move: int) -> int:
+    tier = Capture_Quality_Tier(board, move)
+    victim_value = ABS_PIECE_VALUES.get(board.Move_Captured_Piece(move) or "", 0)
+    attacker_value = ABS_PIECE_VALUES[board.Move_Moved_Piece(move)]
 
-    if move.is_pawn_promotion:
-        return 24000 + victim_value + check_bonus
+    if move >> 14 == MOVE_PROMOTION:
+        return 24000 + victim_value
     if tier == 2:
-        return 18000 + victim_value * 10 - attacker_value + check_bonus
+        return 18000 + victim_value * 10 - attacker_value
     if tier == 1:
-        return 13000 + victim_value * 8 - attacker_value + check_bonus
-    return 2000 + victim_value * 4 - attacker_value + check_bonus
+        return 13000 + victim_value * 8 - attacker_value
+    return 2000 + victim_value * 4 - attacker_value
 
 
-def _Quiescence_Delta_Margin(move: Move, qratio: float) -> int:
-    tier = Capture_Quality_Tier(move)
-    if move.is_pawn_promotion:
+def _Quiescence_Delta_Margin(board: Board, move: int, qratio: float) -> int:
+    tier = Capture_Quality_Tier(board, move)
+    if move >> 14 == MOVE_PROMOTION:
         return 140
     if tier >= 2:
         return 100 if qratio > 2.5 else 130
@@ -492,21 +481,22 @@ def _Quiescence_Delta_Margin(move: Move, qratio: float) -> int:
     return 30 if qratio > 1.7 else 50
 
 
-def _Approx_Capture_Risk(board: Board, move: Move) -> tuple[bool, bool, bool]:
-    if move.is_pawn_promotion:
+def _Approx_Capture_Risk(board: Board, move: int) -> tuple[bool, bool, bool]:
+    if move >> 14 == MOVE_PROMOTION:
         return False, True, False
 
     friendly_is_white = board.white_to_move
-    defended_by_enemy = board._Is_Square_Attacked(move.end, not friendly_is_white)
-    supported_by_friendly = board._Is_Square_Attacked(move.end, friendly_is_white)
-    victim_value = ABS_PIECE_VALUES.get(move.piece_captured or "", 0)
-    attacker_value = ABS_PIECE_VALUES.get(move.piece_moved or "", 0)
+    target_square = (move >> 6) & 63
+    defended_by_enemy = board._Is_Square_Index_Attacked(target_square, not friendly_is_white, board.occupied)
+    supported_by_friendly = board._Is_Square_Index_Attacked(target_square, friendly_is_white, board.occupied)
+    victim_value = ABS_PIECE_VALUES.get(board.Move_Captured_Piece(move) or "", 0)
+    attacker_value = ABS_PIECE_VALUES[board.Move_Moved_Piece(move)]
     risky = defended_by_enemy and (not supported_by_friendly) and attacker_value > victim_value
     return defended_by_enemy, supported_by_friendly, risky
 
 
-def _QCapture_Order_Score(board: Board, move: Move) -> int:
-    score = _Capture_Order_Score(move)
+def _QCapture_Order_Score(board: Board, move: int) -> int:
+    score = _Capture_Order_Score(board, move)
     defended, supported, risky = _Approx_Capture_Risk(board, move)
     if risky:
         score -= 2400
@@ -517,14 +507,14 @@ def _QCapture_Order_Score(board: Board, move: Move) -> int:
     return score
 
 
-def _Should_Search_QCapture(board: Board, move: Move, qratio: float) -> tuple[bool, bool]:
-    if move.is_pawn_promotion:
+def _Should_Search_QCapture(board: Board, move: int, qratio: float) -> tuple[bool, bool]:
+    if move >> 14 == MOVE_PROMOTION:
         return True, False
 
-    tier = Capture_Quality_Tier(move)
+    tier = Capture_Quality_Tier(board, move)
     defended, supported, risky = _Approx_Capture_Risk(board, move)
-    attacker_value = ABS_PIECE_VALUES.get(move.piece_moved or "", 0)
-    victim_value = ABS_PIECE_VALUES.get(move.piece_captured or "", 0)
+    attacker_value = ABS_PIECE_VALUES[board.Move_Moved_Piece(move)]
+    victim_value = ABS_PIECE_VALUES.get(board.Move_Captured_Piece(move) or "", 0)
 
     if tier == 0:
         return False, risky or defended
@@ -537,51 +527,96 @@ def _Should_Search_QCapture(board: Board, move: Move, qratio: float) -> tuple[bo
     return True, risky
 
 
-def _Is_Promising_Quiet(move: Move, depth: int) -> bool:
-    if depth in ctx.killer_moves and move in ctx.killer_moves[depth]:
+def _Is_Promising_Quiet(move: int, depth: int) -> bool:
+    killers = ctx.killer_moves.get(depth)
+    if killers and move in killers:
         return True
-    history_score = ctx.history_heuristic.get((move.start, move.end), 0)
+    history_score = ctx.history_heuristic[move & 4095]
     return history_score >= max(100, depth * depth * 4)
 
 
-def Order_Moves(board: Board, moves: list, depth: int, tt_move: Move | None = None):
-    scored_moves = []
-    for move in moves:
+def Order_Moves(board: Board, moves: array, depth: int, tt_move: int = MOVE_NONE):
+    def move_score(move: int) -> int:
         score = Score_Move(board, move, depth)
-        if tt_move is not None and (move == tt_move or move.To_UCI() == tt_move.To_UCI()):
+        if move == tt_move:
             score += TT_MOVE_BONUS
-        scored_moves.append((score, move))
-
-    scored_moves.sort(key=lambda item: item[0], reverse=True)
-    moves[:] = [move for _, move in scored_moves]
-
-def Order_Quiescence_Moves(board: Board, moves: list):
-    moves.sort(key=lambda move: _QCapture_Order_Score(board, move), reverse=True)
+        return score
 
-def Move_Gives_Check(board: Board, move: Move, cache: dict) -> bool:
-    cache_key = hash(move)
-    if cache_key in cache:
-        return cache[cache_key]
+    moves[:] = array('H', sorted(moves, key=move_score, reverse=True))
 
-    if not board.Make_Move(move):
-        cache[cache_key] = False
-        return False
+def Pick_Moves(board: Board, depth: int, ply: int, tt_move: int = MOVE_NONE, in_check: bool = False):
+    # Staged picker: each stage is generated only once the previous one is exhausted,
+    # so a cutoff on the TT move or an early capture skips the rest of the work.
+    # Moves are pseudo-legal; the caller filters them with Make_Move_If_Legal.
+    # The TT move and the killers are validated directly against the board and
+    # played before the stage that would have generated them.
+    if tt_move != MOVE_NONE and board.Is_Pseudo_Legal(tt_move):
+        yield tt_move
+    else:
+        tt_move = MOVE_NONE
 
-    # After making the move, side-to-move is the opponent.
-    gives_check = board.Is_King_In_Check(board.white_to_move)
-    board.Undo_Move()
-    cache[cache_key] = gives_check
-    return gives_check
+    if in_check:
+        # Evasions are few and already legal, so they are ordered in one pass.
+        evasions = board.Generate_Evasion_Codes(_Move_Buffer(ply, 0))
+        Order_Moves(board, evasions, depth)
+        for move in evasions:
+            if move != tt_move:
+                yield move
+        return
 
-def Get_PVS_Window(alpha: float, beta: float, maximizing: bool) -> tuple[float, float]:
+    winning = []
+    winning_scores = []
+    losing = []
+    losing_scores = []
+    for move in board.Generate_Pseudo_Legal_Codes(_Move_Buffer(ply, 0), GENERATE_NOISY, False):
+        if move == tt_move:
+            continue
+        if Capture_Quality_Tier(board, move):
+            winning.append(move)
+            winning_scores.append(_Capture_Order_Score(board, move))
+        else:
+            losing.append(move)
+            losing_scores.append(_Capture_Order_Score(board, move))
+
+    while winning:
+        index = winning_scores.index(max(winning_scores))
+        winning_scores.pop(index)
+        yield winning.pop(index)
+
+    # Snapshot: a child searched at the same depth (check extension) may update the
+    # live killer list while this generator is suspended.
+    killers = tuple(ctx.killer_moves.get(depth, ()))
+    for killer in killers:
+        if killer != tt_move and board.Is_Pseudo_Legal(killer) and not board._Is_Noisy_Move(killer):
+            yield killer
+
+    quiets = board.Generate_Pseudo_Legal_Codes(_Move_Buffer(ply, 1), GENERATE_QUIET)
+
+    history = ctx.history_heuristic
+    remaining = [move for move in quiets if move != tt_move and move not in killers]
+    # History only: a check test here would run on every quiet before the first is
+    # tried; the search tests the late quiets it actually reaches.
+    scores = [history[move & 4095] for move in remaining]
+    while remaining:
+        index = scores.index(max(scores))
+        scores.pop(index)
+        yield remaining.pop(index)
+
+    while losing:
+        index = losing_scores.index(max(losing_scores))
+        losing_scores.pop(index)
+        yield losing.pop(index)
+
+def Order_Quiescence_Moves(board: Board, moves: array):
+    moves[:] = array('H', sorted(moves, key=lambda move: _QCapture_Order_Score(board, move), reverse=True))
+
+def Get_PVS_Window(alpha: int, beta: int, maximizing: bool) -> tuple[int, int]:
     if maximizing:
         return alpha, min(beta, alpha + 1)
     return max(alpha, beta - 1), beta
 
-def _Store_Eval_Cache(key: int, score: float):
-    if len(ctx.eval_cache) >= MAX_EVAL_CACHE_SIZE:
-        ctx.eval_cache.pop(next(iter(ctx.eval_cache)))
-    ctx.eval_cache[key] = score
+def _Store_Eval_Cache(key: int, score: int):
+    ctx.eval_cache.Store(key, score)
 
 
 def extract_features(board: Board) -> FeatureVector:
@@ -600,66 +635,66 @@ def Set_Eval_Mode(mode: str):
     EVAL_MODE = normalized
 
 
-def Evaluate_Endgame_King_Activity(board: Board, phase: int, white_piece_map: dict, black_piece_map: dict) -> float:
+def _Round_Div(value: int, divisor: int) -> int:
+    # Rounds half away from zero so a position and its colour mirror score symmetrically.
+    if value >= 0:
+        return (value + divisor // 2) // divisor
+    return -((divisor // 2 - value) // divisor)
+
+
+def Evaluate_Endgame_King_Activity(board: Board, phase: int, white_piece_map: dict, black_piece_map: dict) -> int:
     if phase > 10:
-        return 0.0
+        return 0
 
     white_king = board.Find_King(True)
     black_king = board.Find_King(False)
     if white_king == (-1, -1) or black_king == (-1, -1):
-        return 0.0
-
-    endgame_weight = (10 - phase) / 10.0
+        return 0
 
-    def king_center_bonus(square: tuple[int, int]) -> float:
+    # Centre distances are kept in half-squares so the bonus stays integral.
+    def king_center_bonus(square: tuple[int, int]) -> int:
         row, col = square
-        return 7 - (abs(row - 3.5) + abs(col - 3.5))
+        return 14 - (abs(2 * row - 7) + abs(2 * col - 7))
 
     queen_count = len(white_piece_map["Q"]) + len(black_piece_map["Q"])
-    scale = 1.0 if queen_count == 0 else 0.5
-    return (
-        (king_center_bonus(white_king) - king_center_bonus(black_king))
-        * 4.0
-        * endgame_weight
-        * scale
+    divisor = 10 if queen_count == 0 else 20
+    return _Round_Div(
+        (king_center_bonus(white_king) - king_center_bonus(black_king)) * 2 * (10 - phase),
+        divisor,
     )
 
 
-def Evaluate_Mop_Up(board: Board, phase: int, white_material: int, black_material: int) -> float:
+def Evaluate_Mop_Up(board: Board, phase: int, white_material: int, black_material: int) -> int:
     if phase > 8:
-        return 0.0
+        return 0
 
     white_king = board.Find_King(True)
     black_king = board.Find_King(False)
     if white_king == (-1, -1) or black_king == (-1, -1):
-        return 0.0
+        return 0
 
     material_edge = white_material - black_material
     if abs(material_edge) < 350:
-        return 0.0
+        return 0
 
     winning_white = material_edge > 0
     winner_king = white_king if winning_white else black_king
     loser_king = black_king if winning_white else white_king
     king_distance = abs(winner_king[0] - loser_king[0]) + abs(winner_king[1] - loser_king[1])
-    loser_from_center = abs(loser_king[0] - 3.5) + abs(loser_king[1] - 3.5)
-    endgame_weight = (8 - phase) / 8.0
-    score = (14 - king_distance) * 8 + loser_from_center * 12
-    return score * endgame_weight if winning_white else -score * endgame_weight
+    loser_from_center_halves = abs(2 * loser_king[0] - 7) + abs(2 * loser_king[1] - 7)
+    score = _Round_Div(((14 - king_distance) * 8 + loser_from_center_halves * 6) * (8 - phase), 8)
+    return score if winning_white else -score
 
 
-def evaluate_classical(board: Board) -> float:
+def evaluate_classical(board: Board) -> int:
     key = board.Hash_Board()
-    cached_score = ctx.eval_cache.get(key)
+    cached_score = ctx.eval_cache.Probe(key)
     if cached_score is not None:
         return cached_score
 
-    board_rows = board.board
     mg_score = TEMPO_BONUS if board.white_to_move else -TEMPO_BONUS
     eg_score = mg_score
     phase = 0
-    white_bishop_count = 0
-    black_bishop_count = 0
     white_material = 0
     black_material = 0
 
@@ -670,108 +705,59 @@ def evaluate_classical(board: Board) -> float:
     white_rooks_by_col = [0] * 8
     black_rooks_by_col = [0] * 8
 
-    for row, board_row in enumerate(board_rows):
-        for col, piece in enumerate(board_row):
-            if piece == ".":
-                continue
-
-            mg_score += PIECE_VALUES_CP[piece]
-            eg_score += PIECE_VALUES_CP[piece]
-            if piece == "P":
-                white_pawns[col].append(row)
-                white_material += 100
-                pst = PAWN_TABLE[row][col] * 10
-                mg_score += pst
-                eg_score += pst
-                continue
-            if piece == "p":
-                black_pawns[col].append(row)
-                black_material += 100
-                table_row = 7 - row
-                pst = PAWN_TABLE[table_row][col] * 10
-                mg_score -= pst
-                eg_score -= pst
-                continue
-            if piece == "N":
-                white_piece_map["N"].append((row, col))
-                white_material += 320
-                phase += 1
-                pst = KNIGHT_TABLE[row][col] * 10
-                mg_score += pst
-                eg_score += pst
-                continue
-            if piece == "n":
-                black_piece_map["N"].append((row, col))
-                black_material += 320
-                phase += 1
-                table_row = 7 - row
-                pst = KNIGHT_TABLE[table_row][col] * 10
-                mg_score -= pst
-                eg_score -= pst
-                continue
-            if piece == "B":
-                white_piece_map["B"].append((row, col))
-                white_bishop_count += 1
-                white_material += 330
-                phase += 1
-                pst = BISHOP_TABLE[row][col] * 10
-                mg_score += pst
-                eg_score += pst
-                continue
-            if piece == "b":
-                black_piece_map["B"].append((row, col))
-                black_bishop_count += 1
-                black_material += 330
-                phase += 1
-                table_row = 7 - row
-                pst = BISHOP_TABLE[table_row][col] * 10
-                mg_score -= pst
-                eg_score -= pst
-                continue
-            if piece == "R":
-                white_piece_map["R"].append((row, col))
-                white_rooks_by_col[col] += 1
-                white_material += 500
-                phase += 2
-                pst = ROOK_TABLE[row][col] * 10
-                mg_score += pst
-                eg_score += pst
-                continue
-            if piece == "r":
-                black_piece_map["R"].append((row, col))
-                black_rooks_by_col[col] += 1
-                black_material += 500
-                phase += 2
-                table_row = 7 - row
-                pst = ROOK_TABLE[table_row][col] * 10
-                mg_score -= pst
-                eg_score -= pst
-                continue
-            if piece == "Q":
-                white_piece_map["Q"].append((row, col))
-                white_material += 900
-                phase += 4
-                pst = QUEEN_TABLE[row][col] * 10
-                mg_score += pst
-                eg_score += pst
-                continue
-            if piece == "q":
-                black_piece_map["Q"].append((row, col))
-                black_material += 900
-                phase += 4
-                table_row = 7 - row
-                pst = QUEEN_TABLE[table_row][col] * 10
-                mg_score -= pst
-                eg_score -= pst
-                continue
-            if piece == "K":
-                mg_score += KING_MID_TABLE[row][col] * 10
-                eg_score += KING_END_TABLE[row][col] * 10
-                continue
-            if piece == "k":
-                table_row = 7 - row
-                mg_score -= KING_MID_TABLE[table_row][col] * 10
-                eg_score -= KING_END_TABLE[table_row][col] * 10
+    for square in board.Piece_Squares("P"):
+        row, col = SQUARE_COORDS[square]
+        white_pawns[col].append(row)
+        pst = PAWN_TABLE_CP[row][col]
+        mg_score += pst
+        eg_score += pst
+    for square in board.Piece_Squares("p"):
+        row, col = SQUARE_COORDS[square]
+        black_pawns[col].append(row)
+        pst = PAWN_TABLE_CP[7 - row][col]
+        mg_score -= pst
+        eg_score -= pst
+
+    for piece, table in (("N", KNIGHT_TABLE_CP), ("B", BISHOP_TABLE_CP), ("R", ROOK_TABLE_CP), ("Q", QUEEN_TABLE_CP)):
+        white_squares = white_piece_map[piece]
+        for square in board.Piece_Squares(piece):
+            row, col = SQUARE_COORDS[square]
+            white_squares.append((row, col))
+            pst = table[row][col]
+            mg_score += pst
+            eg_score += pst
+        black_squares = black_piece_map[piece]
+        for square in board.Piece_Squares(piece.lower()):
+            row, col = SQUARE_COORDS[square]
+            black_squares.append((row, col))
+            pst = table[7 - row][col]
+            mg_score -= pst
+            eg_score -= pst
+
+    for row, col in white_piece_map["R"]:
+        white_rooks_by_col[col] += 1
+    for row, col in black_piece_map["R"]:
+        black_rooks_by_col[col] += 1
+
+    white_bishop_count = len(white_piece_map["B"])
+    black_bishop_count = len(black_piece_map["B"])
+    for piece in ("P", "N", "B", "R", "Q"):
+        white_count = board.Piece_Count(piece)
+        black_count = board.Piece_Count(piece.lower())
+        white_material += ABS_PIECE_VALUES[piece] * white_count
+        black_material += ABS_PIECE_VALUES[piece] * black_count
+        phase += PHASE_WEIGHTS.get(piece, 0) * (white_count + black_count)
+    mg_score += white_material - black_material
+    eg_score += white_material - black_material
+
+    for square in board.Piece_Squares("K"):
+        row, col = SQUARE_COORDS[square]
+        mg_score += KING_MID_TABLE_CP[row][col]
+        eg_score += KING_END_TABLE_CP[row][col]
+    for square in board.Piece_Squares("k"):
+        row, col = SQUARE_COORDS[square]
+        mg_score -= KING_MID_TABLE_CP[7 - row][col]
+        eg_score -= KING_END_TABLE_CP[7 - row][col]
 
     pawn_structure_score = Evaluate_Pawn_Structure(board, white_pawns, black_pawns, phase)
     open_file_score = Evaluate_Open_Files_And_Rooks(
@@ -802,25 +788,20 @@ def evaluate_classical(board: Board) -> float:
         if (row, col) in EXTENDED_CENTER_SET:
             queen_activity_score -= 8
 
-    mg_score += (
-        pawn_structure_score
-        + open_file_score
-        + rook_activity_score
-        + 0.75 * king_safety_score
-        + 0.60 * mobility_score
-        + development_score
-        + 0.60 * queen_activity_score
+    # Term weights are fixed-point percentages.
+    mg_score += pawn_structure_score + open_file_score + rook_activity_score + development_score + _Round_Div(
+        75 * king_safety_score
+        + 60 * mobility_score
+        + 60 * queen_activity_score,
+        100,
     )
-    eg_score += (
-        pawn_structure_score
-        + open_file_score
-        + 1.25 * rook_activity_score
-        + 0.20 * king_safety_score
-        + 0.80 * mobility_score
-        + 0.20 * development_score
-        + endgame_king_score
-        + mop_up_score
-        + 0.25 * queen_activity_score
+    eg_score += pawn_structure_score + open_file_score + endgame_king_score + mop_up_score + _Round_Div(
+        125 * rook_activity_score
+        + 20 * king_safety_score
+        + 80 * mobility_score
+        + 20 * development_score
+        + 25 * queen_activity_score,
+        100,
     )
     
 
@@ -855,19 +836,19 @@ def evaluate_classical(board: Board) -> float:
     """
 
     phase = max(0, min(24, phase))
-    score = (mg_score * phase + eg_score * (24 - phase)) / 24
+    score = _Round_Div(mg_score * phase + eg_score * (24 - phase), 24)
     _Store_Eval_Cache(key, score)
     return score
 
 
-def evaluate_nnue(board: Board) -> float:
+def evaluate_nnue(board: Board) -> int:
     if not NNUE_BACKEND.is_ready():
         NNUE_BACKEND.load(None)
     features = extract_features(board)
-    return NNUE_BACKEND.evaluate(features)
+    return int(round(NNUE_BACKEND.evaluate(features)))
 
 
-def static_eval(board: Board, caller: str = "main") -> float:
+def static_eval(board: Board, caller: str = "main") -> int:
     t0 = time.perf_counter()
     if EVAL_MODE == "nnue":
         score = evaluate_nnue(board)
@@ -877,7 +858,7 @@ def static_eval(board: Board, caller: str = "main") -> float:
     return score
 
 
-def full_eval(board: Board, caller: str = "main") -> float:
+def full_eval(board: Board, caller: str = "main") -> int:
     t0 = time.perf_counter()
     if EVAL_MODE == "nnue":
         score = evaluate_nnue(board)
@@ -887,16 +868,16 @@ def full_eval(board: Board, caller: str = "main") -> float:
     return score
 
 
-def Evaluate_Position(board: Board) -> float:
+def Evaluate_Position(board: Board) -> int:
     return evaluate_classical(board)
 
-def Evaluate_Pawn_Structure(board: Board, white_pawns: list, black_pawns: list, phase: float) -> float:
+def Evaluate_Pawn_Structure(board: Board, white_pawns: list, black_pawns: list, phase: int) -> int:
     score = 0
     white_passed = []
     black_passed = []
 
     phase = max(0, min(24, phase))
-    endgame_factor = (24 - phase) / 24.0
+    endgame_phase = 24 - phase
     white_king = board.Find_King(True)
     black_king = board.Find_King(False)
 
@@ -927,12 +908,12 @@ def Evaluate_Pawn_Structure(board: Board, white_pawns: list, black_pawns: list,
 
                 clear_path = all(board.board[r][col] == "." for r in range(row - 1, -1, -1))
                 if clear_path:
-                    score += 8 + int(10 * endgame_factor)
+                    score += 8 + 10 * endgame_phase // 24
 
                 if white_king != (-1, -1) and black_king != (-1, -1):
                     own_dist = abs(white_king[0] - row) + abs(white_king[1] - col)
                     enemy_dist = abs(black_king[0] - row) + abs(black_king[1] - col)
-                    score += (enemy_dist - own_dist) * (1.5 + endgame_factor)
+                    score += _Round_Div((enemy_dist - own_dist) * (36 + endgame_phase), 24)
 
         for row in bp:
             if (col == 0 or not black_pawns[col - 1]) and (col == 7 or not black_pawns[col + 1]):
@@ -952,22 +933,22 @@ def Evaluate_Pawn_Structure(board: Board, white_pawns: list, black_pawns: list,
 
                 clear_path = all(board.board[r][col] == "." for r in range(row + 1, 8))
                 if clear_path:
-                    score -= 8 + int(10 * endgame_factor)
+                    score -= 8 + 10 * endgame_phase // 24
 
                 if white_king != (-1, -1) and black_king != (-1, -1):
                     own_dist = abs(black_king[0] - row) + abs(black_king[1] - col)
                     enemy_dist = abs(white_king[0] - row) + abs(white_king[1] - col)
-                    score -= (enemy_dist - own_dist) * (1.5 + endgame_factor)
+                    score -= _Round_Div((enemy_dist - own_dist) * (36 + endgame_phase), 24)
 
     white_passed_set = set(white_passed)
     for row, col in white_passed:
         if ((row, col - 1) in white_passed_set) or ((row, col + 1) in white_passed_set):
-            score += 10 + int(8 * endgame_factor)
+            score += 10 + 8 * endgame_phase // 24
 
     black_passed_set = set(black_passed)
     for row, col in black_passed:
         if ((row, col - 1) in black_passed_set) or ((row, col + 1) in black_passed_set):
-            score -= 10 + int(8 * endgame_factor)
+            score -= 10 + 8 * endgame_phase // 24
 
     return score
         
@@ -977,7 +958,7 @@ def Evaluate_Open_Files_And_Rooks(
     black_pawns: list,
     white_rooks_by_col: list,
     black_rooks_by_col: list,
-) -> float:
+) -> int:
     score = 0
 
     for col in range (8):
@@ -1005,7 +986,7 @@ def Evaluate_King_Safety(
     black_piece_map: dict,
     white_pawns: list,
     black_pawns: list,
-) -> float:
+) -> int:
     def side_king_safety(white: bool) -> int:
         king_row, king_col = board.Find_King(white)
         if king_row == -1:
@@ -1093,61 +1074,41 @@ def Evaluate_Space (board):
                 black_space += 1
     return (whtie_space - black_space) * 2
 
-def Evaluate_Mobility (board: Board, white_piece_map: dict, black_piece_map: dict) -> float:
+def Evaluate_Mobility (board: Board, white_piece_map: dict, black_piece_map: dict) -> int:
     weights = {'N': 4, 'B': 3, 'R': 2, 'Q': 1}
+    slider_offsets = {'B': BISHOP_OFFSETS, 'R': ROOK_OFFSETS, 'Q': QUEEN_OFFSETS}
+    mailbox = board.mailbox
 
-    white_mobility = 0
-    black_mobility = 0
-
-    def add_mobility(is_white: bool, amount: int):
-        nonlocal white_mobility, black_mobility
-        if is_white:
-            white_mobility += amount
-        else:
-            black_mobility += amount
-
-    def accumulate_side_mobility(piece_map: dict, is_white: bool):
+    def side_mobility(piece_map: dict, is_white: bool) -> int:
+        total = 0
         for p in ("N", "B", "R", "Q"):
             for row, col in piece_map[p]:
-                if p == "N":
-                    count = 0
-                    for dr, dc in KNIGHT_DIRS:
-                        r, c = row + dr, col + dc
-                        if 0 <= r < 8 and 0 <= c < 8:
-                            target = board.board[r][c]
-                            if target == "." or target.isupper() != is_white:
-                                count += 1
-                    add_mobility(is_white, count * weights[p])
-                    continue
-
-                directions = []
-                if p in ("B", "Q"):
-                    directions.extend(BISHOP_DIRS)
-                if p in ("R", "Q"):
-                    directions.extend(ROOK_DIRS)
-
+                origin = SQUARE_TO_MAILBOX[row * 8 + col]
                 reachable = 0
-                for dr, dc in directions:
-                    r, c = row + dr, col + dc
-                    while 0 <= r < 8 and 0 <= c < 8:
-                        target = board.board[r][c]
-                        if target == ".":
+                if p == "N":
+                    for offset in KNIGHT_OFFSETS:
+                        code = mailbox[origin + offset]
+                        if code == EMPTY or (code != OFFBOARD and (code < BLACK_CODE_MIN) != is_white):
                             reachable += 1
-                        else:
-                            if target.isupper() != is_white:
-                                reachable += 1
-                            break
-                        r += dr
-                        c += dc
+                    total += reachable * weights[p]
+                    continue
 
-                add_mobility(is_white, reachable * weights[p])
+                for offset in slider_offsets[p]:
+                    index = origin + offset
+                    code = mailbox[index]
+                    while code == EMPTY:
+                        reachable += 1
+                        index += offset
+                        code = mailbox[index]
+                    if code != OFFBOARD and (code < BLACK_CODE_MIN) != is_white:
+                        reachable += 1
 
-    accumulate_side_mobility(white_piece_map, True)
-    accumulate_side_mobility(black_piece_map, False)
+                total += reachable * weights[p]
+        return total
 
-    return white_mobility - black_mobility
+    return side_mobility(white_piece_map, True) - side_mobility(black_piece_map, False)
 
-def Evaluate_Development (board: Board, phase: float) -> float:
+def Evaluate_Development (board: Board, phase: int) -> int:
     # Simple opening development in centipawns. Taper scaled down aggressively by phase.
     if phase < 16:  # Only mattered in opening/early midgame mostly
         return 0
@@ -1172,9 +1133,8 @@ def Evaluate_Development (board: Board, phase: float) -> float:
         if board.board[sq[0]][sq[1]] == "p":
             score -= 5
 
-    # Taper aggressively
-    opening_weight = (phase - 16) / 8.0  # max 1.0 at phase 24 (opening), 0.0 at phase 16 (mid/end)
-    return score * opening_weight
+    # Taper aggressively: full weight at phase 24 (opening), none at phase 16 (mid/end)
+    return _Round_Div(score * (phase - 16), 8)
 
 def Evaluate_Pins (board: Board) -> float:
     score = 0
@@ -1280,19 +1240,19 @@ def Evaluate_Skewers(board: Board) -> float:
     return score
 
 
-def Terminal_Score(board: Board, ply: int) -> float:
+def Terminal_Score(board: Board, ply: int) -> int:
     result, reason = board.Get_Game_Result(legal_moves=[])
     if reason != "checkmate":
-        return 0.0
+        return 0
     return -(MATE_SCORE - ply)
 
-def Evaluate_Node(board: Board, caller: str = "main") -> float:
+def Evaluate_Node(board: Board, caller: str = "main") -> int:
     if board.Is_Threefold_Repetition() or board.Is_Fifty_Move_Rule():
-        return 0.0
+        return 0
     score = full_eval(board, caller=caller)
     return score if board.white_to_move else -score
 
-def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -> float:
+def Negamax(board: Board, depth: int, alpha: int, beta: int, ply: int = 0) -> int:
     if _Search_Should_Stop():
         return Evaluate_Node(board)
 
@@ -1304,11 +1264,11 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
     if board.Is_Threefold_Repetition() or board.Is_Fifty_Move_Rule():
         t1 = time.perf_counter()
         ctx.minimax_time += t1 - t0
-        return 0.0
+        return 0
 
     alpha_orig = alpha
     key = board.Hash_Board()
-    entry, alpha, beta, tt_score = _Probe_TT(key, depth, alpha, beta, ply)
+    tt_move, alpha, beta, tt_score = _Probe_TT(key, depth, alpha, beta, ply)
     if tt_score is not None:
         t1 = time.perf_counter()
         ctx.minimax_time += t1 - t0
@@ -1318,22 +1278,20 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
         score = Quiescence_Search(board, alpha, beta, ply)
         t1 = time.perf_counter()
         ctx.minimax_time += t1 - t0
-        return score if score is not None else 0.0
+        return score if score is not None else 0
 
     node_in_check = board.Is_King_In_Check(board.white_to_move)
     if node_in_check and ply < 15:
         depth += 1
 
-    legal_moves = board.Generate_Legal_Moves()
-    if not legal_moves:
+    picker = Pick_Moves(board, depth, ply, tt_move, node_in_check)
+    first_move = next(picker, MOVE_NONE)
+    if first_move == MOVE_NONE:
         score = Terminal_Score(board, ply)
         t1 = time.perf_counter()
         ctx.minimax_time += t1 - t0
         return score
 
-    tt_move = entry.move if entry is not None else None
-    Order_Moves(board, legal_moves, depth, tt_move=tt_move)
-
     if ENABLE_NULL_MOVE_PRUNING and depth >= 4 and not node_in_check and Has_Non_Pawn_Material(board, board.white_to_move):
         reduction = 2
         board.Make_Null_Move()
@@ -1346,15 +1304,16 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
             ctx.minimax_time += t1 - t0
             return beta
 
-    best_move = None
-    best_score = float('-inf')
-
-    for move_index, move in enumerate(legal_moves):
-        if not board.Make_Move(move):
-            continue
+    best_move = MOVE_NONE
+    best_score = -INFINITE_SCORE
 
-        is_quiet = not move.piece_captured and not move.is_pawn_promotion
-        gives_check = move.gives_check
+    move_index = 0
+    for move in itertools.chain((first_move,), picker):
+        is_quiet = move >> 14 != MOVE_PROMOTION and board.Move_Captured_Piece(move) is None
+        # Only late quiet moves are ever pruned or reduced, so only they need the check test.
+        gives_check = False
+        if is_quiet and depth >= 3 and move_index >= 2 and not node_in_check:
+            gives_check = board.Move_Gives_Check(move)
 
         if (
             ENABLE_LATE_MOVE_PRUNING
@@ -1366,7 +1325,11 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
             and alpha > -MATE_TT_THRESHOLD
             and best_score > -MATE_TT_THRESHOLD
         ):
-            board.Undo_Move()
+            move_index += 1
+            continue
+
+        if not board.Make_Move_If_Legal(move):
+            ctx.illegal_moves_rejected += 1
             continue
 
         lmr_reduction = 0
@@ -1400,6 +1363,7 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
                     score = -Negamax(board, depth - 1, -beta, -alpha, ply + 1)
 
         board.Undo_Move()
+        move_index += 1
 
         if score > best_score:
             best_score = score
@@ -1410,31 +1374,35 @@ def Negamax(board: Board, depth: int, alpha: float, beta: float, ply: int = 0) -
 
         if alpha >= beta:
             if is_quiet:
-                if depth not in ctx.killer_moves:
-                    ctx.killer_moves[depth] = []
-                if move not in ctx.killer_moves[depth]:
-                    ctx.killer_moves[depth].append(move)
-                    if len(ctx.killer_moves[depth]) > 2:
-                        ctx.killer_moves[depth].pop(0)
-
-                key_history = (move.start, move.end)
-                ctx.history_heuristic[key_history] = ctx.history_heuristic.get(key_history, 0) + (depth * depth)
+                killers = ctx.killer_moves.setdefault(depth, [])
+                if move not in killers:
+                    killers.append(move)
+                    if len(killers) > 2:
+                        killers.pop(0)
+
+                ctx.history_heuristic[move & 4095] += depth * depth
             break
 
+    if best_score == -INFINITE_SCORE:
+        score = Terminal_Score(board, ply)
+        t1 = time.perf_counter()
+        ctx.minimax_time += t1 - t0
+        return score
+
     if best_score <= alpha_orig:
-        flag = 'UPPER'
+        bound = BOUND_UPPER
     elif best_score >= beta:
-        flag = 'LOWER'
+        bound = BOUND_LOWER
     else:
-        flag = 'EXACT'
+        bound = BOUND_EXACT
         
-    _Store_TT_Entry(key, depth, best_score, flag, best_move, ply)
+    _Store_TT_Entry(key, depth, best_score, bound, best_move, ply)
 
     t1 = time.perf_counter()
     ctx.minimax_time += t1 - t0
     return best_score
 
-def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> float:
+def Quiescence_Search(board: Board, alpha: int, beta: int, ply: int) -> int:
     if _Search_Should_Stop():
         return Evaluate_Node(board, caller="qsearch")
 
@@ -1445,7 +1413,7 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
     if board.Is_Threefold_Repetition() or board.Is_Fifty_Move_Rule():
         t1 = time.perf_counter()
         ctx.quiescence_time += t1 - t0
-        return 0.0
+        return 0
 
     qratio = _Current_QRatio()
     qnode_budget = min(50000, max(6000, ctx.nodes_searched * 4))
@@ -1464,11 +1432,7 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
     in_check = board.Is_King_In_Check(board.white_to_move)
     if in_check:
         stand_pat = None
-        noisy_moves = board.Generate_Legal_Moves(include_castling=False)
-        if not noisy_moves:
-            t1 = time.perf_counter()
-            ctx.quiescence_time += t1 - t0
-            return Terminal_Score(board, ply)
+        noisy_moves = board.Generate_Evasion_Codes(_Move_Buffer(ply))
     else:
         stand_pat = static_eval(board, caller="qsearch")
         if not board.white_to_move:
@@ -1486,10 +1450,11 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
             ctx.quiescence_time += t1 - t0
             return stand_pat
 
-        noisy_moves = board.Generate_Legal_Capture_Moves()
+        noisy_moves = board.Generate_Pseudo_Legal_Codes(_Move_Buffer(ply), GENERATE_NOISY, False)
 
     Order_Quiescence_Moves(board, noisy_moves)
 
+    has_legal_move = False
     for move in noisy_moves:
         if not in_check:
             ctx.qsearch_noisy_considered += 1
@@ -1498,9 +1463,9 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
                 ctx.qsearch_noisy_rejected += 1
                 continue
 
-            captured_val = ABS_PIECE_VALUES.get(move.piece_captured or "", 0)
-            promotion_gain = 775 if move.is_pawn_promotion else 0
-            delta_margin = _Quiescence_Delta_Margin(move, qratio)
+            captured_val = ABS_PIECE_VALUES.get(board.Move_Captured_Piece(move) or "", 0)
+            promotion_gain = 775 if move >> 14 == MOVE_PROMOTION else 0
+            delta_margin = _Quiescence_Delta_Margin(board, move, qratio)
             if risky_capture:
                 delta_margin = max(0, delta_margin - 20)
             if alpha < (MATE_SCORE - 500) and stand_pat + captured_val + promotion_gain + delta_margin < alpha:
@@ -1509,10 +1474,12 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
         else:
             ctx.qsearch_noisy_considered += 1
 
-        if not board.Make_Move(move):
+        if not board.Make_Move_If_Legal(move):
+            ctx.illegal_moves_rejected += 1
             ctx.qsearch_noisy_rejected += 1
             continue
         ctx.qsearch_noisy_accepted += 1
+        has_legal_move = True
 
         score = -Quiescence_Search(board, -beta, -alpha, ply + 1)
         board.Undo_Move()
@@ -1524,101 +1491,80 @@ def Quiescence_Search(board: Board, alpha: float, beta: float, ply: int) -> floa
         if score > alpha:
             alpha = score
 
+    if in_check and not has_legal_move:
+        t1 = time.perf_counter()
+        ctx.quiescence_time += t1 - t0
+        return Terminal_Score(board, ply)
+
     t1 = time.perf_counter()
     ctx.quiescence_time += t1 - t0
     return alpha
 
 def Get_Attackers (board: Board, target_row: int, target_col: int, white: bool):
     "return list of position(row, col piece) that are attacking"
-
-    
     attackers = []
-    for r in range(8):
-        for c in range(8):
-            piece = board.board[r][c]
-            if piece == "." or piece.isupper() != white:
-                continue
-
-            if piece.upper() == 'K' and target_row == r and target_col == c:
-                continue  # King cannot attack king
-    
-
-            if piece.upper() == "P":
-                direction = -1 if piece.isupper() else 1
-                for dx in [-1, 1]:
-                    nr, nc = r + direction, c + dx
-                    if 0 <= nr < 8 and 0 <= nc < 8 and (nr, nc) == (target_row, target_col):
-                        attackers.append((r, c, piece))
-            else:
-                pseudo_moves = []
-                board._Generate_Piece_Moves(piece, r, c, pseudo_moves, include_castling=False, white=white)
-                for m in pseudo_moves:
-                    if m.end == (target_row, target_col):
-                        attackers.append((r, c, piece))
-
+    mailbox = board.mailbox
+    attacker_bits = board._Attackers_To(target_row * 8 + target_col, white, board.occupied)
+    while attacker_bits:
+        bit = attacker_bits & -attacker_bits
+        attacker_bits ^= bit
+        square = bit.bit_length() - 1
+        attackers.append((square >> 3, square & 7, CODE_PIECES[mailbox[SQUARE_TO_MAILBOX[square]]]))
     return attackers
 
-def Static_Exchange_Evaluation (board: Board, move: Move) -> int:
-    temp_board = Board()
-    temp_board.board = [row.copy() for row in board.board]
-    temp_board.white_to_move = board.white_to_move
+SEE_VALUES = {
+    'P': 100, 'N': 300, 'B': 300, 'R': 500, 'Q': 900, 'K': 10000,
+    'p': 100, 'n': 300, 'b': 300, 'r': 500, 'q': 900, 'k': 10000
+}
 
-    value_map = {
-        'P': 100, 'N': 300, 'B': 300, 'R': 500, 'Q': 900, 'K': 10000,
-        'p': 100, 'n': 300, 'b': 300, 'r': 500, 'q': 900, 'k': 10000
-    }
+def Static_Exchange_Evaluation (board: Board, move: int) -> int:
+    captured_piece = board.Move_Captured_Piece(move)
+    if not captured_piece:
+        return 0
 
-    def see_recursive(square, attackers_w, attackers_b, side, gain_stack):
-        global SEE_TIME
-        import time 
-        t0 = time.perf_counter()
-        attackers = attackers_w if side else attackers_b
+    t0 = time.perf_counter()
+    bitboards = board.bitboards
+    target_square = (move >> 6) & 63
+    occupied = board.occupied ^ SQUARE_BITS[move & 63]
+    if move >> 14 == MOVE_EN_PASSANT:
+        occupied ^= SQUARE_BITS[target_square + (8 if board.white_to_move else -8)]
+
+    # Swap list: each entry is the material balance if the exchange stops after that capture.
+    gains = [SEE_VALUES[captured_piece]]
+    piece_on_square = board.Move_Moved_Piece(move)
+    side_white = not board.white_to_move
+    while True:
+        attackers = board._Attackers_To(target_square, side_white, occupied) & occupied
         if not attackers:
-            t1 = time.perf_counter()
-            SEE_TIME += t1 - t0
-            return gain_stack[-1] if gain_stack else 0
-
-        attacker = min(attackers, key=lambda x: value_map.get(x[2], 10000))
-        attackers.remove(attacker)
-
-        capturing_piece_value = value_map.get(temp_board.board[square[0]][square[1]], 0)
-        gain = value_map.get(attacker[2], 0) - capturing_piece_value
-        gain_stack.append(gain_stack[-1] - gain if gain_stack else -gain)
-
-        # 🔥 Limit SEE recursion depth to prevent infinite recursion
-        if len(gain_stack) > 4:
-            t1 = time.perf_counter()
-            SEE_TIME += t1 - t0
-            return gain_stack[-1]
-
-        temp_board.board[attacker[0]][attacker[1]] = "."
-        temp_board.board[square[0]][square[1]] = attacker[2]
-
-        new_attackers = Get_Attackers(temp_board, *square, white=side)
-        t1 = time.perf_counter()
-        SEE_TIME += t1 - t0
-        return max(-see_recursive(square, attackers_b, new_attackers, not side, gain_stack), gain_stack[-1])
+            break
+        base = 0 if side_white else 6
+        for offset in range(6):
+            candidates = attackers & bitboards[base + offset]
+            if candidates:
+                break
+        gains.append(SEE_VALUES[piece_on_square] - gains[-1])
+        piece_on_square = PIECE_ORDER[base + offset]
+        occupied ^= candidates & -candidates
+        side_white = not side_white
 
-    if not move.piece_captured:
-        return 0
-    
-    target_square = move.end
-    attackers_white = Get_Attackers(temp_board, *target_square, white = True)
-    attackers_black = Get_Attackers(temp_board, *target_square, white = False)
+    while len(gains) > 1:
+        last = gains.pop()
+        gains[-1] = -max(-gains[-1], last)
 
-    return see_recursive(target_square, attackers_white, attackers_black, board.white_to_move, [])
+    ctx.see_time += time.perf_counter() - t0
+    return gains[0]
 
 
-def Score_Move (board: Board, move: Move, depth: int = 0) -> int:
-    if move.piece_captured or move.is_pawn_promotion:
-        return _Capture_Order_Score(move)
+def Score_Move (board: Board, move: int, depth: int = 0) -> int:
+    if move >> 14 == MOVE_PROMOTION or board.Move_Captured_Piece(move):
+        return _Capture_Order_Score(board, move)
     
-    if depth in ctx.killer_moves and move in ctx.killer_moves[depth]:
-        index = ctx.killer_moves[depth].index(move)
-        return 9000 - (index * 400) + (CHECK_MOVE_BONUS if move.gives_check else 0)
+    check_bonus = CHECK_MOVE_BONUS if board.Move_Gives_Check(move) else 0
+    killers = ctx.killer_moves.get(depth)
+    if killers and move in killers:
+        return 9000 - (killers.index(move) * 400) + check_bonus
     
-    key = (move.start, move.end)
-    return 4000 + ctx.history_heuristic.get(key, 0) + (CHECK_MOVE_BONUS if move.gives_check else 0)
+    return 4000 + ctx.history_heuristic[move & 4095] + check_bonus
 
 
 def Find_Best_Move(
@@ -1626,8 +1572,40 @@ def Find_Best_Move(
     max_depth: int,
     time_limit: float = None,
     stop_checker: Callable[[], bool] | None = None,
-    info_callback: Callable[[int, float, list[str], float], None] | None = None,
+    info_callback: Callable[[int, int, list[str], float], None] | None = None,
+    workers: int = 1,
+    split_root: bool = False,
+    all_lines: bool = False,
 ) -> Move:
+    """Iterative deepening search from board.
+
+    With workers > 1 the search runs Lazy SMP over a shared transposition table.
+    split_root instead farms root moves out to a pool of that many processes, and
+    all_lines does the same but scores every root move exactly (see root_lines in
+    Get_Search_Stats).
+    """
+    if split_root or all_lines:
+        best_code = _Root_Split_Search(board, max_depth, time_limit, stop_checker, info_callback, workers, all_lines)
+    elif workers > 1:
+        best_code = _Lazy_SMP_Search(board, max_depth, time_limit, stop_checker, info_callback, workers)
+    else:
+        best_code = _Iterative_Deepening(board, max_depth, time_limit, stop_checker, info_callback)
+    if best_code is None:
+        return None
+
+    best_move = board.Move_From_Code(best_code) if best_code else None
+    _Print_Search_Stats(board, best_move)
+    return best_move
+
+
+def _Iterative_Deepening(
+    board: Board,
+    max_depth: int,
+    time_limit: float | None,
+    stop_checker: Callable[[], bool] | None,
+    info_callback: Callable[[int, int, list[str], float], None] | None,
+) -> int | None:
+    """Searches the root to max_depth; returns the best move code, or None if the game is over."""
     start_time = time.perf_counter()
     Reset_Search_Stats()
     ctx.tt_generation = (ctx.tt_generation + 1) % 1024
@@ -1637,7 +1615,7 @@ def Find_Best_Move(
     guess = Evaluate_Node(board)
     window_size = 60
 
-    completed_best_move = None
+    completed_best_move = MOVE_NONE
     completed_score = guess
     completed_pv = []
     completed_depth = 0
@@ -1649,22 +1627,27 @@ def Find_Best_Move(
             return True
         return False
 
-    def search_root_window(depth: int, alpha: float, beta: float) -> tuple[Move | None, float, bool]:
-        legal_moves = board.Generate_Legal_Moves()
+    def search_root_window(depth: int, alpha: int, beta: int) -> tuple[int, int, bool]:
+        legal_moves = board.Generate_Legal_Move_Codes(_Move_Buffer(0))
         if not legal_moves:
-            return None, Terminal_Score(board, 0), True
+            return MOVE_NONE, Terminal_Score(board, 0), True
 
-        root_entry = ctx.transposition_table.get(board.Hash_Board())
-        tt_move = root_entry.move if root_entry is not None else None
+        root_entry = ctx.transposition_table.Probe(board.Hash_Board())
+        tt_move = root_entry[3] if root_entry is not None else MOVE_NONE
         Order_Moves(board, legal_moves, depth, tt_move=tt_move)
         _Prioritize_Root_Move(legal_moves, ctx.root_pv_move)
+        if ctx.smp_helper_index and len(legal_moves) > 2:
+            # Lazy SMP helpers rotate everything behind the first move so they explore
+            # the tree in a different order and fill the shared table with other lines.
+            shift = ctx.smp_helper_index % (len(legal_moves) - 1)
+            legal_moves[1:] = legal_moves[1 + shift:] + legal_moves[1:1 + shift]
 
-        best_score = float('-inf')
-        best_move = None
+        best_score = -INFINITE_SCORE
+        best_move = MOVE_NONE
 
         for move_index, move in enumerate(legal_moves):
             if root_should_stop():
-                return None, best_score, False
+                return MOVE_NONE, best_score, False
 
             if not board.Make_Move(move):
                 continue
@@ -1678,7 +1661,7 @@ def Find_Best_Move(
             board.Undo_Move()
 
             if root_should_stop():
-                return None, best_score, False
+                return MOVE_NONE, best_score, False
 
             if score > best_score:
                 best_score = score
@@ -1692,20 +1675,23 @@ def Find_Best_Move(
 
         return best_move, best_score, True
 
+    helper_index = ctx.smp_helper_index
     for current_depth in range(1, max_depth + 1):
         if root_should_stop():
             break
+        if helper_index and 1 < current_depth < max_depth and (current_depth + helper_index) % 2 == 0:
+            continue
 
         if current_depth == 1:
-            alpha = float('-inf')
-            beta = float('inf')
+            alpha = -INFINITE_SCORE
+            beta = INFINITE_SCORE
         else:
             alpha = guess - window_size
             beta = guess + window_size
 
         window = window_size
-        iteration_best_move = None
-        iteration_best_score = float('-inf')
+        iteration_best_move = MOVE_NONE
+        iteration_best_score = -INFINITE_SCORE
         iteration_complete = False
 
         while True:
@@ -1716,7 +1702,7 @@ def Find_Best_Move(
             if not completed:
                 break
 
-            if best_move is None:
+            if best_move == MOVE_NONE:
                 elapsed = time.perf_counter() - start_time
                 ctx.total_time_taken = elapsed
                 ctx.last_search_depth = 0
@@ -1734,8 +1720,8 @@ def Find_Best_Move(
                 ctx.aspiration_window_expansions += 1
                 window *= 2
                 if window >= 4000:
-                    alpha = float('-inf')
-                    beta = float('inf')
+                    alpha = -INFINITE_SCORE
+                    beta = INFINITE_SCORE
                 else:
                     alpha = guess - window
                     beta = guess + window
@@ -1744,8 +1730,8 @@ def Find_Best_Move(
                 ctx.aspiration_window_expansions += 1
                 window *= 2
                 if window >= 4000:
-                    alpha = float('-inf')
-                    beta = float('inf')
+                    alpha = -INFINITE_SCORE
+                    beta = INFINITE_SCORE
                 else:
                     alpha = guess - window
                     beta = guess + window
@@ -1761,15 +1747,15 @@ def Find_Best_Move(
         completed_score = iteration_best_score
         completed_depth = current_depth
         completed_pv = _Extract_PV(board, current_depth)
-        if completed_best_move is not None:
-            root_uci = completed_best_move.To_UCI()
+        if completed_best_move != MOVE_NONE:
+            root_uci = Move_Code_To_UCI(completed_best_move)
             if not completed_pv or completed_pv[0] != root_uci:
                 completed_pv = [root_uci] + completed_pv
         ctx.root_pv_move = completed_best_move
         ctx.last_search_depth = completed_depth
         ctx.last_root_score = completed_score
         ctx.last_pv = completed_pv
-        ctx.last_best_move_uci = completed_best_move.To_UCI() if completed_best_move else "0000"
+        ctx.last_best_move_uci = Move_Code_To_UCI(completed_best_move) if completed_best_move else "0000"
         window_size = 50 if abs(completed_score) < MATE_TT_THRESHOLD else 200
 
         if info_callback:
@@ -1780,13 +1766,370 @@ def Find_Best_Move(
     ctx.last_search_depth = completed_depth
     ctx.last_root_score = completed_score
     ctx.last_pv = completed_pv
-    ctx.last_best_move_uci = completed_best_move.To_UCI() if completed_best_move else "0000"
+    ctx.last_best_move_uci = Move_Code_To_UCI(completed_best_move) if completed_best_move else "0000"
     ctx.search_deadline = None
     ctx.stop_checker = None
+    return completed_best_move
+
+
+def _Open_Search_Segment(table: TranspositionTable) -> TranspositionTable:
+    """Copy a private table into a fresh shared memory segment for the helpers to map."""
+    # A segment of this name can only be a leftover from a crashed process that had
+    # the same pid; remove it rather than adopting a table of some other size.
+    shared_name = f"chessbot_tt_{os.getpid()}"
+    Remove_Shared_Table(shared_name)
+    shared = TranspositionTable(table.size_mb, shared_name=shared_name)
+    shared.words[:] = table.words
+    return shared
+
+
+def _Init_Search_Worker(shared_table: bool, stop_flag):
+    global LOGGING_ENABLED, VERBOSE_SEARCH
+    LOGGING_ENABLED = False
+    VERBOSE_SEARCH = False
+    ctx.search_pool = None
+    ctx.smp_owned_table = None
+    ctx.search_stop_flag = stop_flag
+    if shared_table:
+        # Lazy SMP helpers map the search's table per task; the private one is unused.
+        ctx.transposition_table.Close()
+    else:
+        ctx.transposition_table.Resize(ROOT_SPLIT_TABLE_MB)
+
+
+def _Search_Worker_Pool(helpers: int, shared_table: bool = True) -> ProcessPoolExecutor:
+    pool_key = (helpers, shared_table)
+    if ctx.search_pool is None or ctx.search_pool_key != pool_key:
+        Shutdown_Search_Workers()
+        # Spawned, not forked: the UCI loop searches on a thread while the main thread
+        # holds stdin, and a forked child would inherit that lock already taken.
+        mp_context = multiprocessing.get_context("spawn")
+        ctx.search_stop_flag = mp_context.RawValue('b', 0)
+        ctx.search_pool = ProcessPoolExecutor(
+            max_workers=helpers,
+            mp_context=mp_context,
+            initializer=_Init_Search_Worker,
+            initargs=(shared_table, ctx.search_stop_flag),
+        )
+        ctx.search_pool_key = pool_key
+    return ctx.search_pool
+
+
+def _Lazy_SMP_Helper(
+    table_path: str | None,
+    shared_name: str | None,
+    position: bytes,
+    position_history: dict,
+    max_depth: int,
+    time_limit: float | None,
+    generation: int,
+    helper_index: int,
+    eval_mode: str,
+) -> tuple[int, int, int, list[str], int, int, int, int]:
+    board = Board.From_Bytes(position)
+    board.position_history = position_history
+    Set_Eval_Mode(eval_mode)
+    ctx.tt_generation = generation - 1
+    ctx.smp_helper_index = helper_index
+    stop_flag = ctx.search_stop_flag
+    if table_path is not None:
+        ctx.transposition_table = TranspositionTable(TT_MIN_MB, path=table_path)
+    else:
+        ctx.transposition_table = TranspositionTable.Attach(shared_name)
+    try:
+        # Helpers never go past the requested depth, so a fixed-depth search reports that depth.
+        _Iterative_Deepening(board, max_depth, time_limit, lambda: stop_flag.value != 0, None)
+    finally:
+        ctx.transposition_table.Close()
+    return (
+        ctx.last_search_depth,
+        ctx.last_root_score,
+        ctx.root_pv_move,
+        ctx.last_pv,
+        ctx.nodes_searched,
+        ctx.quiescence_nodes,
+        ctx.max_seldepth,
+        os.getpid(),
+    )
+
 
-    _Print_Search_Stats(board, completed_best_move)
+def _Lazy_SMP_Search(
+    board: Board,
+    max_depth: int,
+    time_limit: float | None,
+    stop_checker: Callable[[], bool] | None,
+    info_callback: Callable[[int, int, list[str], float], None] | None,
+    workers: int,
+) -> int | None:
+    start_time = time.perf_counter()
+    pool = _Search_Worker_Pool(workers - 1)
+    stop_flag = ctx.search_stop_flag
+    stop_flag.value = 0
+    generation = (ctx.tt_generation + 1) % 1024
+    position = board.To_Bytes()
+    history = dict(board.position_history)
+
+    # Helpers need a table they can map. A private table is copied into a shared
+    # segment for this search only and copied back, with its new entries, afterwards.
+    private_table = None
+    search_table = ctx.transposition_table
+    if not search_table.persistent:
+        private_table = search_table
+        search_table = _Open_Search_Segment(private_table)
+        ctx.transposition_table = search_table
+        ctx.smp_owned_table = search_table
+
+    results = []
+    try:
+        futures = [
+            pool.submit(
+                _Lazy_SMP_Helper,
+                search_table.path,
+                search_table.shared_name,
+                position,
+                history,
+                max_depth,
+                time_limit,
+                generation,
+                index,
+                EVAL_MODE,
+            )
+            for index in range(1, workers)
+        ]
+        try:
+            best_code = _Iterative_Deepening(board, max_depth, time_limit, stop_checker, info_callback)
+        finally:
+            stop_flag.value = 1
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                ctx.search_pool_key = None
+    finally:
+        if private_table is not None:
+            private_table.words[:] = search_table.words
+            ctx.transposition_table = private_table
+            ctx.smp_owned_table = None
+            search_table.Unlink()
+    ctx.search_workers = workers
+    ctx.total_time_taken = time.perf_counter() - start_time
+    if best_code is None:
+        return None
+
+    deepest = None
+    for result in results:
+        depth, score, move, pv, nodes, qnodes, seldepth, pid = result
+        _Record_Worker_Nodes(pid, nodes, qnodes)
+        ctx.max_seldepth = max(ctx.max_seldepth, seldepth)
+        if move != MOVE_NONE and ctx.last_search_depth < depth <= max_depth and (deepest is None or depth > deepest[0]):
+            deepest = result
+
+    if deepest is not None:
+        depth, score, move, pv = deepest[:4]
+        best_code = move
+        ctx.root_pv_move = move
+        ctx.last_search_depth = depth
+        ctx.last_root_score = score
+        ctx.last_pv = pv
+        ctx.last_best_move_uci = Move_Code_To_UCI(move)
+        if info_callback:
+            info_callback(depth, score, pv, ctx.total_time_taken)
+    return best_code
+
+
+def _Root_Split_Unit(
+    position: bytes,
+    position_history: dict,
+    move: int,
+    depth: int,
+    alpha: int,
+    beta: int,
+    eval_mode: str,
+) -> tuple[int, int, bool, list[str], int, int, int, int]:
+    # Every unit starts from an empty table and fresh heuristics, so its result does
+    # not depend on which worker ran it or what that worker searched before.
+    board = Board.From_Bytes(position)
+    board.position_history = position_history
+    Set_Eval_Mode(eval_mode)
+    Reset_Search_Stats()
+    ctx.transposition_table.Clear()
+    stop_flag = ctx.search_stop_flag
+    ctx.stop_checker = lambda: stop_flag.value != 0
+
+    board.Make_Move(move)
+    score = 0
+    for child_depth in range(depth):
+        score = -Negamax(board, child_depth, -beta, -alpha, 1)
+    completed = not _Search_Should_Stop()
+    pv = [Move_Code_To_UCI(move)] + _Extract_PV(board, depth - 1)
+    ctx.stop_checker = None
+    return move, score, completed, pv, ctx.nodes_searched, ctx.quiescence_nodes, ctx.max_seldepth, os.getpid()
+
+
+def _Run_Root_Units(
+    pool: ProcessPoolExecutor,
+    position: bytes,
+    history: dict,
+    units: list[tuple[int, int, int, int]],
+) -> dict[int, tuple[int, list[str]]] | None:
+    """Scores (move, depth, alpha, beta) units on the pool; None if the search was stopped."""
+    futures = [pool.submit(_Root_Split_Unit, position, history, *unit, EVAL_MODE) for unit in units]
+    results = {}
+    stopped = False
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=ROOT_SPLIT_POLL_SECONDS, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.cancelled():
+                continue
+            move, score, completed, pv, nodes, qnodes, seldepth, pid = future.result()
+            _Record_Worker_Nodes(pid, nodes, qnodes)
+            ctx.max_seldepth = max(ctx.max_seldepth, seldepth)
+            if completed:
+                results[move] = (score, pv)
+        if not stopped and _Search_Should_Stop():
+            stopped = True
+            ctx.search_stop_flag.value = 1
+            for future in pending:
+                future.cancel()
+    return None if stopped or len(results) < len(units) else results
+
+
+def _Search_Root_Lines(
+    board: Board,
+    pool: ProcessPoolExecutor,
+    moves: list[int],
+    depth: int,
+    all_lines: bool,
+) -> list[tuple[int, int, list[str]]] | None:
+    position = board.To_Bytes()
+    history = dict(board.position_history)
+    if all_lines:
+        results = _Run_Root_Units(pool, position, history, [(move, depth, -INFINITE_SCORE, INFINITE_SCORE) for move in moves])
+        if results is None:
+            return None
+        return [(move, *results[move]) for move in moves]
+
+    # The first move gets a full window here; the rest only have to prove they
+    # beat it, and those that fail high are re-searched for an exact score.
+    first = moves[0]
+    board.Make_Move(first)
+    score = -Negamax(board, depth - 1, -INFINITE_SCORE, INFINITE_SCORE, 1)
+    first_pv = [Move_Code_To_UCI(first)] + _Extract_PV(board, depth - 1)
+    board.Undo_Move()
+    if _Search_Should_Stop():
+        return None
+    alpha = score
+    lines = {first: (score, first_pv)}
+
+    rest = moves[1:]
+    if rest:
+        results = _Run_Root_Units(pool, position, history, [(move, depth, alpha, alpha + 1) for move in rest])
+        if results is None:
+            return None
+        fail_highs = [move for move in rest if results[move][0] > alpha]
+        if fail_highs:
+            rescored = _Run_Root_Units(pool, position, history, [(move, depth, alpha, INFINITE_SCORE) for move in fail_highs])
+            if rescored is None:
+                return None
+            results.update(rescored)
+        lines.update(results)
+    return [(move, *lines[move]) for move in moves]
+
+
+def _Root_Split_Search(
+    board: Board,
+    max_depth: int,
+    time_limit: float | None,
+    stop_checker: Callable[[], bool] | None,
+    info_callback: Callable[[int, int, list[str], float], None] | None,
+    workers: int,
+    all_lines: bool,
+) -> int | None:
+    start_time = time.perf_counter()
+    Reset_Search_Stats()
+    ctx.tt_generation = (ctx.tt_generation + 1) % 1024
+    ctx.stop_checker = stop_checker
+    ctx.search_deadline = (start_time + time_limit) if time_limit else None
+    ctx.search_workers = max(1, workers)
+
+    completed_best_move = MOVE_NONE
+    completed_score = 0
+    completed_pv = []
+    completed_depth = 0
+
+    if not board.Has_Legal_Move():
+        ctx.total_time_taken = time.perf_counter() - start_time
+        ctx.last_root_score = Terminal_Score(board, 0)
+        ctx.search_deadline = None
+        ctx.stop_checker = None
+        return None
+
+    pool = _Search_Worker_Pool(ctx.search_workers, shared_table=False)
+    ctx.search_stop_flag.value = 0
+    try:
+        for current_depth in range(1, max_depth + 1):
+            if _Search_Should_Stop():
+                break
+
+            legal_moves = board.Generate_Legal_Move_Codes(_Move_Buffer(0))
+            root_entry = ctx.transposition_table.Probe(board.Hash_Board())
+            Order_Moves(board, legal_moves, current_depth, tt_move=root_entry[3] if root_entry is not None else MOVE_NONE)
+            _Prioritize_Root_Move(legal_moves, ctx.root_pv_move)
+
+            lines = _Search_Root_Lines(board, pool, list(legal_moves), current_depth, all_lines)
+            if lines is None:
+                break
+
+            best_move, best_score, best_pv = max(lines, key=lambda line: line[1])
+            _Store_TT_Entry(board.Hash_Board(), current_depth, best_score, BOUND_EXACT, best_move, 0)
+            if all_lines:
+                ranked = sorted(lines, key=lambda line: -line[1])
+                ctx.root_lines = [(Move_Code_To_UCI(move), score) for move, score, _ in ranked]
+
+            completed_best_move = best_move
+            completed_score = best_score
+            completed_pv = best_pv
+            completed_depth = current_depth
+            ctx.root_pv_move = best_move
+            ctx.last_search_depth = completed_depth
+            ctx.last_root_score = completed_score
+            ctx.last_pv = completed_pv
+            ctx.last_best_move_uci = Move_Code_To_UCI(best_move)
+
+            if info_callback:
+                info_callback(current_depth, completed_score, completed_pv, time.perf_counter() - start_time)
+    except BrokenProcessPool:
+        ctx.search_pool_key = None
+    finally:
+        ctx.search_stop_flag.value = 1
+
+    ctx.total_time_taken = time.perf_counter() - start_time
+    ctx.last_search_depth = completed_depth
+    ctx.last_root_score = completed_score
+    ctx.last_pv = completed_pv
+    ctx.last_best_move_uci = Move_Code_To_UCI(completed_best_move) if completed_best_move else "0000"
+    ctx.search_deadline = None
+    ctx.stop_checker = None
     return completed_best_move
 
+
+def Shutdown_Search_Workers():
+    if ctx.search_pool is not None:
+        ctx.search_pool.shutdown(wait=True, cancel_futures=True)
+    ctx.search_pool = None
+    ctx.search_pool_key = None
+
+
+def _Release_Search_Resources():
+    Shutdown_Search_Workers()
+    if ctx.smp_owned_table is not None:
+        ctx.smp_owned_table.Unlink()
+        ctx.smp_owned_table = None
+
+
+atexit.register(_Release_Search_Resources)
+
 def Toggle_Logging(enabled: bool):
     global LOGGING_ENABLED
     LOGGING_ENABLED = bool(enabled)
@@ -1796,9 +2139,42 @@ def Toggle_Detailed_Log(enabled: bool):
     global DETAILED_LOG_ENABLED
     DETAILED_LOG_ENABLED = bool(enabled)
 
-def Clear_Transposition_Table():
-    ctx.transposition_table.clear()
-    ctx.eval_cache.clear()
+def Set_Hash_Size(size_mb: int):
+    ctx.transposition_table.Resize(size_mb)
+
+
+def _Replace_Transposition_Table(table: TranspositionTable):
+    ctx.transposition_table.Close()
+    ctx.transposition_table = table
+
+
+def Set_Eval_Cache_Size(size_bytes: int):
+    ctx.eval_cache.Resize(size_bytes)
+
+
+def Use_Hash_File(path: str, size_mb: int = TT_DEFAULT_MB):
+    """Back the transposition table with an mmap'd file, reusing its entries if it already exists."""
+    _Replace_Transposition_Table(TranspositionTable(size_mb, path=path))
+
+
+def Use_Shared_Hash(name: str, size_mb: int = TT_DEFAULT_MB):
+    """Back the transposition table with a named shared memory segment, attaching if it exists."""
+    _Replace_Transposition_Table(TranspositionTable(size_mb, shared_name=name))
+
+
+def Save_Hash(path: str):
+    ctx.transposition_table.Save(path)
+
+
+def Load_Hash(path: str) -> bool:
+    return ctx.transposition_table.Load(path)
+
+
+def Clear_Transposition_Table(keep_persistent: bool = False):
+    if not (keep_persistent and ctx.transposition_table.persistent):
+        ctx.transposition_table.Clear()
+    ctx.eval_cache.Clear()
+    LEGAL_MOVE_CACHE.Clear()
 
 
 def _Print_Search_Stats(board: Board, best_move: Move | None):
@@ -1846,7 +2222,8 @@ def _Print_Search_Stats(board: Board, best_move: Move | None):
         f"tt_cutoffs={ctx.transposition_cutoffs} hashfull={Get_Hashfull_Permill()} "
         f"eval_calls={ctx.total_eval_calls} static_eval_calls={ctx.static_eval_calls} full_eval_calls={ctx.full_eval_calls} "
         f"qsearch_eval_calls={ctx.qsearch_eval_calls} main_eval_calls={ctx.main_search_eval_calls} "
-        f"avg_eval_us={stats['avg_eval_time_us']:.1f} "
+        f"avg_eval_us={stats['avg_eval_time_us']:.1f} eval_cache_hit_rate={stats['eval_cache_hit_rate']:.2f} "
+        f"eval_cache_collisions={stats['eval_cache_collisions']} eval_cache_fill={stats['eval_cache_fill_permille']} "
         f"lmr_candidates={ctx.lmr_candidates} lmr_applied={ctx.lmr_applied} lmr_researches={ctx.lmr_researches} "
         f"qsearch_noisy_considered={ctx.qsearch_noisy_considered} qsearch_noisy_accepted={ctx.qsearch_noisy_accepted} "
         f"qsearch_noisy_rejected={ctx.qsearch_noisy_rejected} "
@@ -43,8 +43,7 @@ def _make_engine_move(board: Board, cfg: SearchConfig):
 
 
 def _game_outcome(board: Board) -> str:
-    legal = board.Generate_Legal_Moves()
-    if legal:
+    if board.Has_Legal_Move():
         return "ongoing"
     if board.Is_King_In_Check(board.white_to_move):
         return "black" if board.white_to_move else "white"
@@ -81,8 +80,7 @@ def _play_game(
         if move is None:
             return _game_outcome(board), white_m, black_m
 
-        legal_moves = board.Generate_Legal_Moves()
-        if not any(m == move or m.To_UCI() == move.To_UCI() for m in legal_moves):
+        if not board.Is_Legal(move):
             return "draw", white_m, black_m
 
         stats = Engine.Get_Search_Stats()
@@ -2,6 +2,8 @@ import json
 from dataclasses import dataclass
 from typing import Protocol, runtime_checkable
 
+from Bitboards import Iter_Bits
+
 
 PIECE_ORDER = ("P", "N", "B", "R", "Q", "K", "p", "n", "b", "r", "q", "k")
 PIECE_INDEX = {piece: index for index, piece in enumerate(PIECE_ORDER)}
@@ -99,10 +101,6 @@ class EvalBackend(Protocol):
         ...
 
 
-def _square_index(row: int, col: int) -> int:
-    return row * 8 + col
-
-
 def _king_activity(square_index: int, white: bool) -> float:
     if square_index < 0:
         return 0.0
@@ -121,19 +119,20 @@ def extract_features_from_board(board) -> FeatureVector:
     white_king_square = -1
     black_king_square = -1
 
-    for row, board_row in enumerate(board.board):
-        for col, piece in enumerate(board_row):
-            if piece == ".":
-                continue
-            piece_index = PIECE_INDEX[piece]
-            square_index = _square_index(row, col)
-            occupancy[piece_index * 64 + square_index] = 1
-            piece_counts[piece_index] += 1
-            if piece.isupper():
-                white_material += MATERIAL_VALUES[piece]
-            else:
-                black_material += MATERIAL_VALUES[piece]
-            phase += PHASE_WEIGHTS.get(piece.upper(), 0)
+    for piece_index, piece in enumerate(PIECE_ORDER):
+        bitboard = board.bitboards[piece_index]
+        if not bitboard:
+            continue
+        count = bitboard.bit_count()
+        piece_counts[piece_index] = count
+        if piece.isupper():
+            white_material += MATERIAL_VALUES[piece] * count
+        else:
+            black_material += MATERIAL_VALUES[piece] * count
+        phase += PHASE_WEIGHTS.get(piece.upper(), 0) * count
+        base = piece_index * 64
+        for square_index in Iter_Bits(bitboard):
+            occupancy[base + square_index] = 1
             if piece == "K":
                 white_king_square = square_index
             elif piece == "k":
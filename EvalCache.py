@@ -0,0 +1,65 @@
+"""Fixed-size static evaluation cache packed into one array of 64-bit words.
+
+Each slot is a single word: the Zobrist key with its low 16 bits replaced by the
+score (stored with a +32768 offset). The slot is chosen by the low bits of the key
+and verified against the remaining bits, so a probe costs one array read and a new
+position simply overwrites whatever shared its slot. The minimum size keeps at least
+16 index bits, so no key bit is left both unindexed and unverified.
+"""
+
+from array import array
+
+EVAL_CACHE_DEFAULT_BYTES = 2 << 20
+EVAL_CACHE_SLOT_BYTES = 8
+EVAL_CACHE_MIN_BYTES = (1 << 16) * EVAL_CACHE_SLOT_BYTES
+_SCORE_BITS = 0xFFFF
+_KEY_BITS = ~_SCORE_BITS & 0xFFFFFFFFFFFFFFFF
+_SCORE_OFFSET = 32768
+
+
+class EvalCache:
+    def __init__(self, size_bytes: int = EVAL_CACHE_DEFAULT_BYTES):
+        self.Resize(size_bytes)
+
+    def Resize(self, size_bytes: int):
+        slots = 1
+        while slots * 2 * EVAL_CACHE_SLOT_BYTES <= max(EVAL_CACHE_MIN_BYTES, int(size_bytes)):
+            slots <<= 1
+        self.mask = slots - 1
+        self.slots = slots
+        self.size_bytes = slots * EVAL_CACHE_SLOT_BYTES
+        self.words = array('Q', [0]) * slots
+        self.used = 0
+        self.Reset_Stats()
+
+    def Reset_Stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def Clear(self):
+        memoryview(self.words).cast('B')[:] = bytes(self.size_bytes)
+        self.used = 0
+
+    def Probe(self, key: int) -> int | None:
+        word = self.words[key & self.mask]
+        if word and not (word ^ key) & _KEY_BITS:
+            self.hits += 1
+            return (word & _SCORE_BITS) - _SCORE_OFFSET
+        self.misses += 1
+        return None
+
+    def Store(self, key: int, score: int):
+        index = key & self.mask
+        word = self.words[index]
+        if not word:
+            self.used += 1
+        elif (word ^ key) & _KEY_BITS:
+            self.collisions += 1
+        self.words[index] = (key & _KEY_BITS) | (score + _SCORE_OFFSET)
+
+    def Hit_Rate(self) -> float:
+        return self.hits / max(1, self.hits + self.misses)
+
+    def Fill_Permill(self) -> int:
+        return self.used * 1000 // self.slots
@@ -0,0 +1,59 @@
+from Bitboards import PIECE_ORDER
+
+# 10x12 mailbox: the 8x8 board sits inside a two-square sentinel border on the top and
+# bottom and a one-square border on each side, so any knight or slider step from an
+# on-board square lands either on the board or on an OFFBOARD sentinel.
+EMPTY = 0
+OFFBOARD = 255
+PIECE_CODES = {piece: index + 1 for index, piece in enumerate(PIECE_ORDER)}
+CODE_PIECES = ('.',) + tuple(PIECE_ORDER)
+BLACK_CODE_MIN = PIECE_CODES['p']
+
+SQUARE_TO_MAILBOX = tuple(21 + (square >> 3) * 10 + (square & 7) for square in range(64))
+MAILBOX_TO_SQUARE = tuple(
+    ((index // 10 - 2) * 8 + (index % 10 - 1)) if (2 <= index // 10 <= 9 and 1 <= index % 10 <= 8) else -1
+    for index in range(120)
+)
+
+KNIGHT_OFFSETS = (-21, -19, -12, -8, 8, 12, 19, 21)
+KING_OFFSETS = (-11, -10, -9, -1, 1, 9, 10, 11)
+ROOK_OFFSETS = (-10, 10, -1, 1)
+BISHOP_OFFSETS = (-11, -9, 9, 11)
+QUEEN_OFFSETS = ROOK_OFFSETS + BISHOP_OFFSETS
+
+
+def New_Mailbox() -> bytearray:
+    mailbox = bytearray([OFFBOARD]) * 120
+    for index in SQUARE_TO_MAILBOX:
+        mailbox[index] = EMPTY
+    return mailbox
+
+
+def Mailbox_From_Grid(grid: list) -> bytearray:
+    mailbox = New_Mailbox()
+    for row, board_row in enumerate(grid):
+        for col, piece in enumerate(board_row):
+            if piece != '.':
+                mailbox[21 + row * 10 + col] = PIECE_CODES[piece]
+    return mailbox
+
+
+def Mailbox_Placement(mailbox: bytearray) -> str:
+    fen_rows = []
+    for row in range(8):
+        empty = 0
+        out = []
+        base = 21 + row * 10
+        for index in range(base, base + 8):
+            code = mailbox[index]
+            if code == EMPTY:
+                empty += 1
+                continue
+            if empty:
+                out.append(str(empty))
+                empty = 0
+            out.append(CODE_PIECES[code])
+        if empty:
+            out.append(str(empty))
+        fen_rows.append("".join(out))
+    return "/".join(fen_rows)
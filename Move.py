@@ -1,5 +1,45 @@
 from typing import Tuple, Optional
 
+# Moves are packed into 16 bits: from square (6), to square (6), promotion piece (2)
+# and a move-kind flag (2). Zero is never a legal move (a8a8) and marks "no move".
+MOVE_NONE = 0
+MOVE_NORMAL = 0
+MOVE_PROMOTION = 1
+MOVE_EN_PASSANT = 2
+MOVE_CASTLING = 3
+PROMOTION_PIECES = "NBRQ"
+PROMOTION_QUEEN = 3
+PROMOTION_QUEEN_MOVE = (MOVE_PROMOTION << 14) | (PROMOTION_QUEEN << 12)
+SQUARE_NAMES = tuple(chr(ord('a') + (square & 7)) + str(8 - (square >> 3)) for square in range(64))
+
+
+def Encode_Move(from_square: int, to_square: int, flag: int = MOVE_NORMAL, promotion: int = 0) -> int:
+    return from_square | (to_square << 6) | (promotion << 12) | (flag << 14)
+
+
+def Move_From(code: int) -> int:
+    return code & 63
+
+
+def Move_To(code: int) -> int:
+    return (code >> 6) & 63
+
+
+def Move_Flag(code: int) -> int:
+    return code >> 14
+
+
+def Move_Promotion_Piece(code: int) -> str:
+    return PROMOTION_PIECES[(code >> 12) & 3]
+
+
+def Move_Code_To_UCI(code: int) -> str:
+    uci = SQUARE_NAMES[code & 63] + SQUARE_NAMES[(code >> 6) & 63]
+    if code >> 14 == MOVE_PROMOTION:
+        uci += PROMOTION_PIECES[(code >> 12) & 3].lower()
+    return uci
+
+
 class Move:
     __slots__ = (
         "start",
@@ -45,31 +85,30 @@ class Move:
     def __eq__(self, other):
         if not isinstance(other, Move):
             return False
-        return (
-            self.start == other.start and
-            self.end == other.end and
-            self.piece_moved == other.piece_moved and
-            self.piece_captured == other.piece_captured and
-            self.is_pawn_promotion == other.is_pawn_promotion and
-            self.promotion_choice == other.promotion_choice and
-            self.is_en_passant == other.is_en_passant and
-            self.is_castling == other.is_castling
-        )
+        return self.code == other.code
 
     def __hash__(self):
-        return hash(
-            (
-                self.start,
-                self.end,
-                self.piece_moved,
-                self.piece_captured,
-                self.is_pawn_promotion,
-                self.promotion_choice,
-                self.is_en_passant,
-                self.is_castling,
-            )
-        )
-    
+        return hash(self.code)
+
+    @property
+    def from_square(self) -> int:
+        return self.start[0] * 8 + self.start[1]
+
+    @property
+    def to_square(self) -> int:
+        return self.end[0] * 8 + self.end[1]
+
+    @property
+    def code(self) -> int:
+        if self.is_pawn_promotion:
+            promotion = PROMOTION_PIECES.find((self.promotion_choice or 'Q').upper())
+            return Encode_Move(self.from_square, self.to_square, MOVE_PROMOTION, promotion if promotion >= 0 else PROMOTION_QUEEN)
+        if self.is_en_passant:
+            return Encode_Move(self.from_square, self.to_square, MOVE_EN_PASSANT)
+        if self.is_castling:
+            return Encode_Move(self.from_square, self.to_square, MOVE_CASTLING)
+        return Encode_Move(self.from_square, self.to_square)
+
     def To_UCI(self):
         start_sq = chr(self.start[1] + ord('a')) + str(8 - self.start[0])
         end_sq = chr(self.end[1] + ord('a')) + str(8 - self.end[0])
@@ -0,0 +1,221 @@
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Board import Board
+from Move import Move_Code_To_UCI
+
+PERFT_HASH_ENTRIES = 1 << 18
+SPLIT_UNITS_PER_JOB = 4
+_DEPTH_MIX = 0x9E3779B97F4A7C15
+
+
+class PerftHash:
+    """Fixed-size, always-replace table of subtree counts keyed by (zobrist_key, depth)."""
+
+    def __init__(self, entries: int = PERFT_HASH_ENTRIES):
+        size = 1
+        while size < max(1, entries):
+            size <<= 1
+        self.mask = size - 1
+        self.keys = [-1] * size
+        self.counts = [0] * size
+        self.hits = 0
+        self.stores = 0
+
+    def Probe(self, key: int, depth: int) -> int:
+        index = (key ^ (depth * _DEPTH_MIX)) & self.mask
+        if self.keys[index] == (key << 6 | depth):
+            self.hits += 1
+            return self.counts[index]
+        return -1
+
+    def Store(self, key: int, depth: int, count: int):
+        index = (key ^ (depth * _DEPTH_MIX)) & self.mask
+        self.keys[index] = key << 6 | depth
+        self.counts[index] = count
+        self.stores += 1
+
+    def Clear(self):
+        for index in range(len(self.keys)):
+            self.keys[index] = -1
+        self.hits = 0
+        self.stores = 0
+
+
+def _Perft_Node(board: Board, depth: int, table: PerftHash | None, buffers: list) -> int:
+    # Bulk counting: the last ply is never made, only counted.
+    if depth == 1:
+        return len(board.Generate_Legal_Move_Codes(buffers[1]))
+
+    key = board.zobrist_key
+    if table is not None:
+        cached = table.Probe(key, depth)
+        if cached >= 0:
+            return cached
+
+    moves = board.Generate_Legal_Move_Codes(buffers[depth])
+    nodes = 0
+    make = board.Make_Move
+    undo = board.Undo_Move
+    if depth == 2:
+        child_buffer = buffers[1]
+        generate = board.Generate_Legal_Move_Codes
+        for move in moves:
+            make(move)
+            nodes += len(generate(child_buffer))
+            undo()
+    else:
+        for move in moves:
+            make(move)
+            nodes += _Perft_Node(board, depth - 1, table, buffers)
+            undo()
+
+    if table is not None:
+        table.Store(key, depth, nodes)
+    return nodes
+
+
+def Perft(board: Board, depth: int, table: PerftHash | None = None) -> int:
+    if depth <= 0:
+        return 1
+    buffers = [array('H') for _ in range(depth + 1)]
+    return _Perft_Node(board, depth, table, buffers)
+
+
+def Divide(board: Board, depth: int, table: PerftHash | None = None) -> list[tuple[str, int]]:
+    if depth <= 0:
+        return []
+    results = []
+    for move in board.Generate_Legal_Move_Codes():
+        board.Make_Move(move)
+        results.append((Move_Code_To_UCI(move), Perft(board, depth - 1, table)))
+        board.Undo_Move()
+    return results
+
+
+_worker_table = None
+
+
+def _Init_Worker(hash_entries: int):
+    global _worker_table
+    _worker_table = PerftHash(hash_entries) if hash_entries > 0 else None
+
+
+def _Perft_Work_Unit(position: bytes, path: tuple, depth: int) -> tuple[tuple, int, float, int]:
+    # Work units travel as the root's Board.To_Bytes record plus the move codes
+    # leading to the subtree, so only a few dozen bytes cross the process boundary.
+    t0 = time.perf_counter()
+    board = Board.From_Bytes(position)
+    for move in path:
+        board.Make_Move(move)
+    nodes = Perft(board, depth, _worker_table)
+    return path, nodes, time.perf_counter() - t0, os.getpid()
+
+
+def _Split_Work(board: Board, depth: int, jobs: int) -> list[tuple]:
+    paths = [(move,) for move in board.Generate_Legal_Move_Codes()]
+    if depth < 3 or len(paths) >= jobs * SPLIT_UNITS_PER_JOB:
+        return paths
+
+    split = []
+    for (move,) in paths:
+        board.Make_Move(move)
+        replies = board.Generate_Legal_Move_Codes()
+        board.Undo_Move()
+        if replies:
+            split.extend((move, reply) for reply in replies)
+        else:
+            split.append((move,))
+    return split
+
+
+def Parallel_Perft(
+    fen: str,
+    depth: int,
+    jobs: int,
+    hash_entries: int = PERFT_HASH_ENTRIES,
+) -> tuple[list[tuple[str, int]], list[tuple[tuple, int, float, int]]]:
+    """Run perft over a process pool; returns the divide counts and the raw per-unit results."""
+    board = Board()
+    board.Load_FEN(fen)
+    paths = _Split_Work(board, depth, jobs)
+    position = board.To_Bytes()
+    units = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_Init_Worker, initargs=(hash_entries,)) as pool:
+        futures = [pool.submit(_Perft_Work_Unit, position, path, depth - len(path)) for path in paths]
+        for future in as_completed(futures):
+            units.append(future.result())
+
+    per_root = {}
+    for path, nodes, _, _ in units:
+        per_root[path[0]] = per_root.get(path[0], 0) + nodes
+    root_order = []
+    for path in paths:
+        if path[0] not in root_order:
+            root_order.append(path[0])
+    return [(Move_Code_To_UCI(move), per_root[move]) for move in root_order], units
+
+
+def run_perft(
+    fen: str,
+    depth: int,
+    divide: bool = False,
+    hash_entries: int = PERFT_HASH_ENTRIES,
+    jobs: int = 1,
+) -> int:
+    fen = Board.START_FEN if fen == "startpos" else fen
+    if jobs > 1 and depth >= 2:
+        return _Run_Parallel_Perft(fen, depth, divide, hash_entries, jobs)
+
+    board = Board()
+    board.Load_FEN(fen)
+    table = PerftHash(hash_entries) if hash_entries > 0 else None
+
+    t0 = time.perf_counter()
+    if divide:
+        results = Divide(board, depth, table)
+        for uci, count in results:
+            print(f"{uci}: {count}")
+        nodes = sum(count for _, count in results)
+        print(f"\nMoves: {len(results)}")
+    else:
+        nodes = Perft(board, depth, table)
+    elapsed = max(1e-9, time.perf_counter() - t0)
+
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"NPS: {int(nodes / elapsed)}")
+    if table is not None:
+        print(f"Hash: hits={table.hits} stores={table.stores} entries={table.mask + 1}")
+    return nodes
+
+
+def _Run_Parallel_Perft(fen: str, depth: int, divide: bool, hash_entries: int, jobs: int) -> int:
+    t0 = time.perf_counter()
+    results, units = Parallel_Perft(fen, depth, jobs, hash_entries)
+    elapsed = max(1e-9, time.perf_counter() - t0)
+
+    if divide:
+        for uci, count in results:
+            print(f"{uci}: {count}")
+        print(f"\nMoves: {len(results)}")
+    nodes = sum(count for _, count in results)
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"NPS: {int(nodes / elapsed)}")
+
+    workers = {}
+    for _, unit_nodes, unit_time, pid in units:
+        stats = workers.setdefault(pid, [0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += unit_nodes
+        stats[2] += unit_time
+    print(f"Jobs: {jobs} units={len(units)}")
+    for index, (pid, (count, worker_nodes, busy)) in enumerate(sorted(workers.items())):
+        print(
+            f"  worker {index} pid={pid} units={count} nodes={worker_nodes} "
+            f"busy={busy:.3f}s util={min(100.0, busy * 100.0 / elapsed):.1f}%"
+        )
+    return nodes
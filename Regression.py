@@ -1,5 +1,6 @@
 import cProfile
 import io
+import pickle
 import pstats
 import time
 import random
@@ -11,6 +12,8 @@ from typing import List
 import Engine
 from Board import Board
 from ChessUI import ChessUI
+from Perft import Perft, PerftHash
+import BatchBoards
 
 
 @dataclass
@@ -54,51 +57,41 @@ def move_to_uci(move) -> str:
     return f"{coord_to_square(move.start)}{coord_to_square(move.end)}{promo}"
 
 
-def perft(board: Board, depth: int) -> int:
-    if depth == 0:
-        return 1
-    moves = board.Generate_Legal_Moves()
-    if depth == 1:
-        return len(moves)
+def perft(board: Board, depth: int, table: PerftHash | None = None) -> int:
+    return Perft(board, depth, table)
 
-    nodes = 0
-    for move in moves:
-        if not board.Make_Move(move):
-            continue
-        nodes += perft(board, depth - 1)
-        board.Undo_Move()
-    return nodes
 
+PERFT_CASES = [
+    PerftCase(
+        name="startpos",
+        fen=Board.START_FEN,
+        depths={1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609},
+    ),
+    PerftCase(
+        name="kiwipete",
+        fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        depths={1: 48, 2: 2039, 3: 97862},
+    ),
+    PerftCase(
+        name="ep-and-pins",
+        fen="8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        depths={1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624},
+    ),
+]
 
-def run_perft_suite() -> tuple[bool, str]:
-    cases = [
-        PerftCase(
-            name="startpos",
-            fen=Board.START_FEN,
-            depths={1: 20, 2: 400, 3: 8902, 4: 197281},
-        ),
-        PerftCase(
-            name="kiwipete",
-            fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
-            depths={1: 48, 2: 2039, 3: 97862},
-        ),
-        PerftCase(
-            name="ep-and-pins",
-            fen="8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
-            depths={1: 14, 2: 191, 3: 2812},
-        ),
-    ]
 
+def run_perft_suite() -> tuple[bool, str]:
     all_ok = True
     lines = ["=== Perft Suite ==="]
 
-    for case in cases:
+    for case in PERFT_CASES:
         board = Board()
         board.Load_FEN(case.fen)
+        table = PerftHash()
         lines.append(f"[{case.name}]")
         for depth, expected in sorted(case.depths.items()):
             t0 = time.perf_counter()
-            got = perft(board, depth)
+            got = perft(board, depth, table)
             elapsed = time.perf_counter() - t0
             ok = got == expected
             all_ok = all_ok and ok
@@ -166,10 +159,9 @@ def run_tactic_suite() -> tuple[bool, str]:
             return False
         if not board.Make_Move(move):
             return False
-        legal = board.Generate_Legal_Moves()
-        in_check = board.Is_King_In_Check(board.white_to_move)
+        is_mate = not board.Has_Legal_Move() and board.Is_King_In_Check(board.white_to_move)
         board.Undo_Move()
-        return len(legal) == 0 and in_check
+        return is_mate
 
     for case in cases:
         board = Board()
@@ -232,11 +224,115 @@ def run_benchmark(depth: int = 4) -> tuple[bool, str]:
     return all_ok, "\n".join(lines)
 
 
+def run_batch_movegen_suite(depth: int = 2) -> tuple[bool, str]:
+    lines = ["=== Batch Movegen Suite ==="]
+    if BatchBoards.np is None:
+        lines.append("[skipped] numpy not installed")
+        return True, "\n".join(lines)
+
+    boards = []
+    seen = set()
+
+    def collect(board: Board, remaining: int):
+        if board.zobrist_key in seen:
+            return
+        seen.add(board.zobrist_key)
+        boards.append(board.Clone())
+        if remaining == 0:
+            return
+        for move in board.Generate_Legal_Move_Codes():
+            board.Make_Move(move)
+            collect(board, remaining - 1)
+            board.Undo_Move()
+
+    for case in PERFT_CASES:
+        board = Board()
+        board.Load_FEN(case.fen)
+        collect(board, depth)
+
+    planes, side, castling, en_passant = BatchBoards.Boards_To_Planes(boards)
+    t0 = time.perf_counter()
+    counts = BatchBoards.Batch_Legal_Move_Counts(planes, side, castling, en_passant)
+    in_check = BatchBoards.Batch_In_Check(planes, side)
+    white_attacks, black_attacks = BatchBoards.Batch_Attack_Maps(planes)
+    batch_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    mismatches = 0
+    for index, board in enumerate(boards):
+        expected_white = expected_black = 0
+        for square in range(64):
+            if board._Is_Square_Index_Attacked(square, True, board.occupied):
+                expected_white |= 1 << square
+            if board._Is_Square_Index_Attacked(square, False, board.occupied):
+                expected_black |= 1 << square
+        if (
+            int(counts[index]) != len(board.Generate_Legal_Move_Codes())
+            or bool(in_check[index]) != board.Is_King_In_Check()
+            or int(white_attacks[index]) != expected_white
+            or int(black_attacks[index]) != expected_black
+        ):
+            mismatches += 1
+    scalar_time = time.perf_counter() - t0
+
+    ok = mismatches == 0
+    lines.append(
+        f"[perft-positions] {'PASS' if ok else 'FAIL'} positions={len(boards)} mismatches={mismatches} "
+        f"batch_time={batch_time:.3f}s scalar_check_time={scalar_time:.3f}s"
+    )
+    return ok, "\n".join(lines)
+
+
+def run_position_encoding_benchmark(seed: int = 7, positions: int = 200) -> tuple[bool, str]:
+    rng = random.Random(seed)
+    boards = []
+    board = Board()
+    while len(boards) < positions:
+        moves = board.Generate_Legal_Move_Codes()
+        if not moves or board.Is_Fifty_Move_Rule():
+            board = Board()
+            continue
+        board.Make_Move(rng.choice(moves))
+        boards.append(board.Clone())
+
+    all_ok = True
+    for sample in boards:
+        restored = Board.From_Bytes(sample.To_Bytes())
+        if _board_signature(restored) != _board_signature(sample) or restored.zobrist_key != sample.zobrist_key:
+            all_ok = False
+
+    def time_per_op(fn, items) -> float:
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        return (time.perf_counter() - t0) * 1_000_000.0 / len(items)
+
+    def load_fen(fen: str):
+        target = Board()
+        target.Load_FEN(fen)
+
+    encoded = [sample.To_Bytes() for sample in boards]
+    fens = [Engine._Board_To_FEN(sample) for sample in boards]
+    pickled = [pickle.dumps(sample) for sample in boards]
+    lines = [
+        "=== Position Encoding Benchmark ===",
+        f"[roundtrip] {'PASS' if all_ok else 'FAIL'} positions={len(boards)}",
+        f"[bytes] size={len(encoded[0])} encode_us={time_per_op(Board.To_Bytes, boards):.1f} "
+        f"decode_us={time_per_op(Board.From_Bytes, encoded):.1f}",
+        f"[fen] avg_size={sum(len(fen) for fen in fens) / len(fens):.1f} "
+        f"encode_us={time_per_op(Engine._Board_To_FEN, boards):.1f} decode_us={time_per_op(load_fen, fens):.1f}",
+        f"[pickle] avg_size={sum(len(data) for data in pickled) / len(pickled):.1f} "
+        f"encode_us={time_per_op(pickle.dumps, boards):.1f} decode_us={time_per_op(pickle.loads, pickled):.1f}",
+        f"[clone] us={time_per_op(Board.Clone, boards):.1f}",
+    ]
+    return all_ok, "\n".join(lines)
+
+
 def _board_signature(board: Board):
     return (
         tuple(tuple(row) for row in board.board),
         board.white_to_move,
-        tuple(sorted(board.castling_rights)),
+        board.castling_rights,
         board.en_passant_square,
         board.halfmove_clock,
         board.fullmove_number,
@@ -631,6 +727,12 @@ def run_full_regression(depth: int = 4) -> bool:
         consistency_ok, consistency_report = run_consistency_suite()
         results.append((consistency_ok, consistency_report))
 
+        encoding_ok, encoding_report = run_position_encoding_benchmark()
+        results.append((encoding_ok, encoding_report))
+
+        batch_ok, batch_report = run_batch_movegen_suite()
+        results.append((batch_ok, batch_report))
+
         legality_ok, legality_report = run_legality_suite()
         results.append((legality_ok, legality_report))
 
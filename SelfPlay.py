@@ -23,8 +23,7 @@ def self_play_step_by_step(depth=3, max_moves=100):
             print("Threefold repetition reached. Game drawn.")
             break
 
-        legal_moves = board.Generate_Legal_Moves()
-        if not legal_moves:
+        if not board.Has_Legal_Move():
             if board.Is_King_In_Check():
                 print("Checkmate!")
             else:
@@ -87,8 +87,7 @@ def _play_single_game(
         if move is None:
             return _game_result(board)
 
-        legal_moves = board.Generate_Legal_Moves()
-        if not any(m == move or m.To_UCI() == move.To_UCI() for m in legal_moves):
+        if not board.Is_Legal(move):
             return "draw"
 
         if not board.Make_Move(move):
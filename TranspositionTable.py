@@ -0,0 +1,309 @@
+"""Fixed-size transposition table packed into one preallocated buffer of 64-bit words.
+
+Every slot is two words: the Zobrist key XORed with the data word, then the data
+word holding move (bits 0-15), score and static eval (16 bits each, stored with a
++32768 offset), depth (8 bits), bound (2 bits) and generation (6 bits). Slots are
+grouped in buckets of TT_BUCKET_SLOTS, indexed by the low bits of the key.
+
+The buffer is private memory by default, or an mmap'd file / shared memory segment
+so the table outlives the process and can be shared by several. Sharing needs no
+locks: a slot torn by two concurrent writers no longer satisfies key ^ data == key
+and simply reads as a miss. A file or segment starts with a TT_HEADER_BYTES header,
+and Save writes the same layout, so a dump can be reopened directly as a table file.
+"""
+
+import mmap
+import os
+import struct
+
+from Move import MOVE_NONE
+
+TT_DEFAULT_MB = 16
+TT_MIN_MB = 1
+TT_MAX_MB = 4096
+TT_BUCKET_SLOTS = 4
+TT_SLOT_BYTES = 16
+
+BOUND_NONE = 0
+BOUND_UPPER = 1
+BOUND_LOWER = 2
+BOUND_EXACT = 3
+
+EVAL_NONE = -32768
+GENERATION_MASK = 63
+_SCORE_OFFSET = 32768
+_DEPTH_MAX = 255
+_HASHFULL_SAMPLE_BUCKETS = 250
+
+TT_MAGIC = b"PYCHESTT"
+TT_HEADER = struct.Struct("<8sQQ")
+TT_HEADER_BYTES = 64
+
+
+def _Buckets_For_Size(size_mb: int) -> int:
+    size_mb = max(TT_MIN_MB, min(TT_MAX_MB, int(size_mb)))
+    buckets = 1
+    while buckets * 2 * TT_BUCKET_SLOTS * TT_SLOT_BYTES <= size_mb << 20:
+        buckets <<= 1
+    return buckets
+
+
+def _Table_Bytes(buckets: int) -> int:
+    return TT_HEADER_BYTES + buckets * TT_BUCKET_SLOTS * TT_SLOT_BYTES
+
+
+def _Header_Buckets(header) -> int:
+    """Bucket count recorded in a table header, or 0 if the header is missing or foreign."""
+    if len(header) < TT_HEADER_BYTES:
+        return 0
+    magic, buckets, bucket_slots = TT_HEADER.unpack_from(header, 0)
+    if magic != TT_MAGIC or bucket_slots != TT_BUCKET_SLOTS or not buckets or buckets & (buckets - 1):
+        return 0
+    return buckets
+
+
+def _Read_Header(buffer) -> int:
+    """Like _Header_Buckets, but also requires the buffer to hold the whole table."""
+    buckets = _Header_Buckets(buffer)
+    if not buckets or len(buffer) < _Table_Bytes(buckets):
+        return 0
+    return buckets
+
+
+def Pack_Entry(move: int, score: int, static_eval: int, depth: int, bound: int, generation: int) -> int:
+    return (
+        move
+        | (score + _SCORE_OFFSET) << 16
+        | (static_eval + _SCORE_OFFSET) << 32
+        | max(0, min(_DEPTH_MAX, depth)) << 48
+        | bound << 56
+        | (generation & GENERATION_MASK) << 58
+    )
+
+
+def Unpack_Entry(data: int) -> tuple[int, int, int, int, int]:
+    """Returns (depth, bound, score, move, static_eval)."""
+    return (
+        (data >> 48) & 255,
+        (data >> 56) & 3,
+        ((data >> 16) & 0xFFFF) - _SCORE_OFFSET,
+        data & 0xFFFF,
+        ((data >> 32) & 0xFFFF) - _SCORE_OFFSET,
+    )
+
+
+def Remove_Shared_Table(shared_name: str):
+    """Remove a named shared memory table, if one exists, without opening it as a table."""
+    from multiprocessing import shared_memory
+
+    try:
+        segment = shared_memory.SharedMemory(name=shared_name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: int = TT_DEFAULT_MB, path: str | None = None, shared_name: str | None = None):
+        self.path = path
+        self.shared_name = shared_name
+        self._mmap = None
+        self._file = None
+        self._shared = None
+        self._buffer = None
+        self.words = None
+        self._Open(_Buckets_For_Size(size_mb), adopt_existing=True)
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None or self.shared_name is not None
+
+    @classmethod
+    def Attach(cls, shared_name: str) -> "TranspositionTable":
+        """Open an existing shared segment at whatever size its creator chose."""
+        return cls(TT_MIN_MB, shared_name=shared_name)
+
+    def Resize(self, size_mb: int):
+        buckets = _Buckets_For_Size(size_mb)
+        if self.words is not None and buckets == self.bucket_mask + 1:
+            return
+        self._Open(buckets, adopt_existing=False)
+
+    def _Open(self, buckets: int, adopt_existing: bool):
+        self.Close()
+        if self.path is not None:
+            buffer = self._Map_File(buckets, adopt_existing)
+        elif self.shared_name is not None:
+            buffer = self._Map_Shared(buckets, adopt_existing)
+        else:
+            buffer = bytearray(_Table_Bytes(buckets))
+
+        existing = _Read_Header(buffer)
+        if existing:
+            buckets = existing
+        else:
+            if self.persistent:
+                buffer[:_Table_Bytes(buckets)] = bytes(_Table_Bytes(buckets))
+            TT_HEADER.pack_into(buffer, 0, TT_MAGIC, buckets, TT_BUCKET_SLOTS)
+
+        self._buffer = buffer
+        self.words = memoryview(buffer)[TT_HEADER_BYTES:_Table_Bytes(buckets)].cast("Q")
+        self.bucket_mask = buckets - 1
+        self.slots = buckets * TT_BUCKET_SLOTS
+        self.size_mb = max(1, (self.slots * TT_SLOT_BYTES) >> 20)
+
+    def _Map_File(self, buckets: int, adopt_existing: bool):
+        size = _Table_Bytes(buckets)
+        # Not "a+b": appending mode would send the header rewrite below to the end of the file.
+        try:
+            self._file = open(self.path, "r+b")
+        except FileNotFoundError:
+            self._file = open(self.path, "w+b")
+        current = os.fstat(self._file.fileno()).st_size
+        if current:
+            # Only empty files and our own tables may be resized or overwritten.
+            self._file.seek(0)
+            header = self._file.read(TT_HEADER_BYTES)
+            if header[:len(TT_MAGIC)] != TT_MAGIC:
+                self._file.close()
+                self._file = None
+                raise ValueError(f"{self.path} is not a transposition table file; refusing to overwrite it")
+            existing = _Header_Buckets(header)
+            if adopt_existing and existing and current >= _Table_Bytes(existing):
+                size = _Table_Bytes(existing)
+        if current != size:
+            self._file.truncate(size)
+            if current:
+                # Never adopt a header left behind in a file of another size.
+                self._file.seek(0)
+                self._file.write(bytes(TT_HEADER_BYTES))
+                self._file.flush()
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        return self._mmap
+
+    def _Map_Shared(self, buckets: int, adopt_existing: bool):
+        from multiprocessing import resource_tracker, shared_memory
+
+        size = _Table_Bytes(buckets)
+        try:
+            segment = shared_memory.SharedMemory(name=self.shared_name)
+            if not adopt_existing and segment.size < size:
+                segment.close()
+                segment.unlink()
+                raise FileNotFoundError(self.shared_name)
+        except FileNotFoundError:
+            segment = shared_memory.SharedMemory(name=self.shared_name, create=True, size=size)
+        # The segment belongs to no single process; only Unlink() removes it.
+        resource_tracker.unregister(segment._name, "shared_memory")
+        self._shared = segment
+        if not adopt_existing:
+            TT_HEADER.pack_into(segment.buf, 0, b"\0" * 8, 0, 0)
+        return segment.buf
+
+    def Close(self):
+        if self.words is not None:
+            self.words.release()
+            self.words = None
+        self._buffer = None
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def Unlink(self):
+        """Close the table and remove its shared segment from the system."""
+        if self.shared_name is None:
+            return
+        self.Close()
+        Remove_Shared_Table(self.shared_name)
+
+    def Clear(self):
+        self.words.cast("B")[:] = bytes(self.slots * TT_SLOT_BYTES)
+
+    def Save(self, path: str):
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(self._buffer[:_Table_Bytes(self.bucket_mask + 1)])
+        os.replace(temp_path, path)
+
+    def Load(self, path: str) -> bool:
+        """Replace the contents with a file written by Save; False if it is not a table dump."""
+        with open(path, "rb") as handle:
+            data = handle.read()
+        buckets = _Read_Header(data)
+        if not buckets:
+            return False
+        if buckets != self.bucket_mask + 1:
+            self._Open(buckets, adopt_existing=False)
+        self.words.cast("B")[:] = data[TT_HEADER_BYTES:_Table_Bytes(buckets)]
+        return True
+
+    def Probe(self, key: int) -> tuple[int, int, int, int, int] | None:
+        words = self.words
+        index = (key & self.bucket_mask) * (TT_BUCKET_SLOTS * 2)
+        for slot in range(index, index + TT_BUCKET_SLOTS * 2, 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                return Unpack_Entry(data)
+        return None
+
+    def Store(
+        self,
+        key: int,
+        depth: int,
+        bound: int,
+        score: int,
+        move: int,
+        generation: int,
+        static_eval: int = EVAL_NONE,
+    ):
+        words = self.words
+        index = (key & self.bucket_mask) * (TT_BUCKET_SLOTS * 2)
+        generation &= GENERATION_MASK
+        victim = index
+        victim_worth = None
+        for slot in range(index, index + TT_BUCKET_SLOTS * 2, 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                # The newer result wins unless the stored one is at least two plies deeper;
+                # entries left over from earlier searches are always refreshed.
+                if (data >> 58) == generation and depth + 2 <= (data >> 48) & 255:
+                    return
+                if move == MOVE_NONE:
+                    move = data & 0xFFFF
+                if static_eval == EVAL_NONE:
+                    static_eval = ((data >> 32) & 0xFFFF) - _SCORE_OFFSET
+                victim = slot
+                break
+            if not data:
+                victim = slot
+                break
+            # Older entries lose eight plies of depth per generation they have aged.
+            age = (generation - (data >> 58)) & GENERATION_MASK
+            worth = ((data >> 48) & 255) - 8 * age
+            if victim_worth is None or worth < victim_worth:
+                victim = slot
+                victim_worth = worth
+
+        data = Pack_Entry(move, score, static_eval, depth, bound, generation)
+        words[victim] = key ^ data
+        words[victim + 1] = data
+
+    def Hashfull(self, generation: int) -> int:
+        """Permille of sampled slots written during the given search generation."""
+        words = self.words
+        generation &= GENERATION_MASK
+        sample = min(self.slots, _HASHFULL_SAMPLE_BUCKETS * TT_BUCKET_SLOTS)
+        used = 0
+        for slot in range(1, sample * 2, 2):
+            data = words[slot]
+            if data and data >> 58 == generation:
+                used += 1
+        return used * 1000 // sample
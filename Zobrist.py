@@ -1,13 +1,10 @@
 import random
+from Bitboards import PIECE_ORDER, PIECE_INDEX, WHITE_PAWN, BLACK_PAWN
 
 random.seed(0)
 
-ZOBRIST_PIECES = {
-    (piece, row, col): random.getrandbits(64)
-    for piece in "PNBRQKpnbrqk"
-    for row in range(8)
-    for col in range(8)
-}
+# Flat table indexed by piece_index * 64 + square (piece order "PNBRQKpnbrqk", a8 = 0).
+ZOBRIST_PIECES = [random.getrandbits(64) for _ in range(len(PIECE_ORDER) * 64)]
 
 ZOBRIST_CASTLING = {
     "K": random.getrandbits(64),
@@ -16,21 +13,43 @@ ZOBRIST_CASTLING = {
     "q": random.getrandbits(64),
 }
 
+# ZOBRIST_CASTLING_RIGHTS[rights] is the combined key of every right set in the 4-bit mask,
+# so XOR-ing in ZOBRIST_CASTLING_RIGHTS[old ^ new] updates the key for any rights change.
+ZOBRIST_CASTLING_RIGHTS = tuple(
+    ZOBRIST_CASTLING["K"] * (rights & 1)
+    ^ ZOBRIST_CASTLING["Q"] * ((rights >> 1) & 1)
+    ^ ZOBRIST_CASTLING["k"] * ((rights >> 2) & 1)
+    ^ ZOBRIST_CASTLING["q"] * ((rights >> 3) & 1)
+    for rights in range(16)
+)
+
 ZOBRIST_EN_PASSANT = [random.getrandbits(64) for _ in range(8)]
 
 ZOBRIST_TURN = random.getrandbits(64)
 
-def hash_board (board) -> int:
+# Material signature: ZOBRIST_MATERIAL[piece_index * 16 + n] is toggled in when the
+# (n + 1)-th piece of that kind appears, so the key depends only on piece counts.
+ZOBRIST_MATERIAL = [random.getrandbits(64) for _ in range(len(PIECE_ORDER) * 16)]
+
+def hash_board (board, all_keys: bool = False):
     h = 0
+    pawn_key = 0
+    material_key = 0
+    counts = [0] * len(PIECE_ORDER)
 
     for row in range(8):
         for col in range(8):
             piece = board.board[row][col]
             if piece != '.':
-                h ^= ZOBRIST_PIECES.get ((piece, row, col), 0)
+                piece_index = PIECE_INDEX[piece]
+                piece_key = ZOBRIST_PIECES[piece_index * 64 + row * 8 + col]
+                h ^= piece_key
+                if piece_index == WHITE_PAWN or piece_index == BLACK_PAWN:
+                    pawn_key ^= piece_key
+                material_key ^= ZOBRIST_MATERIAL[piece_index * 16 + counts[piece_index]]
+                counts[piece_index] += 1
 
-    for right in board.castling_rights:
-        h ^= ZOBRIST_CASTLING.get (right, 0)
+    h ^= ZOBRIST_CASTLING_RIGHTS[board.castling_rights]
 
     if board.en_passant_square:
         file = board.en_passant_square [1]
@@ -40,4 +59,6 @@ def hash_board (board) -> int:
     if board.white_to_move:
         h ^= ZOBRIST_TURN
 
-    return h
\ No newline at end of file
+    if all_keys:
+        return h, pawn_key, material_key
+    return h
@@ -3,8 +3,10 @@ import os
 
 import Engine
 from Board import Board
+from Perft import PERFT_HASH_ENTRIES, run_perft
 from Regression import run_full_regression
 from StructuredGames import run_structured_games
+from TranspositionTable import TT_DEFAULT_MB
 from uci import uci_loop
 
 
@@ -19,15 +21,24 @@ def _parse_bool_env(value: str | None, default: bool) -> bool:
     return default
 
 
-def run_bench(depth: int, repeats: int, detailed_log: bool):
+def run_bench(
+    depth: int,
+    repeats: int,
+    detailed_log: bool,
+    workers: int = 1,
+    split_root: bool = False,
+    all_lines: bool = False,
+):
     Engine.Toggle_Logging(True)
     Engine.Toggle_Detailed_Log(detailed_log)
 
     for index in range(repeats):
         board = Board()
         print(f"\n=== Bench {index + 1}/{repeats} | depth {depth} ===")
-        best_move = Engine.Find_Best_Move(board, depth)
+        best_move = Engine.Find_Best_Move(board, depth, workers=workers, split_root=split_root, all_lines=all_lines)
         print(f"Best move: {best_move}")
+        for uci, score in Engine.Get_Search_Stats()["root_lines"]:
+            print(f"  {uci}: {Engine.Format_UCI_Score(score)}")
 
 
 def main():
@@ -43,12 +54,53 @@ def main():
     parser.add_argument("--repeats", type=int, default=1, help="How many bench runs to execute.")
     parser.add_argument("--games-per-opening", type=int, default=2, help="Games per opening in structured games mode.")
     parser.add_argument("--detailed-log", action="store_true", help="Write detailed log entries in bench mode.")
+    parser.add_argument("--perft", nargs=2, metavar=("FEN", "DEPTH"), help="Count leaf nodes from FEN to DEPTH and report nodes per second.")
+    parser.add_argument("--divide", action="store_true", help="With --perft, print the node count below each root move.")
+    parser.add_argument("--perft-hash", type=int, default=PERFT_HASH_ENTRIES, help="Perft hash entries (0 disables the table).")
+    parser.add_argument("--jobs", type=int, default=1, help="With --perft, split the tree across this many worker processes.")
+    parser.add_argument("--threads", type=int, default=1, help="Search processes for bench mode (Lazy SMP when above 1).")
+    parser.add_argument("--split-root", action="store_true", help="With --bench, search root moves on a pool of --threads processes.")
+    parser.add_argument("--all-lines", action="store_true", help="With --bench, score every root move exactly on the process pool.")
+    parser.add_argument("--hash", type=int, default=TT_DEFAULT_MB, help="Transposition table size in MB.")
+    parser.add_argument("--hash-file", metavar="PATH", help="Keep the transposition table in an mmap'd file that survives restarts.")
+    parser.add_argument("--hash-shm", metavar="NAME", help="Keep the transposition table in a named shared memory segment.")
+    parser.add_argument("--hash-load", metavar="PATH", help="Load a transposition table dump before running.")
+    parser.add_argument("--hash-dump", metavar="PATH", help="Dump the transposition table to PATH when the run ends.")
     parser.set_defaults(gui=None)
     args = parser.parse_args()
     gui_enabled = _parse_bool_env(os.getenv("CHESSBOT_GUI"), default=True)
     if args.gui is not None:
         gui_enabled = args.gui
 
+    if args.perft:
+        fen, depth = args.perft
+        run_perft(fen, int(depth), divide=args.divide, hash_entries=args.perft_hash, jobs=args.jobs)
+        return
+
+    _setup_hash(args)
+    try:
+        _run_mode(args, gui_enabled)
+    finally:
+        if args.hash_dump:
+            Engine.Save_Hash(args.hash_dump)
+
+
+def _setup_hash(args):
+    if args.hash_file:
+        try:
+            Engine.Use_Hash_File(args.hash_file, args.hash)
+        except ValueError as exc:
+            print(f"{exc}. Using an in-memory table.")
+            Engine.Set_Hash_Size(args.hash)
+    elif args.hash_shm:
+        Engine.Use_Shared_Hash(args.hash_shm, args.hash)
+    elif args.hash != TT_DEFAULT_MB:
+        Engine.Set_Hash_Size(args.hash)
+    if args.hash_load and not Engine.Load_Hash(args.hash_load):
+        print(f"Ignoring {args.hash_load}: not a transposition table dump.")
+
+
+def _run_mode(args, gui_enabled: bool):
     if args.all_tests:
         reg_ok = run_full_regression(depth=args.depth)
         sg_ok = run_structured_games(current_depth=args.depth, games_per_opening=args.games_per_opening)
@@ -67,7 +119,7 @@ def main():
         raise SystemExit(0 if ok else 1)
 
     if args.bench:
-        run_bench(args.depth, args.repeats, args.detailed_log)
+        run_bench(args.depth, args.repeats, args.detailed_log, args.threads, args.split_root, args.all_lines)
         return
 
     if args.uci:
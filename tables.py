@@ -73,4 +73,18 @@ KING_END_TABLE = [
     [-3, -1, 2, 3, 3, 2, -1, -3],
     [-3, -3, 0, 0, 0, 0, -3, -3],
     [-5, -3, -3, -3, -3, -3, -3, -5]
-]
\ No newline at end of file
+]
+
+# The tables above are written in tenths of a pawn; the evaluator reads these
+# integer centipawn copies.
+def _Centipawns(table: list) -> tuple:
+    return tuple(tuple(int(round(value * 10)) for value in row) for row in table)
+
+
+PAWN_TABLE_CP = _Centipawns(PAWN_TABLE)
+KNIGHT_TABLE_CP = _Centipawns(KNIGHT_TABLE)
+BISHOP_TABLE_CP = _Centipawns(BISHOP_TABLE)
+ROOK_TABLE_CP = _Centipawns(ROOK_TABLE)
+QUEEN_TABLE_CP = _Centipawns(QUEEN_TABLE)
+KING_MID_TABLE_CP = _Centipawns(KING_MID_TABLE)
+KING_END_TABLE_CP = _Centipawns(KING_END_TABLE)
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from Board import Board
+
+np = pytest.importorskip("numpy")
+import BatchBoards
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+def test_batch_counts_match_scalar_generator():
+    rng = random.Random(5)
+    boards = []
+    for fen in (Board.START_FEN, KIWIPETE, "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"):
+        board = Board()
+        board.Load_FEN(fen)
+        for _ in range(40):
+            codes = board.Generate_Legal_Move_Codes()
+            boards.append(board.Clone())
+            if not codes:
+                break
+            board.Make_Move(rng.choice(codes))
+
+    planes, side, castling, en_passant = BatchBoards.Boards_To_Planes(boards)
+    masks = BatchBoards.Batch_Legal_Move_Masks(planes, side, castling, en_passant)
+    in_check = BatchBoards.Batch_In_Check(planes, side)
+    for index, board in enumerate(boards):
+        expected = [0] * 64
+        for code in board.Generate_Legal_Move_Codes():
+            expected[code & 63] |= 1 << ((code >> 6) & 63)
+        assert [int(mask) for mask in masks[index]] == expected
+        assert bool(in_check[index]) == board.Is_King_In_Check()
+
+if __name__ == "__main__":
+    test_batch_counts_match_scalar_generator()
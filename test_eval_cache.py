@@ -0,0 +1,24 @@
+from EvalCache import EvalCache, EVAL_CACHE_MIN_BYTES
+
+def test_eval_cache_verifies_keys_and_counts():
+    cache = EvalCache(EVAL_CACHE_MIN_BYTES)
+    key = 0x9D39247E33776D41
+    assert cache.Probe(key) is None
+    cache.Store(key, -31999)
+    assert cache.Probe(key) == -31999
+    assert cache.used == 1
+
+    colliding = key + (cache.mask + 1)
+    assert cache.Probe(colliding) is None
+    cache.Store(colliding, 250)
+    assert cache.Probe(colliding) == 250
+    assert cache.Probe(key) is None
+    assert (cache.hits, cache.misses, cache.collisions) == (2, 3, 1)
+    assert cache.size_bytes <= EVAL_CACHE_MIN_BYTES
+
+    cache.Clear()
+    assert cache.Probe(colliding) is None
+    assert cache.used == 0
+
+if __name__ == "__main__":
+    test_eval_cache_verifies_keys_and_counts()
@@ -12,20 +12,25 @@ def test_hash_consistency():
         move = random.choice(moves)
         
         pre_hash = board.zobrist_key
+        pre_keys = (board.zobrist_key, board.pawn_key, board.material_key)
         board_hash_pre = hash_board(board)
         assert pre_hash == board_hash_pre, "Hash mismatch before move!"
+        assert pre_keys == hash_board(board, all_keys=True), "Pawn/material key mismatch before move!"
         
         board.Make_Move(move)
         
         post_hash = board.zobrist_key
         board_hash_post = hash_board(board)
         assert post_hash == board_hash_post, f"Hash mismatch after move! {move}"
+        post_keys = (board.zobrist_key, board.pawn_key, board.material_key)
+        assert post_keys == hash_board(board, all_keys=True), f"Pawn/material key mismatch after move! {move}"
         
         board.Undo_Move()
         
         undo_hash = board.zobrist_key
         assert undo_hash == pre_hash, "Hash mismatch after undo!"
         assert undo_hash == hash_board(board), "Hash mismatch after undo and hash_board!"
+        assert (board.zobrist_key, board.pawn_key, board.material_key) == pre_keys, "Pawn/material key mismatch after undo!"
     
     print("Hash consistency test passed 100 random moves.")
     
@@ -0,0 +1,113 @@
+from Board import Board, LegalMoveCache, POSITION_BYTES
+from Move import Move_Code_To_UCI
+import random
+
+def test_move_code_round_trip():
+    board = Board()
+    board.Load_FEN("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    for _ in range(60):
+        codes = board.Generate_Legal_Move_Codes()
+        if not codes:
+            break
+        for code in codes:
+            move = board.Move_From_Code(code)
+            assert move.code == code
+            assert move.To_UCI() == Move_Code_To_UCI(code)
+
+        code = random.choice(codes)
+        pre_key = board.zobrist_key
+        board.Make_Move(code)
+        board.Undo_Move()
+        assert board.zobrist_key == pre_key
+        board.Make_Move(code)
+
+def test_legal_move_cache_matches_generation():
+    board = Board()
+    cache = LegalMoveCache(max_entries=8)
+    for _ in range(40):
+        expected = tuple(board.Generate_Legal_Move_Codes())
+        assert cache.Get(board) == expected
+        assert cache.Get(board) == expected
+        if not expected:
+            break
+        board.Make_Move(random.choice(expected))
+    assert len(cache.entries) <= 8
+    assert cache.hits >= cache.misses
+
+def test_position_bytes_round_trip():
+    board = Board()
+    board.Load_FEN("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    for _ in range(60):
+        data = board.To_Bytes()
+        assert len(data) == POSITION_BYTES
+        restored = Board.From_Bytes(data)
+        assert restored.board == board.board
+        assert restored.mailbox == board.mailbox
+        assert restored.bitboards == board.bitboards
+        assert (restored.castling_rights, restored.en_passant_square) == (board.castling_rights, board.en_passant_square)
+        assert (restored.halfmove_clock, restored.fullmove_number) == (board.halfmove_clock, board.fullmove_number)
+        assert (restored.zobrist_key, restored.pawn_key, restored.material_key) == (board.zobrist_key, board.pawn_key, board.material_key)
+        assert restored.To_Bytes() == data
+        codes = board.Generate_Legal_Move_Codes()
+        if not codes:
+            break
+        board.Make_Move(random.choice(codes))
+
+def test_capture_generator_matches_noisy_moves():
+    board = Board()
+    board.Load_FEN("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    for _ in range(80):
+        codes = board.Generate_Legal_Move_Codes()
+        if not codes:
+            break
+        noisy = sorted(code for code in codes if board._Is_Noisy_Move(code))
+        assert sorted(board.Generate_Legal_Capture_Codes()) == noisy
+        pseudo = board.Generate_Capture_Codes()
+        assert set(noisy) <= set(pseudo)
+        assert all(board._Is_Noisy_Move(code) and board.Is_Pseudo_Legal(code) for code in pseudo)
+        board.Make_Move(random.choice(codes))
+
+def test_evasion_generator_matches_filtered_moves():
+    fens = [
+        "4k3/8/8/8/1b6/8/2P5/4K3 w - - 0 1",
+        "8/8/8/8/8/8/1p6/R1k4K b - - 0 1",
+        "8/8/8/2k5/3Pp3/8/8/4K2B b - d3 0 1",
+        "4k3/8/8/8/8/8/4q3/R3K2R w KQ - 0 1",
+        "4k3/8/8/8/8/5n2/8/4K2r w - - 0 1",
+    ]
+    for fen in fens:
+        board = Board()
+        board.Load_FEN(fen)
+        assert board.Is_King_In_Check(board.white_to_move)
+        expected = sorted(code for code in board.Get_Pseudo_Legal_Move_Codes() if board._Validate_Legal_Move(code))
+        assert sorted(board.Generate_Evasion_Codes()) == expected
+
+def test_legal_move_queries_match_generation():
+    board = Board()
+    board.Load_FEN("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    for _ in range(60):
+        codes = board.Generate_Legal_Move_Codes()
+        assert board.Has_Legal_Move() == bool(codes)
+        assert board.Count_Legal_Moves() == len(codes)
+        for code in board.Get_Pseudo_Legal_Move_Codes():
+            assert board.Is_Legal(code) == (code in codes)
+        if not codes:
+            break
+        board.Make_Move(random.choice(codes))
+
+    for fen in ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", "7k/6Q1/6K1/8/8/8/8/8 b - - 0 1"):
+        board.Load_FEN(fen)
+        assert not board.Has_Legal_Move()
+        assert board.Count_Legal_Moves() == 0
+
+    # The scratch list is per board: copies and byte round trips get their own.
+    copies = (board.Copy_For_Color(board.white_to_move), Board.From_Bytes(board.To_Bytes()), Board())
+    assert len({id(other.scratch_moves) for other in copies + (board,)}) == 4
+
+if __name__ == "__main__":
+    test_move_code_round_trip()
+    test_legal_move_cache_matches_generation()
+    test_position_bytes_round_trip()
+    test_capture_generator_matches_noisy_moves()
+    test_evasion_generator_matches_filtered_moves()
+    test_legal_move_queries_match_generation()
@@ -0,0 +1,33 @@
+from Board import Board
+from Perft import Perft, PerftHash, Divide, Parallel_Perft
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+def test_perft_hash_matches_plain_counts():
+    board = Board()
+    board.Load_FEN(KIWIPETE)
+    table = PerftHash(1024)
+    assert Perft(board, 3) == 97862
+    assert Perft(board, 3, table) == 97862
+    assert Perft(board, 3, table) == 97862
+    assert table.hits > 0
+    assert board.history_ply == 0
+
+def test_divide_sums_to_perft():
+    board = Board()
+    board.Load_FEN("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1")
+    results = Divide(board, 3)
+    assert len(results) == 14
+    assert sum(count for _, count in results) == 2812
+
+def test_parallel_perft_matches_divide():
+    board = Board()
+    board.Load_FEN(KIWIPETE)
+    results, units = Parallel_Perft(KIWIPETE, 3, jobs=2)
+    assert results == Divide(board, 3)
+    assert sum(nodes for _, nodes, _, _ in units) == 97862
+
+if __name__ == "__main__":
+    test_perft_hash_matches_plain_counts()
+    test_divide_sums_to_perft()
+    test_parallel_perft_matches_divide()
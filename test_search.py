@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+
+import Engine
+from Board import Board
+from TranspositionTable import TranspositionTable
+
+def test_lazy_smp_finds_mate_and_counts_helpers():
+    Engine.Toggle_Logging(False)
+    board = Board()
+    board.Load_FEN("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+    private_table = Engine.ctx.transposition_table
+    best_move = Engine.Find_Best_Move(board, 3, workers=3)
+    stats = Engine.Get_Search_Stats()
+    assert best_move.To_UCI() == "d1d8"
+    assert stats["workers"] == 3
+    assert stats["depth"] == 3
+    assert stats["score_cp"] >= Engine.MATE_TT_THRESHOLD
+    # The private table comes back, holding the search's entries, and the segment is gone.
+    assert Engine.ctx.transposition_table is private_table
+    assert any(private_table.words[1::2])
+    assert not os.path.exists(f"/dev/shm/chessbot_tt_{os.getpid()}") or os.name != "posix"
+    Engine.Shutdown_Search_Workers()
+
+def test_lazy_smp_helper_stops_at_requested_depth():
+    board = Board()
+    board.Load_FEN("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+    shared = TranspositionTable(1, shared_name=f"chessbot_tt_test_{os.getpid()}")
+    saved_table = Engine.ctx.transposition_table
+    saved_flag = Engine.ctx.search_stop_flag
+    Engine.ctx.search_stop_flag = multiprocessing.RawValue('b', 0)
+    try:
+        # An odd helper left to finish on its own must still stop at the requested depth.
+        result = Engine._Lazy_SMP_Helper(None, shared.shared_name, board.To_Bytes(), {}, 2, None, 1, 1, "classical")
+    finally:
+        Engine.ctx.smp_helper_index = 0
+        Engine.ctx.search_stop_flag = saved_flag
+        Engine.ctx.transposition_table = saved_table
+        shared.Unlink()
+    assert result[0] == 2
+
+def test_search_segment_replaces_stale_segment():
+    private = TranspositionTable(1)
+    private.Store(0x51E5, 4, 3, 12, 0, 1)
+    stale = TranspositionTable(2, shared_name=f"chessbot_tt_{os.getpid()}")
+    stale.Store(0x7A1E, 9, 3, 99, 0, 1)
+    stale.Close()
+    shared = Engine._Open_Search_Segment(private)
+    try:
+        assert shared.slots == private.slots
+        assert shared.Probe(0x51E5) is not None
+        assert shared.Probe(0x7A1E) is None
+    finally:
+        shared.Unlink()
+
+def test_picker_yields_each_move_once_while_killers_change():
+    board = Board()
+    board.Load_FEN("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    legal = list(board.Generate_Legal_Move_Codes())
+    quiets = [move for move in legal if not board._Is_Noisy_Move(move)]
+    Engine.Reset_Search_Stats()
+    Engine.ctx.killer_moves[4] = [quiets[0], quiets[1]]
+
+    yielded = []
+    for move in Engine.Pick_Moves(board, 4, 1):
+        yielded.append(move)
+        if move == quiets[0]:
+            # What a check-extended child at the same depth does to the live list.
+            killers = Engine.ctx.killer_moves[4]
+            killers.append(quiets[2])
+            killers.pop(0)
+    played = [move for move in yielded if move in legal]
+    assert sorted(played) == sorted(legal)
+    Engine.Reset_Search_Stats()
+
+def test_search_plays_every_legal_move_once_per_node():
+    # Positions where check extensions rewrote the killer list under a running picker.
+    fens = (
+        "3qkb1r/r1p1p1pp/1pbp4/p1NP4/2P3Q1/P3PpP1/2nK1PRP/RNB2B2 w k - 1 16",
+        "rnbq2n1/3p3r/p3pb1p/1p2N1p1/PP2kPp1/7P/1RPPPK2/2BQ1B1R b - - 1 20",
+    )
+    original = Engine.Pick_Moves
+    mismatches = []
+
+    def audited(board, depth, ply, tt_move=0, in_check=False):
+        legal = sorted(board.Generate_Legal_Move_Codes())
+        yielded = []
+        for move in original(board, depth, ply, tt_move, in_check):
+            yielded.append(move)
+            yield move
+        if sorted(move for move in yielded if move in legal) != legal:
+            mismatches.append(board.Hash_Board())
+
+    Engine.Toggle_Logging(False)
+    Engine.Pick_Moves = audited
+    try:
+        for fen in fens:
+            board = Board()
+            board.Load_FEN(fen)
+            Engine.Clear_Transposition_Table()
+            Engine.Find_Best_Move(board, 4)
+    finally:
+        Engine.Pick_Moves = original
+    assert not mismatches
+
+def test_root_split_is_deterministic_and_scores_all_lines():
+    Engine.Toggle_Logging(False)
+    fen = "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1"
+    runs = []
+    for _ in range(2):
+        board = Board()
+        board.Load_FEN(fen)
+        Engine.Clear_Transposition_Table()
+        best_move = Engine.Find_Best_Move(board, 3, workers=2, split_root=True)
+        stats = Engine.Get_Search_Stats()
+        runs.append((best_move.To_UCI(), stats["score_cp"], stats["total_nodes"]))
+        assert sum(nodes for _, nodes in stats["worker_nodes"]) == stats["total_nodes"]
+    assert runs[0] == runs[1]
+    assert runs[0][0] == "d1d8"
+
+    board = Board()
+    board.Load_FEN(fen)
+    Engine.Find_Best_Move(board, 2, workers=2, all_lines=True)
+    lines = Engine.Get_Search_Stats()["root_lines"]
+    assert len(lines) == board.Count_Legal_Moves()
+    assert lines[0][0] == "d1d8"
+    assert [score for _, score in lines] == sorted((score for _, score in lines), reverse=True)
+    Engine.Shutdown_Search_Workers()
+
+if __name__ == "__main__":
+    test_lazy_smp_finds_mate_and_counts_helpers()
+    test_lazy_smp_helper_stops_at_requested_depth()
+    test_search_segment_replaces_stale_segment()
+    test_picker_yields_each_move_once_while_killers_change()
+    test_search_plays_every_legal_move_once_per_node()
+    test_root_split_is_deterministic_and_scores_all_lines()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+
+from TranspositionTable import (
+    TranspositionTable,
+    TT_HEADER_BYTES,
+    TT_SLOT_BYTES,
+    TT_BUCKET_SLOTS,
+    BOUND_EXACT,
+    BOUND_LOWER,
+    BOUND_UPPER,
+    EVAL_NONE,
+)
+
+def test_store_probe_round_trip():
+    table = TranspositionTable(1)
+    key = 0x9D39247E33776D41
+    table.Store(key, 7, BOUND_LOWER, -9985, 0xC2D4, 5, static_eval=-31)
+    assert table.Probe(key) == (7, BOUND_LOWER, -9985, 0xC2D4, -31)
+    assert table.Probe(key ^ (1 << 40)) is None
+
+    table.Store(key, 3, BOUND_UPPER, 12, 0, 5)
+    assert table.Probe(key)[0] == 7
+    table.Store(key, 9, BOUND_EXACT, 12, 0, 5)
+    assert table.Probe(key) == (9, BOUND_EXACT, 12, 0xC2D4, -31)
+
+    table.Clear()
+    assert table.Probe(key) is None
+
+def test_same_key_store_keeps_newer_bounds():
+    table = TranspositionTable(1)
+    key = 0x0F1E2D3C4B5A6978
+    table.Store(key, 6, BOUND_LOWER, 10, 0x0111, 2)
+    table.Store(key, 6, BOUND_UPPER, 5, 0x0222, 2)
+    assert table.Probe(key)[:4] == (6, BOUND_UPPER, 5, 0x0222)
+    table.Store(key, 5, BOUND_LOWER, 8, 0, 2)
+    assert table.Probe(key)[:4] == (5, BOUND_LOWER, 8, 0x0222)
+    table.Store(key, 3, BOUND_EXACT, 1, 0x0333, 2)
+    assert table.Probe(key)[:4] == (5, BOUND_LOWER, 8, 0x0222)
+
+def test_bucket_replacement_prefers_shallow_and_stale_entries():
+    table = TranspositionTable(1)
+    stride = table.bucket_mask + 1
+    keys = [1 + index * stride for index in range(TT_BUCKET_SLOTS + 1)]
+    for depth, key in enumerate(keys[:TT_BUCKET_SLOTS], start=4):
+        table.Store(key, depth, BOUND_EXACT, depth, 0, 1)
+    table.Store(keys[-1], 10, BOUND_EXACT, 0, 0, 1)
+    assert table.Probe(keys[0]) is None
+    assert all(table.Probe(key) is not None for key in keys[1:])
+
+    table.Store(keys[0], 1, BOUND_EXACT, 0, 0, 3)
+    assert table.Probe(keys[0]) == (1, BOUND_EXACT, 0, 0, EVAL_NONE)
+    assert table.Probe(keys[-1]) is not None
+    assert table.Hashfull(3) > 0
+
+def test_torn_entry_reads_as_miss():
+    table = TranspositionTable(1)
+    key = 0x3C8123EA7B067ACC
+    table.Store(key, 6, BOUND_EXACT, 40, 0x1234, 2)
+    slot = (key & table.bucket_mask) * TT_BUCKET_SLOTS * 2
+    table.words[slot + 1] ^= 1 << 20
+    assert table.Probe(key) is None
+
+def test_file_backed_table_survives_reopen_and_dump():
+    key = 0x1D2E3F4A5B6C7D8E
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tt.bin")
+        table = TranspositionTable(1, path=path)
+        table.Store(key, 8, BOUND_LOWER, 150, 0x0ABC, 4, static_eval=20)
+        table.Close()
+
+        reopened = TranspositionTable(2, path=path)
+        assert reopened.bucket_mask == table.bucket_mask
+        assert reopened.Probe(key) == (8, BOUND_LOWER, 150, 0x0ABC, 20)
+
+        dump = os.path.join(directory, "tt.dump")
+        reopened.Save(dump)
+        reopened.Close()
+
+        loaded = TranspositionTable(4)
+        assert loaded.Load(dump)
+        assert loaded.slots == reopened.slots
+        assert loaded.Probe(key) == (8, BOUND_LOWER, 150, 0x0ABC, 20)
+
+def test_file_backed_table_resizes_and_loads_in_place():
+    key = 0x2F4A6B8C0D1E3F50
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tt.bin")
+        table = TranspositionTable(1, path=path)
+        small_slots = table.slots
+        table.Store(key, 5, BOUND_EXACT, 33, 0x0123, 1)
+
+        table.Resize(2)
+        assert table.slots == small_slots * 2
+        assert os.path.getsize(path) == TT_HEADER_BYTES + table.slots * TT_SLOT_BYTES
+        assert table.Probe(key) is None
+
+        dump = os.path.join(directory, "big.dump")
+        big = TranspositionTable(4)
+        big.Store(key, 7, BOUND_LOWER, 90, 0x0456, 1)
+        big.Save(dump)
+        assert table.Load(dump)
+        assert table.slots == big.slots
+        assert os.path.getsize(path) == TT_HEADER_BYTES + big.slots * TT_SLOT_BYTES
+        assert table.Probe(key) == (7, BOUND_LOWER, 90, 0x0456, EVAL_NONE)
+        table.Close()
+
+        reopened = TranspositionTable(1, path=path)
+        assert reopened.slots == big.slots
+        assert reopened.Probe(key) is not None
+        reopened.Close()
+
+def test_file_backed_table_refuses_foreign_files():
+    contents = b"not a table" * 100
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "notes.txt")
+        with open(path, "wb") as handle:
+            handle.write(contents)
+        try:
+            TranspositionTable(1, path=path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a foreign file was opened as a table")
+        with open(path, "rb") as handle:
+            assert handle.read() == contents
+
+if __name__ == "__main__":
+    test_store_probe_round_trip()
+    test_same_key_store_keeps_newer_bounds()
+    test_bucket_replacement_prefers_shallow_and_stale_entries()
+    test_torn_entry_reads_as_miss()
+    test_file_backed_table_survives_reopen_and_dump()
+    test_file_backed_table_refuses_foreign_files()
+    test_file_backed_table_resizes_and_loads_in_place()
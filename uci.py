@@ -1,15 +1,17 @@
+import os
 import sys
 import threading
 from Board import Board
+from Move import Move_Code_To_UCI
 import Engine
+from TranspositionTable import TT_DEFAULT_MB, TT_MIN_MB, TT_MAX_MB
 
 
 def _apply_moves(board: Board, move_tokens: list[str]):
     for mv_str in move_tokens:
-        legal_moves = board.Generate_Legal_Moves()
         selected = None
-        for mv in legal_moves:
-            if mv.To_UCI() == mv_str:
+        for mv in board.Cached_Legal_Move_Codes():
+            if Move_Code_To_UCI(mv) == mv_str:
                 selected = mv
                 break
         if selected is None:
@@ -98,6 +100,7 @@ def _parse_go(parts: list[str], board: Board) -> tuple[int, float | None, bool]:
 
 def uci_loop():
     board = Board()
+    threads = 1
     search_thread = None
     stop_event = threading.Event()
 
@@ -110,7 +113,7 @@ def uci_loop():
         search_thread = None
         stop_event.clear()
 
-    def emit_info(depth: int, score: float, pv: list[str], elapsed: float):
+    def emit_info(depth: int, score: int, pv: list[str], elapsed: float):
         stats = Engine.Get_Search_Stats()
         elapsed_ms = max(1, int(elapsed * 1000))
         nodes = stats["total_nodes"]
@@ -120,17 +123,20 @@ def uci_loop():
         print(
             f"info depth {depth} seldepth {stats['seldepth']} score {score_text} "
             f"nodes {nodes} time {elapsed_ms} nps {nps} "
-            f"hashfull {stats['hashfull_permille']} string tbhits 0 qnodes {stats['qnodes']}{pv_text}"
+            f"hashfull {stats['hashfull_permille']} string tbhits 0 qnodes {stats['qnodes']} "
+            f"evalhits {stats['eval_cache_hit_rate'] * 100:.1f}% evalcoll {stats['eval_cache_collisions']} "
+            f"evalfull {stats['eval_cache_fill_permille']}{pv_text}"
         )
         sys.stdout.flush()
 
-    def run_search(local_board: Board, depth: int, time_limit: float | None):
+    def run_search(local_board: Board, depth: int, time_limit: float | None, workers: int):
         best_move = Engine.Find_Best_Move(
             local_board,
             max_depth=depth,
             time_limit=time_limit,
             stop_checker=stop_event.is_set,
             info_callback=emit_info,
+            workers=workers,
         )
         if best_move:
             print(f'bestmove {best_move.To_UCI()}')
@@ -149,7 +155,9 @@ def uci_loop():
         if cmd == 'uci':
             print('id name Chess Bot')
             print('id author Python')
+            print(f'option name Hash type spin default {TT_DEFAULT_MB} min {TT_MIN_MB} max {TT_MAX_MB}')
             print('option name Clear Hash type button')
+            print(f'option name Threads type spin default 1 min 1 max {os.cpu_count() or 1}')
             print('option name Debug Log type check default false')
             print('uciok')
             sys.stdout.flush()
@@ -160,13 +168,25 @@ def uci_loop():
 
         elif cmd == 'ucinewgame':
             stop_search(wait=True)
-            Engine.Clear_Transposition_Table()
+            Engine.Clear_Transposition_Table(keep_persistent=True)
             board = Board()
 
         elif cmd == 'setoption':
             joined = ' '.join(parts)
             if 'name Clear Hash' in joined:
                 Engine.Clear_Transposition_Table()
+            elif 'name Hash' in joined and 'value' in parts:
+                stop_search(wait=True)
+                try:
+                    Engine.Set_Hash_Size(int(parts[parts.index('value') + 1]))
+                except (ValueError, IndexError):
+                    pass
+            elif 'name Threads' in joined and 'value' in parts:
+                stop_search(wait=True)
+                try:
+                    threads = max(1, int(parts[parts.index('value') + 1]))
+                except (ValueError, IndexError):
+                    pass
             elif 'name Debug Log' in joined and 'value' in parts:
                 value = parts[-1].lower()
                 Engine.Toggle_Detailed_Log(value in ('1', 'true', 'on', 'yes'))
@@ -183,7 +203,7 @@ def uci_loop():
             depth, time_limit, _ = _parse_go(parts, board)
             local_board = board.Copy_For_Color(board.white_to_move)
             stop_event.clear()
-            search_thread = threading.Thread(target=run_search, args=(local_board, depth, time_limit), daemon=True)
+            search_thread = threading.Thread(target=run_search, args=(local_board, depth, time_limit, threads), daemon=True)
             search_thread.start()
 
         elif cmd == 'stop':